@@ -0,0 +1,86 @@
+#
+#  bench_codecs.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+Micro-benchmark of the per-frame cost of the link layer codecs.
+
+Each frame is decoded with a codec created for it (as the network handlers used to do) and with a codec created once
+and reused. Run from the root of the repository: python benchmarks/bench_codecs.py
+"""
+
+import os
+import sys
+import timeit
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(os.path.realpath(__file__)).parents[1]))
+
+import pyngham
+
+from spacelab_decoder.ax100 import AX100Mode5
+from spacelab_decoder.golay24 import Golay24
+from spacelab_decoder.reed_solomon import ReedSolomon
+
+_BENCH_NUM_FRAMES   = 2000
+_BENCH_REPEAT       = 5
+
+def _best(stmt, number=_BENCH_NUM_FRAMES):
+    """
+    Gets the best time per frame of a statement.
+
+    :param stmt: Is the function that decodes one frame.
+    :type: function
+
+    :param number: Is the number of frames of each measurement.
+    :type: int
+
+    :return: The time per frame in microseconds.
+    :rtype: float
+    """
+    return min(timeit.repeat(stmt, number=number, repeat=_BENCH_REPEAT))/number*1e6
+
+def main():
+    data = list(range(100))
+
+    ax100 = AX100Mode5()
+    ax100_frame = ax100.encode(data)[len(ax100.get_preamble()) + len(ax100.get_sync_word()):]
+    ax100_frame[10] ^= 0xFF     # One symbol error, so the Reed-Solomon decoder corrects it
+
+    ngham = pyngham.PyNGHam()
+    ngham_frame = ngham.encode(data)
+
+    results = [("Golay24()",                        _best(lambda: Golay24())),
+               ("ReedSolomon()",                    _best(lambda: ReedSolomon())),
+               ("AX100Mode5()",                     _best(lambda: AX100Mode5())),
+               ("AX100Mode5().decode (per frame)",  _best(lambda: AX100Mode5().decode(ax100_frame.copy()))),
+               ("AX100Mode5.decode (reused)",       _best(lambda: ax100.decode(ax100_frame.copy()))),
+               ("PyNGHam()",                        _best(lambda: pyngham.PyNGHam(), 100)),
+               ("PyNGHam().decode (per frame)",     _best(lambda: pyngham.PyNGHam().decode(ngham_frame), 100)),
+               ("PyNGHam.decode (reused)",          _best(lambda: ngham.decode(ngham_frame), 100))]
+
+    for name, t in results:
+        print("%-34s %10.2f us" % (name, t))
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
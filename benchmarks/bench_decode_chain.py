@@ -0,0 +1,476 @@
+#
+#  bench_decode_chain.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+"""
+Benchmark of the decoding chain.
+
+GMSK audio (the output of a FM discriminator) is synthesized from frames built with the encoders of the package, and
+each stage of the chain (TimeSync, BitDecoder, Golay24, ReedSolomon, AX100Mode5, NGHam, packet decoding) is timed
+separately and end-to-end (BatchDecoder with a WAV file). The results are written as JSON, so the runs of different
+commits can be compared. The APIs added after the batch decoder (soft symbols, decode_candidates, decode_frame and
+PacketSLP.decode) are used only when available, so the same script can be copied to an older commit. Run from the root of the repository:
+
+    python benchmarks/bench_decode_chain.py -o before.json
+    python benchmarks/bench_decode_chain.py -o after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import inspect
+import pathlib
+import platform
+import argparse
+import tempfile
+import warnings
+import subprocess
+
+try:
+    import resource
+except ImportError:
+    resource = None     # Not available on Windows (the memory is not reported)
+
+sys.path.insert(0, str(pathlib.Path(os.path.realpath(__file__)).parents[1]))
+
+import numpy as np
+from scipy.io import wavfile
+
+import pyngham
+
+from spacelab_decoder.time_sync import TimeSync
+from spacelab_decoder.bit_decoder import BitDecoder
+from spacelab_decoder.golay24 import Golay24
+from spacelab_decoder.reed_solomon import ReedSolomon
+from spacelab_decoder.ax100 import AX100Mode5
+from spacelab_decoder.packet import PacketSLP
+from spacelab_decoder.batch import BatchDecoder
+
+_BENCH_ROOT_DIR         = pathlib.Path(os.path.realpath(__file__)).parents[1]
+_BENCH_SAT_JSON_DIR     = _BENCH_ROOT_DIR / "spacelab_decoder" / "data" / "satellites"
+_BENCH_SAMPLE_WAV       = _BENCH_ROOT_DIR / "tests" / "samples" / "golds-ufsc_beacon.wav"
+
+_BENCH_NGHAM_SAT        = "golds-ufsc.json"
+_BENCH_NGHAM_LINK       = "downlink_vhf"
+_BENCH_AX100_SAT        = "catarina-a2.json"
+_BENCH_AX100_LINK       = "downlink"
+
+_BENCH_DEFAULT_FRAMES   = 20
+_BENCH_DEFAULT_REPEAT   = 5
+_BENCH_DEFAULT_RATE     = 48000     # Hz
+_BENCH_DEFAULT_SNR      = 30.0      # dB (per symbol)
+_BENCH_GAP_SYMBOLS      = 400       # Noise between two frames
+_BENCH_GAUSSIAN_BT      = 0.5
+_BENCH_AX100_PAYLOAD    = 100       # Bytes
+_BENCH_RS_ERRORS        = 8         # Symbol errors of each Reed-Solomon block
+_BENCH_PROC_CLEAR_REFS  = "/proc/self/clear_refs"
+_BENCH_PROC_STATUS      = "/proc/self/status"
+
+def _gmsk_audio(frames, baud, sample_rate, snr, rng):
+    """
+    Synthesizes the FM discriminator output of a GMSK signal.
+
+    :param frames: Are the frames to modulate (with the preamble and the sync word).
+    :type: list[list[int]]
+
+    :param baud: Is the baudrate in bps.
+    :type: int
+
+    :param sample_rate: Is the sample rate of the audio in Hz.
+    :type: int
+
+    :param snr: Is the signal to noise ratio per symbol in dB.
+    :type: float
+
+    :param rng: Is the random generator of the noise and the gaps.
+    :type: np.random.Generator
+
+    :return: The audio samples.
+    :rtype: np.ndarray
+    """
+    bits = list()
+    for frame in frames:
+        bits.append(rng.integers(0, 2, _BENCH_GAP_SYMBOLS, dtype=np.uint8))
+        bits.append(np.unpackbits(np.array(frame, dtype=np.uint8)))
+    bits.append(rng.integers(0, 2, _BENCH_GAP_SYMBOLS, dtype=np.uint8))
+
+    nrz = 2.0*np.concatenate(bits) - 1.0
+
+    num_samples = len(nrz)*sample_rate//baud
+    signal = nrz[np.arange(num_samples)*baud//sample_rate]
+
+    # White noise with the given SNR per symbol
+    sps = sample_rate/baud
+    signal += rng.normal(0, np.sqrt(sps/10**(snr/10)), num_samples)
+
+    # Gaussian pulse shaping (4 symbols long), also filtering the noise as the audio filter of a receiver
+    t = np.arange(-2*sps, 2*sps + 1)/sps
+    sigma = np.sqrt(np.log(2))/(2*np.pi*_BENCH_GAUSSIAN_BT)
+    taps = np.exp(-t**2/(2*sigma**2))
+    signal = np.convolve(signal, taps/taps.sum(), mode='same')
+
+    return signal.astype(np.float32)
+
+def _peak_rss_kb():
+    """
+    Gets the peak resident set size of the process.
+
+    :return: The peak RSS in kB, or None if it is not available.
+    :rtype: int
+    """
+    if resource is None:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return rss//1024 if sys.platform == 'darwin' else rss   # Bytes on macOS, kB on Linux
+
+def _proc_status_kb(key):
+    """
+    Reads a memory value of the process from /proc (Linux only).
+
+    :param key: Is the name of the value (ex.: VmRSS).
+    :type: str
+
+    :return: The value in kB, or None if it is not available.
+    :rtype: int
+    """
+    try:
+        with open(_BENCH_PROC_STATUS, 'r') as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    return None
+
+def _rss_baseline():
+    """
+    Takes the memory baseline of a stage.
+
+    On Linux, the peak RSS of the process is reset to the current RSS, so the peak of each stage is measured from the
+    memory in use before it. Elsewhere, the peak RSS can not be reset, and only the growth of the peak of the process is
+    measured (zero when a stage uses less memory than a previous one).
+
+    :return: The current RSS (Linux) or the peak RSS so far in kB, or None if it is not available.
+    :rtype: int
+    """
+    try:
+        with open(_BENCH_PROC_CLEAR_REFS, 'w') as f:
+            f.write("5")
+
+        rss = _proc_status_kb("VmRSS")
+        if rss is not None:
+            return rss
+    except OSError:
+        pass
+
+    return _peak_rss_kb()
+
+def _stage_peak_rss_kb():
+    """
+    Gets the peak RSS since the last baseline (Linux), or the peak RSS of the process.
+
+    :return: The peak RSS in kB, or None if it is not available.
+    :rtype: int
+    """
+    peak = _proc_status_kb("VmHWM")
+
+    return _peak_rss_kb() if peak is None else peak
+
+def _git_commit():
+    """
+    Gets the commit of the working tree.
+
+    :return: The hash of the commit, or None if it is not available.
+    :rtype: str
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=_BENCH_ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _run_stage(name, func, repeat, samples=0, bits=0, frames=0):
+    """
+    Times a stage of the decoding chain.
+
+    :param name: Is the name of the stage.
+    :type: str
+
+    :param func: Is the function that runs the stage once (its return value is returned by the first run).
+    :type: function
+
+    :param repeat: Is the number of runs (the best one is reported).
+    :type: int
+
+    :param samples: Is the number of audio samples processed by each run.
+    :type: int
+
+    :param bits: Is the number of bits processed by each run.
+    :type: int
+
+    :param frames: Is the number of frames processed by each run.
+    :type: int
+
+    :return: The result of the stage and the value returned by the function.
+    :rtype: tuple[dict, object]
+    """
+    best = None
+    value = None
+    baseline = _rss_baseline()
+    for i in range(repeat):
+        t_start = time.perf_counter()
+        ret = func()
+        elapsed = time.perf_counter() - t_start
+
+        if i == 0:
+            value = ret
+        if best is None or elapsed < best:
+            best = elapsed
+
+    res = dict()
+    res['stage'] = name
+    res['seconds'] = best
+    res['samples_per_s'] = samples/best if samples > 0 else None
+    res['bits_per_s'] = bits/best if bits > 0 else None
+    res['frames_per_s'] = frames/best if frames > 0 else None
+    res['peak_rss_kb'] = _stage_peak_rss_kb()
+    res['rss_delta_kb'] = None if baseline is None else max(0, res['peak_rss_kb'] - baseline)
+
+    return res, value
+
+def _get_ngham_payload():
+    """
+    Gets the payload of the sample recording, so the packet decoding runs with a valid packet.
+
+    :return: The payload of the NGHam packet.
+    :rtype: list[int]
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", wavfile.WavFileWarning)
+        records = _decode_file(BatchDecoder(str(_BENCH_SAT_JSON_DIR / _BENCH_NGHAM_SAT), _BENCH_NGHAM_LINK), str(_BENCH_SAMPLE_WAV))
+
+    return list(bytes.fromhex(records[0]['raw']))
+
+def _decode_file(dec, filename):
+    """
+    Decodes a WAV file with the batch decoder (older versions only return the records).
+
+    :return: The records of the decoded packets.
+    :rtype: list[dict]
+    """
+    ret = dec.decode_file(filename)
+
+    return ret[0] if isinstance(ret, tuple) else ret
+
+def _has_parameter(func, name):
+    """
+    Checks if a function has a parameter (added by a later version of the decoder).
+
+    :return: True if the function has the parameter.
+    :rtype: bool
+    """
+    return name in inspect.signature(func).parameters
+
+def _new_bit_decoder(sync_word):
+    """
+    Creates a bit decoder, looking for the inverted sync word too if supported.
+
+    :return: The bit decoder.
+    :rtype: BitDecoder
+    """
+    if _has_parameter(BitDecoder.__init__, 'inverted'):
+        return BitDecoder(sync_word, 4, inverted=True)
+
+    return BitDecoder(sync_word, 4)
+
+def _decode_bits(sync_word, bits):
+    """
+    Finds the frames of a bitstream (or of soft symbols) with the fastest API of the bit decoder.
+
+    :return: The candidate frames.
+    :rtype: list
+    """
+    dec = _new_bit_decoder(sync_word)
+
+    if hasattr(dec, 'decode_candidates'):
+        return dec.decode_candidates(bits)
+
+    if hasattr(dec, 'decode_bits'):
+        return dec.decode_bits(bits)
+
+    return [byte for byte in map(dec.decode_bit, bits) if byte is not None]
+
+def _bench_link(results, name, sat_json, link_id, frames, sample_rate, snr, repeat, tmp_dir, rng):
+    """
+    Benchmarks the audio stages and the end-to-end decoding of a link.
+
+    :return: None
+    """
+    dec = BatchDecoder(str(_BENCH_SAT_JSON_DIR / sat_json), link_id)
+    link = dec.get_link()
+
+    audio = _gmsk_audio(frames, link.get_baudrate(), sample_rate, snr, rng)
+    num_bits = len(audio)*link.get_baudrate()//sample_rate
+
+    res, bits = _run_stage(name + "/time_sync", lambda: TimeSync(sample_rate, link.get_baudrate()).decode_stream(audio), repeat, samples=len(audio), bits=num_bits)
+    results.append(res)
+
+    symbols = bits
+    if _has_parameter(TimeSync.decode_stream, 'soft'):
+        res, symbols = _run_stage(name + "/time_sync_soft", lambda: TimeSync(sample_rate, link.get_baudrate()).decode_stream(audio, soft=True), repeat, samples=len(audio), bits=num_bits)
+        results.append(res)
+
+    sync_word = link.get_sync_word().copy()
+    sync_word.reverse()
+
+    res, candidates = _run_stage(name + "/bit_decoder", lambda: _decode_bits(sync_word, symbols), repeat, bits=len(symbols), frames=len(frames))
+    results.append(res)
+
+    filename = os.path.join(tmp_dir, name + ".wav")
+    wavfile.write(filename, sample_rate, audio)
+
+    res, ret = _run_stage(name + "/end_to_end", lambda: _decode_file(dec, filename), repeat, samples=len(audio), bits=num_bits, frames=len(frames))
+    res['decoded_frames'] = len(ret)
+    res['expected_frames'] = len(frames)
+    results.append(res)
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the decoding chain with synthesized GMSK audio.")
+    parser.add_argument("-o", "--output", help="JSON file to write the results")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    parser.add_argument("-n", "--frames", type=int, default=_BENCH_DEFAULT_FRAMES, help="number of frames of each link (default: %(default)s)")
+    parser.add_argument("-r", "--repeat", type=int, default=_BENCH_DEFAULT_REPEAT, help="number of runs of each stage, the best is reported (default: %(default)s)")
+    parser.add_argument("--sample-rate", type=int, default=_BENCH_DEFAULT_RATE, help="sample rate of the audio in Hz (default: %(default)s)")
+    parser.add_argument("--snr", type=float, default=_BENCH_DEFAULT_SNR, help="signal to noise ratio per symbol in dB (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random data (default: %(default)s)")
+
+    opts = parser.parse_args(args)
+
+    rng = np.random.default_rng(opts.seed)
+
+    golay = Golay24()
+    rs = ReedSolomon()
+    ax100 = AX100Mode5()
+    ngham = pyngham.PyNGHam()
+
+    ngham_payload = _get_ngham_payload()
+    ngham_frames = [ngham.encode(ngham_payload) for i in range(opts.frames)]
+
+    ax100_payloads = [rng.integers(0, 256, _BENCH_AX100_PAYLOAD).tolist() for i in range(opts.frames)]
+    ax100_frames = [ax100.encode(pl) for pl in ax100_payloads]
+
+    results = list()
+
+    # Link and network layer stages (one frame at a time)
+    preamb_sw_len = len(ax100.get_preamble()) + len(ax100.get_sync_word())
+    ax100_rx = list()
+    for frame in ax100_frames:
+        frame = frame[preamb_sw_len:]
+        for pos in rng.choice(np.arange(3, len(frame)), _BENCH_RS_ERRORS, replace=False):
+            frame[pos] ^= 0xFF
+        ax100_rx.append(bytes(frame))
+
+    golay_words = [golay.encode(int(n)) for n in rng.integers(0, 4096, opts.frames)]
+    res, ret = _run_stage("golay24/decode", lambda: [golay.decode(w) for w in golay_words], opts.repeat, frames=opts.frames)
+    results.append(res)
+
+    rs_blocks = list()
+    for pl in ax100_payloads:
+        block = pl + rs.encode(pl, 255 - 32 - len(pl))
+        for pos in rng.choice(len(block), _BENCH_RS_ERRORS, replace=False):
+            block[pos] ^= 0xFF
+        rs_blocks.append((block, 255 - len(block)))
+
+    res, ret = _run_stage("reed_solomon/decode", lambda: [rs.decode(block, pad) for block, pad in rs_blocks], opts.repeat, frames=opts.frames)
+    results.append(res)
+
+    if hasattr(ax100, 'decode_frame'):
+        decode_ax100 = ax100.decode_frame
+    else:
+        decode_ax100 = lambda frame: ax100.decode(list(frame))
+
+    res, ret = _run_stage("ax100/decode_frame", lambda: [decode_ax100(frame) for frame in ax100_rx], opts.repeat, frames=opts.frames)
+    results.append(res)
+
+    res, ret = _run_stage("ngham/decode", lambda: [ngham.decode(frame) for frame in ngham_frames], opts.repeat, frames=opts.frames)
+    results.append(res)
+
+    sat_json = str(_BENCH_SAT_JSON_DIR / _BENCH_NGHAM_SAT)
+    decode_slp = PacketSLP.decode if hasattr(PacketSLP, 'decode') else PacketSLP.get_data
+    res, ret = _run_stage("packet_slp/decode", lambda: [decode_slp(PacketSLP(sat_json, ngham_payload)) for i in range(opts.frames)], opts.repeat, frames=opts.frames)
+    results.append(res)
+
+    # Audio stages and end-to-end decoding
+    tmp_dir = tempfile.mkdtemp(prefix="spacelab-decoder-bench-")
+    try:
+        _bench_link(results, "ngham", _BENCH_NGHAM_SAT, _BENCH_NGHAM_LINK, ngham_frames, opts.sample_rate, opts.snr, opts.repeat, tmp_dir, rng)
+        _bench_link(results, "ax100", _BENCH_AX100_SAT, _BENCH_AX100_LINK, ax100_frames, opts.sample_rate, opts.snr, opts.repeat, tmp_dir, rng)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    report = dict()
+    report['commit'] = _git_commit()
+    report['time'] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    report['python'] = platform.python_version()
+    report['numpy'] = np.__version__
+    report['machine'] = platform.machine()
+    report['config'] = {'frames': opts.frames, 'repeat': opts.repeat, 'sample_rate': opts.sample_rate, 'snr': opts.snr, 'seed': opts.seed}
+    # The peak of the process is reset by each stage on Linux, so it is the largest peak of the stages
+    report['peak_rss_kb'] = max([res['peak_rss_kb'] for res in results if res['peak_rss_kb'] is not None], default=None)
+    report['results'] = results
+
+    previous = dict()
+    if opts.compare:
+        with open(opts.compare, 'r') as f:
+            previous = {res['stage']: res for res in json.load(f)['results']}
+
+    print("%-24s %10s %14s %12s %12s %10s %10s" % ("Stage", "Time [ms]", "Samples/s", "Bits/s", "Frames/s", "RSS [kB]", "Speedup"))
+    for res in results:
+        speedup = ""
+        if res['stage'] in previous:
+            speedup = "%.2fx" % (previous[res['stage']]['seconds']/res['seconds'])
+
+        print("%-24s %10.2f %14s %12s %12s %10s %10s" % (res['stage'], res['seconds']*1e3,
+                                                        "-" if res['samples_per_s'] is None else "%.0f" % res['samples_per_s'],
+                                                        "-" if res['bits_per_s'] is None else "%.0f" % res['bits_per_s'],
+                                                        "-" if res['frames_per_s'] is None else "%.1f" % res['frames_per_s'],
+                                                        "-" if res['rss_delta_kb'] is None else "+%d" % res['rss_delta_kb'],
+                                                        speedup))
+
+    for res in results:
+        if 'decoded_frames' in res:
+            print("%s: %d of %d frames decoded" % (res['stage'], res['decoded_frames'], res['expected_frames']))
+
+    if report['peak_rss_kb'] is not None:
+        print("Peak RSS: %d kB" % report['peak_rss_kb'])
+
+    if opts.output:
+        with open(opts.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,16 +29,44 @@ import pathlib
 
 sys.path.append(str(pathlib.Path(os.path.realpath(__file__)).parents[1]))
 
-from spacelab_decoder.spacelabdecoder import SpaceLabDecoder
-
-def main(args):
+def main(args=None):
     """Main function.
 
     Args:
+        args: The command line arguments. "spacelab-decoder batch ..." runs the
+            headless batch decoder, "spacelab-decoder server ..." runs the
+            headless network input server, "spacelab-decoder generate ..."
+            generates synthetic passes, "spacelab-decoder events ..." queries
+            an event log, otherwise the graphical interface is opened.
 
     Returns:
         The code uppon termination.
     """
+    if args is None:
+        args = sys.argv
+
+    if len(args) > 1 and args[1] == "batch":
+        from spacelab_decoder.batch import main as batch_main   # Does not import Gtk
+
+        return batch_main(args[2:])
+
+    if len(args) > 1 and args[1] == "server":
+        from spacelab_decoder.input_server import main as server_main  # Does not import Gtk
+
+        return server_main(args[2:])
+
+    if len(args) > 1 and args[1] == "generate":
+        from spacelab_decoder.pass_generator import main as generate_main   # Does not import Gtk
+
+        return generate_main(args[2:])
+
+    if len(args) > 1 and args[1] == "events":
+        from spacelab_decoder.event_log import main as events_main  # Does not import Gtk
+
+        return events_main(args[2:])
+
+    from spacelab_decoder.spacelabdecoder import SpaceLabDecoder
+
     app = SpaceLabDecoder()
 
     return app.run()
@@ -20,11 +20,15 @@
 #
 #
 
+import numpy as np
+
 from spacelab_decoder.golay24 import Golay24
 from spacelab_decoder.reed_solomon import ReedSolomon
+from spacelab_decoder.metrics import get_metrics, timed
 
 _AX100_PREAMBLE_DEFAULT     = [0xAA]*50
 _AX100_SYNC_WORD_DEFAULT    = [147, 11, 81, 222]
+_AX100_ERASURE_STEPS        = (8, 16)   # Erasures tried by decode_frame (more erasures give wrong packets)
 
 # Repeats after 255 bits, but repeats byte-aligning after 255 byte
 _AX100_CCSDS_POLY = [0xFF, 0x48, 0x0E, 0xC0, 0x9A, 0x0D, 0x70, 0xBC, 0x8E, 0x2C, 0x93, 0xAD, 0xA7,
@@ -48,6 +52,11 @@ _AX100_CCSDS_POLY = [0xFF, 0x48, 0x0E, 0xC0, 0x9A, 0x0D, 0x70, 0xBC, 0x8E, 0x2C,
                      0xD6, 0xD3, 0xDB, 0xA3, 0x67, 0x2D, 0x4B, 0xBE, 0xE6, 0x19, 0x51, 0x5F, 0x9F,
                      0x05, 0x08, 0x78, 0xC4, 0x4A, 0x66, 0xF5, 0x58]
 
+# Scrambling sequence as arrays: two periods, so any block of up to 255 bytes starting at any position is a single slice
+_AX100_CCSDS_SEQUENCE = np.array(_AX100_CCSDS_POLY*2, dtype=np.uint8)
+_AX100_CCSDS_SEQUENCE.flags.writeable = False
+_AX100_CCSDS_SEQUENCE_BYTES = bytes(_AX100_CCSDS_POLY)  # Used by the byte stream decoder (indexing gives an int)
+
 class AX100Mode5:
     """
     AX100-Mode5 Protocol.
@@ -61,8 +70,14 @@ class AX100Mode5:
         self._decoder_pos = 0
         self._decoder_pkt_len = 0
         self._decoder_golay_buf = list()
+        self._decoder_golay_err = 0
         self._decoder_rs_buf = list()
         self._ignore_golay_error = False
+        self._errors = (0, 0)   # Errors corrected in the last decoded packet
+
+        # The codecs are created once and reused by all packets (their lookup tables are shared module-level arrays)
+        self._golay = Golay24()
+        self._rs = ReedSolomon()
 
         self.set_preamble(_AX100_PREAMBLE_DEFAULT)
         self.set_sync_word(_AX100_SYNC_WORD_DEFAULT)
@@ -129,6 +144,16 @@ class AX100Mode5:
         """
         return self._ignore_golay_error
 
+    def get_errors(self):
+        """
+        Gets the errors corrected in the last packet decoded by decode, decode_frame or decode_byte.
+
+        :return: The number of bit errors corrected in the Golay24 field (None if it was not corrected) and the number
+        of symbols corrected by the Reed-Solomon decoder.
+        :rtype: tuple[int, int]
+        """
+        return self._errors
+
     def encode(self, data):
         """
         Encodes a given data in AX100-Mode5 format.
@@ -148,23 +173,20 @@ class AX100Mode5:
         pkt += self.get_sync_word()
 
         # Golay24
-        gol = Golay24()
-
-        pkt += gol.encode(len(data) + 32)   # 32 = Reed-Solomon parity block
+        pkt += self._golay.encode(len(data) + 32)   # 32 = Reed-Solomon parity block
 
         # Data
         pkt += data
 
         # Reed-Solomon parity
-        rs = ReedSolomon()
-
-        pkt += rs.encode(data, 255 - 32 - len(data))
+        pkt += self._rs.encode(data, 255 - 32 - len(data))
 
         # Scramble
         pkt[len(self.get_preamble())+len(self.get_sync_word())+3:] = self._scrambling(pkt[len(self.get_preamble())+len(self.get_sync_word())+3:])
 
         return pkt
 
+    @timed("ax100")
     def decode(self, pkt):
         """
         Decodes an AX100-Mode5 packet.
@@ -178,27 +200,95 @@ class AX100Mode5:
         :rtype: list[int]
         """
         # Golay24
-        gol = Golay24()
-
-        pkt_len, golay_err = gol.decode(pkt[:3])
+        pkt_len, golay_err = self._golay.decode(pkt[:3])
 
         if pkt_len == -1:
+            get_metrics().count("golay_uncorrectable")
             if self.get_ignore_golay_error():
                 pkt_len = pkt[2]
             else:
                 raise RuntimeError("Impossible to correct the Golay field!")
+        else:
+            get_metrics().count("golay_corrected_bits", golay_err)
 
         # De-scrambling
         rs_block = self._scrambling(pkt[3:])    # 3 = Removing Golay24 bytes
 
         # Applying the Reed-Solomon decoder
-        rs = ReedSolomon()
+        data, err_pos, err = self._rs.decode(rs_block, 255 - 32 - (pkt_len - 32))
 
-        data, err_pos, err = rs.decode(rs_block, 255 - 32 - (pkt_len - 32))
+        self._errors = (golay_err, err)
 
         # Return the payload data after Reed-Solomon correction
         return data[:pkt_len-32]    # 32 = Reed-Solomon parity block
 
+    @timed("ax100")
+    def decode_frame(self, frame, erasures=None):
+        """
+        Decodes an AX100-Mode5 packet from a frame found by the bit decoder.
+
+        The length of the packet is read from the Golay24 field, and the Reed-Solomon block is taken from the frame
+        as a single slice, descrambled with a single XOR and decoded at once. The bytes after the end of the packet are
+        ignored.
+
+        :param frame: Are the bytes following the sync word (as given by BitDecoder.decode_bits).
+        :type: bytes
+
+        :param erasures: Is the position in the frame of the low-confidence bytes, from the weakest to the strongest
+        (as given by BitDecoder.decode_candidates). They are only used if the errors can not be corrected without them.
+        :type: tuple[int]
+
+        :return: The data of the packet, or None if the frame ends before the end of the packet.
+        :rtype: list[int]
+        """
+        if len(frame) < 3:
+            return None
+
+        # Golay24
+        pkt_len, golay_err = self._golay.decode(frame[:3])
+
+        if pkt_len == -1:
+            get_metrics().count("golay_uncorrectable")
+            if self.get_ignore_golay_error():
+                pkt_len = frame[2]
+            else:
+                raise RuntimeError("Impossible to correct the Golay field!")
+        else:
+            get_metrics().count("golay_corrected_bits", golay_err)
+
+        if pkt_len > 255 or pkt_len < 32:   # 32 = Reed-Solomon parity block
+            raise RuntimeError("Invalid packet length!")
+
+        if len(frame) < 3 + pkt_len:
+            return None
+
+        # De-scrambling
+        rs_block = np.frombuffer(bytes(frame[3:3 + pkt_len]), dtype=np.uint8) ^ _AX100_CCSDS_SEQUENCE[:pkt_len]
+
+        # Applying the Reed-Solomon decoder
+        pad = 255 - pkt_len
+        try:
+            data, err_pos, err = self._rs.decode(rs_block, pad)
+        except RuntimeError:
+            # The weakest bytes of the block are erased (their positions are given in the full 255 symbols block)
+            eras_pos = [pos - 3 + pad for pos in erasures or () if 3 <= pos < 3 + pkt_len]
+            if len(eras_pos) == 0:
+                raise
+
+            steps = sorted({min(num, len(eras_pos)) for num in _AX100_ERASURE_STEPS})
+            for num in steps:
+                try:
+                    data, err_pos, err = self._rs.decode(rs_block, pad, eras_pos[:num], num)
+                    get_metrics().count("ax100_erasure_decodes")
+                    break
+                except RuntimeError:
+                    if num == steps[-1]:
+                        raise
+
+        self._errors = (golay_err, err)
+
+        return data[:pkt_len - 32]
+
     def decode_byte(self, byte):
         """
         Decodes a single byte in a AX100-Mode5 packet stream.
@@ -216,11 +306,10 @@ class AX100Mode5:
             self._decoder_golay_buf.append(byte)
             self._decoder_pos += 1
 
-            gol = Golay24()
-
-            self._decoder_pkt_len, golay_err = gol.decode(self._decoder_golay_buf)
+            self._decoder_pkt_len, self._decoder_golay_err = self._golay.decode(self._decoder_golay_buf)
 
             if self._decoder_pkt_len == -1:
+                get_metrics().count("golay_uncorrectable")
                 if self.get_ignore_golay_error():
                     self._decoder_pkt_len = byte - 32
                 else:
@@ -230,28 +319,29 @@ class AX100Mode5:
                 self.reset_decoder()
                 raise RuntimeError("Invalid packet length!")
             else:
+                get_metrics().count("golay_corrected_bits", self._decoder_golay_err)
                 self._decoder_pkt_len -= 32 # 32 = Reed-Solomon parity block
 
             self._decoder_golay_buf.clear()
         elif self._decoder_pos < 3 + self._decoder_pkt_len - 1:         # Receiving Reed-Solomon block (data part)
-            self._decoder_rs_buf.append(self._scrambling([byte], start_pos=self._decoder_pos-3)[0])
+            self._decoder_rs_buf.append(byte ^ _AX100_CCSDS_SEQUENCE_BYTES[self._decoder_pos - 3])
             self._decoder_pos += 1
         elif self._decoder_pos == 3 + self._decoder_pkt_len - 1:        # Data part of the Reed-Solomon block received
-            self._decoder_rs_buf.append(self._scrambling([byte], start_pos=self._decoder_pos-3)[0])
+            self._decoder_rs_buf.append(byte ^ _AX100_CCSDS_SEQUENCE_BYTES[self._decoder_pos - 3])
             self._decoder_pos += 1
         elif self._decoder_pos < 3 + self._decoder_pkt_len + 32 - 1:    # Receiving Reed-Solomon block (parity part)
-            self._decoder_rs_buf.append(self._scrambling([byte], start_pos=self._decoder_pos-3)[0])
+            self._decoder_rs_buf.append(byte ^ _AX100_CCSDS_SEQUENCE_BYTES[self._decoder_pos - 3])
             self._decoder_pos += 1
         elif self._decoder_pos == 3 + self._decoder_pkt_len + 32 - 1:   # Parity part of the Reed-Solomon block received
-            self._decoder_rs_buf.append(self._scrambling([byte], start_pos=self._decoder_pos-3)[0])
+            self._decoder_rs_buf.append(byte ^ _AX100_CCSDS_SEQUENCE_BYTES[self._decoder_pos - 3])
             self._decoder_pos = 0
 
-            rs = ReedSolomon()
-
-            data, err_pos, err = rs.decode(self._decoder_rs_buf.copy(), 255 - 32 - self._decoder_pkt_len)
+            data, err_pos, err = self._rs.decode(self._decoder_rs_buf.copy(), 255 - 32 - self._decoder_pkt_len)
 
             self._decoder_rs_buf.clear()
 
+            self._errors = (self._decoder_golay_err, err)
+
             return data[:self._decoder_pkt_len]
         else:   # Decoder is lost! Reset
             self.reset_decoder()
@@ -267,10 +357,13 @@ class AX100Mode5:
         self._decoder_pos = 0
         self._decoder_pkt_len = 0
         self._decoder_golay_buf.clear()
+        self._decoder_golay_err = 0
         self._decoder_rs_buf.clear()
 
     def _scrambling(self, data, start_pos=0):
         """
+        Applies the CCSDS scrambling (a single XOR of the whole block with the scrambling sequence).
+
         :param data: Is the data to apply the CCSDS scrambling.
         :type: list[int]
 
@@ -280,7 +373,11 @@ class AX100Mode5:
         :return: The input data scrambled.
         :rtype: list[int]
         """
-        for i in range(len(data)):
-            data[i] ^= _AX100_CCSDS_POLY[(i + start_pos) % len(_AX100_CCSDS_POLY)]
+        data = np.asarray(data, dtype=np.uint8)
+        start_pos %= len(_AX100_CCSDS_POLY)
+
+        seq = _AX100_CCSDS_SEQUENCE[start_pos:start_pos + len(data)]
+        if len(seq) < len(data):
+            seq = np.resize(_AX100_CCSDS_SEQUENCE[start_pos:start_pos + len(_AX100_CCSDS_POLY)], len(data))  # Longer than a period
 
-        return data
+        return (data ^ seq).tolist()
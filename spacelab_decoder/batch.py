@@ -0,0 +1,375 @@
+#
+#  batch.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+import pyngham
+
+from spacelab_decoder.time_sync import TimeSync
+from spacelab_decoder.bit_decoder import BitDecoder
+from spacelab_decoder.ax100 import AX100Mode5
+from spacelab_decoder.packet import PacketSLP, PacketCSP
+from spacelab_decoder.satellite_registry import get_satellite_registry, find_sat_config
+from spacelab_decoder.wav_reader import WavReader
+from spacelab_decoder.metrics import get_metrics, timed, JsonFileSink
+from spacelab_decoder.event_log import EventLog
+
+_BATCH_DEFAULT_MAX_BIT_ERR      = 4
+
+_PROTOCOL_NGHAM                 = "NGHam"
+_PROTOCOL_AX100MODE5            = "AX100-Mode5"
+
+class BatchDecoder:
+    """
+    Headless decoder of audio files.
+
+    It runs the same decoding pipeline of the graphical interface (TimeSync, BitDecoder, link layer protocol and
+    network layer packet) and returns the decoded packets as records.
+    """
+    def __init__(self, sat_config, link_id, max_bit_err=_BATCH_DEFAULT_MAX_BIT_ERR, ax100_len_err=False):
+        """
+        Class constructor.
+
+        :param sat_config: Is the satellite configuration file (JSON).
+        :type: str
+
+        :param link_id: Is the ID of the communication link to decode.
+        :type: str
+
+        :param max_bit_err: Is the maximum allowed bit errors in the sync word.
+        :type: int
+
+        :param ax100_len_err: If True, the length field of AX100-Mode5 packets is used even with a Golay24 error.
+        :type: bool
+        """
+        self._sat_config = sat_config
+        self._satellite = get_satellite_registry().get_satellite(sat_config)
+
+        links = self._satellite.get_links()
+        for i in range(len(links)):
+            if links[i].get_id() == link_id:
+                self._satellite.set_active_link(i)
+                break
+        else:
+            raise RuntimeError("The link \"" + link_id + "\" does not exist in the satellite configuration file!")
+
+        self._max_bit_err = max_bit_err
+
+        self._ngham = pyngham.PyNGHam()
+        self._ax100 = AX100Mode5()
+        self._ax100.set_ignore_golay_error(ax100_len_err)
+
+        self._busy_until = 0    # Position in the bitstream of the end of the last decoded packet
+
+    def get_satellite(self):
+        """
+        Gets the satellite being decoded.
+
+        :return: The satellite object.
+        :rtype: Satellite
+        """
+        return self._satellite
+
+    def get_link(self):
+        """
+        Gets the communication link being decoded.
+
+        :return: The active link of the satellite.
+        :rtype: Link
+        """
+        return self._satellite.get_active_link()
+
+    def decode_file(self, filename):
+        """
+        Decodes all the packets of an audio file.
+
+        The file is read in blocks, so the memory usage does not depend on the length of the recording.
+
+        The time of each packet is estimated from its position in the file, taking the modification time of the file
+        as the end of the recording.
+
+        :param filename: Is the WAV file to decode.
+        :type: str
+
+        :return: The decoded packets as records and the number of samples of the audio file.
+        :rtype: tuple[list[dict], int]
+        """
+        with WavReader(filename) as reader:
+            num_samples = len(reader)
+            sample_rate = reader.get_sample_rate()
+
+            time_sync = TimeSync(reader.get_sample_rate(), self.get_link().get_baudrate())
+            bit_decoder = self._get_bit_decoder()
+
+            self._busy_until = 0
+
+            pkts = list()
+            for block in reader:
+                pkts += self._decode_candidates(bit_decoder.decode_candidates(time_sync.decode_stream(block, soft=True), final=False))
+
+        pkts += self._decode_candidates(bit_decoder.decode_candidates([], final=True))
+
+        t_start = datetime.fromtimestamp(os.path.getmtime(filename), timezone.utc) - timedelta(seconds=num_samples/sample_rate)
+
+        records = list()
+        pkt_csp = PacketCSP()
+        for pkt, fec, pos in pkts:
+            rec = dict()
+            rec['file'] = filename
+            rec['time'] = (t_start + timedelta(seconds=pos/self.get_link().get_baudrate())).isoformat()    # pos is in bits
+            rec.update(self._decode_packet(pkt, pkt_csp, fec))
+            records.append(rec)
+
+        return records, num_samples
+
+    def find_packets(self, bitstream):
+        """
+        Finds the link layer packets of a bitstream.
+
+        :param bitstream: Is the bitstream to decode (or the soft symbols of the bits).
+        :type: list[int] or np.ndarray
+
+        :return: The data of each decoded packet.
+        :rtype: list[list[int]]
+        """
+        self._busy_until = 0
+
+        return [pkt for pkt, fec, pos in self._decode_candidates(self._get_bit_decoder().decode_candidates(bitstream))]
+
+    def _get_bit_decoder(self):
+        sync_word = self.get_link().get_sync_word().copy()
+        sync_word.reverse()
+
+        return BitDecoder(sync_word, self._max_bit_err, inverted=True)
+
+    def _decode_candidates(self, candidates):
+        # Every sync word match (with any number of bit errors up to the maximum, in both polarities) is a hypothesis,
+        # and the first one that passes the FEC of the link layer wins; the other hypotheses inside the decoded packet
+        # are discarded
+        protocol = self.get_link().get_link_protocol()
+        metrics = get_metrics()
+
+        pkts = list()
+        for pos, frame, err, inverted, erasures in candidates:
+            if pos < self._busy_until:
+                continue
+
+            metrics.count("sync_hits")
+            if inverted:
+                metrics.count("sync_hits_inverted")
+
+            if protocol == _PROTOCOL_NGHAM:
+                pl, num_bytes, fec = self._decode_ngham_candidate(frame)
+            elif protocol == _PROTOCOL_AX100MODE5:
+                pl, num_bytes, fec = self._decode_ax100mode5_candidate(frame, erasures)
+            else:
+                raise RuntimeError("The protocol \"" + protocol + "\" is not supported!")
+
+            if pl is not None:
+                pkts.append((pl, fec, pos))
+                self._busy_until = pos + 8*num_bytes
+            else:
+                metrics.count("sync_false")
+
+        metrics.count("frames_decoded", len(pkts))
+
+        return pkts
+
+    @timed("ngham")
+    def _decode_ngham_candidate(self, frame):
+        for i in range(len(frame)):
+            pl, err, err_loc = self._ngham.decode_byte(frame[i])
+            if len(pl) > 0:
+                return pl, i + 1, {'rs_errors': err}
+            elif err == -1:
+                return None, 0, None
+
+        self._ngham = pyngham.PyNGHam() # The frame ended in the middle of a packet, the next one starts from a clean decoder
+
+        return None, 0, None
+
+    def _decode_ax100mode5_candidate(self, frame, erasures):
+        try:
+            pl = self._ax100.decode_frame(frame, erasures)
+        except RuntimeError:
+            return None, 0, None    # Invalid length field or uncorrectable block
+
+        if pl is None:
+            return None, 0, None
+
+        golay_err, rs_err = self._ax100.get_errors()
+
+        return pl, 3 + len(pl) + 32, {'golay_errors': golay_err, 'rs_errors': rs_err}    # Length field (Golay24), payload and Reed-Solomon parity
+
+    def _decode_packet(self, pkt, pkt_csp, fec=None):
+        rec = dict()
+        rec['satellite'] = self._satellite.get_name()
+        rec['link'] = self.get_link().get_id()
+        rec['raw'] = bytes(pkt).hex()
+
+        if fec is not None:
+            rec.update(fec)     # Errors corrected by the link layer
+
+        try:
+            if self.get_link().get_network_protocol() == "CSP":
+                pkt_csp.set_config(self._sat_config)
+                pkt_csp.set_pkt(pkt)
+                record = pkt_csp.decode()
+                rec['data'] = dict() if record is None else record.get_data()   # Empty for fragments of a data request
+            elif self.get_link().get_network_protocol() == "SLP":
+                rec['data'] = PacketSLP(self._sat_config, pkt).decode().get_data()
+        except (RuntimeError, IndexError) as e:     # IndexError: packet shorter than its type
+            rec['error'] = str(e)
+
+        return rec
+
+def _expand_files(patterns):
+    files = list()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            files += sorted(glob.glob(pattern, recursive=True))
+        else:
+            files.append(pattern)
+
+    return files
+
+_batch_decoder = None
+
+def _init_worker(sat_config, link_id, max_bit_err, ax100_len_err, metrics=False):
+    global _batch_decoder
+    _batch_decoder = BatchDecoder(sat_config, link_id, max_bit_err, ax100_len_err)
+    get_metrics().set_enabled(metrics)
+
+def _decode_file_job(filename):
+    try:
+        records, num_samples = _batch_decoder.decode_file(filename)
+    except Exception as e:
+        return filename, list(), 0, str(e)
+
+    return filename, records, num_samples, None
+
+def _decode_file_job_metrics(filename):
+    # The metrics of each file are collected in the worker process and added to the ones of the main process
+    metrics = get_metrics()
+    metrics.reset()
+
+    return _decode_file_job(filename), metrics.snapshot()
+
+def _merge_metrics(results):
+    for result, snapshot in results:
+        get_metrics().merge(snapshot)
+        yield result
+
+def main(args=None):
+    """
+    Batch decoder command line interface.
+
+    :param args: Are the command line arguments (without the program name and the "batch" command).
+    :type: list[str]
+
+    :return: The exit code (0 if all the files were decoded, 1 otherwise).
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="spacelab-decoder batch", description="Decodes WAV files without the graphical interface, writing the packets as JSON Lines.")
+    parser.add_argument("files", nargs='+', help="WAV files or glob patterns (ex.: \"passes/**/*.wav\")")
+    parser.add_argument("-s", "--satellite", required=True, help="satellite configuration file (or the name of a distributed one, ex.: golds-ufsc)")
+    parser.add_argument("-l", "--link", required=True, help="ID of the communication link (ex.: downlink_vhf)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of parallel processes (default: 1)")
+    parser.add_argument("-o", "--output", default="-", help="JSON Lines output file (default: stdout)")
+    parser.add_argument("--max-bit-err", type=int, default=_BATCH_DEFAULT_MAX_BIT_ERR, help="maximum bit errors in the sync word (default: %(default)s)")
+    parser.add_argument("--ax100-len-err", action="store_true", help="use the AX100-Mode5 length field even with a Golay24 error")
+    parser.add_argument("--metrics", metavar="FILE", help="write the decoding metrics (counters and time of each stage) to a JSON file")
+    parser.add_argument("--event-log", metavar="DIR", help="also write the packets to a compressed event log directory")
+    parser.add_argument("--event-log-compression", choices=["gzip", "zstd"], default="gzip", help="compression of the event log segments (default: %(default)s)")
+
+    opts = parser.parse_args(args)
+
+    if opts.jobs < 1:
+        parser.error("the number of jobs must be at least 1")
+
+    try:
+        sat_config = find_sat_config(opts.satellite)
+        worker_args = (sat_config, opts.link, opts.max_bit_err, opts.ax100_len_err, opts.metrics is not None)
+        _init_worker(*worker_args)  # Validates the configuration before starting the workers
+
+        event_log = None if opts.event_log is None else EventLog(opts.event_log, opts.event_log_compression)
+    except (RuntimeError, ValueError, KeyError, OSError) as e:
+        print("Error: " + str(e), file=sys.stderr)
+        return 1
+
+    files = _expand_files(opts.files)
+
+    out = sys.stdout if opts.output == "-" else open(opts.output, "w")
+
+    num_files = 0
+    num_samples = 0
+    num_pkts = 0
+    failed = 0
+
+    executor = None
+
+    t_start = time.perf_counter()
+    try:
+        if opts.jobs == 1:
+            results = map(_decode_file_job, files)
+        else:
+            executor = ProcessPoolExecutor(max_workers=opts.jobs, initializer=_init_worker, initargs=worker_args)
+            if opts.metrics is None:
+                results = executor.map(_decode_file_job, files)
+            else:
+                results = _merge_metrics(executor.map(_decode_file_job_metrics, files))
+
+        for filename, records, samples, err in results:
+            if err is None:
+                num_files += 1
+                num_samples += samples
+                num_pkts += len(records)
+                for rec in records:
+                    out.write(json.dumps(rec) + "\n")
+                    if event_log is not None:
+                        event_log.write_record(rec)
+            else:
+                failed += 1
+                print("Error decoding \"" + filename + "\": " + err, file=sys.stderr)
+    finally:
+        if executor:
+            executor.shutdown()
+        if event_log is not None:
+            event_log.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - t_start
+
+    if opts.metrics is not None:
+        JsonFileSink(opts.metrics)(get_metrics().snapshot())
+
+    print("%d packet(s) decoded from %d file(s) (%d sample(s)) in %.2f s: %.2f files/s, %.0f samples/s" % (num_pkts, num_files, num_samples, elapsed, num_files/elapsed if elapsed > 0 else 0, num_samples/elapsed if elapsed > 0 else 0), file=sys.stderr)
+
+    return 1 if failed > 0 else 0
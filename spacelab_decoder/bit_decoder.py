@@ -20,23 +20,39 @@
 #
 #
 
-from spacelab_decoder.bit_buffer import BitBuffer, _BIT_BUFFER_LSB
-from spacelab_decoder.sync_word import SyncWord, _SYNC_WORD_LSB
+import numpy as np
+
+from spacelab_decoder.sync_correlator import SyncCorrelator
 from spacelab_decoder.byte_buffer import ByteBuffer, _BYTE_BUFFER_LSB
+from spacelab_decoder.metrics import get_metrics, timed
 
 _BIT_DECODER_MAX_BYTES_TO_DECODE = 300
+_BIT_DECODER_ERASURE_THRESHOLD = 0.5   # Confidence of a byte, relative to the median of the frame, to be an erasure
 
 class BitDecoder:
     """
     Bitstream decoder.
     """
-    def __init__(self, sync_word, max_err):
+    def __init__(self, sync_word, max_err, inverted=False):
         """
         Class constructor.
+
+        :param sync_word: Is the sync word as a list of bytes.
+        :type: list[int]
+
+        :param max_err: Is the maximum allowed bit errors in the sync word.
+        :type: int
+
+        :param inverted: If True, decode_candidates also finds frames with inverted polarity.
+        :type: bool
         """
-        self._sync_word_buf = BitBuffer(8*len(sync_word), _BIT_BUFFER_LSB)
-        self._sync_word = SyncWord(sync_word, _SYNC_WORD_LSB)
+        self._sync_word = SyncCorrelator(sync_word)
+        self._sync_word_buf = self._sync_word   # The correlator holds the last received bits
         self._byte_buf = ByteBuffer(_BYTE_BUFFER_LSB)
+        self._bits_buf = np.zeros(0, dtype=np.uint8)    # Bits kept between calls of decode_bits
+        self._cand_buf = np.zeros(0, dtype=np.uint8)    # Bits (or symbols) kept between calls of decode_candidates
+        self._cand_pos = 0                              # Position of the first kept bit in the whole bitstream
+        self._inverted = bool(inverted)
         self._pkt_detected = False
         self._decoded_bytes = 0
         self._max_bit_err = 0
@@ -52,7 +68,7 @@ class BitDecoder:
         :return: The decoded byte if a packet is detected, None otherwise
         :rtype: int or None
         """
-        self._sync_word_buf.push(bool(bit))
+        self._sync_word.push(bit)
 
         if self._pkt_detected:
             self._byte_buf.push(bool(bit))
@@ -67,13 +83,166 @@ class BitDecoder:
                 else:
                     self.reset()
 
-        if (self._sync_word == self._sync_word_buf) >= (len(self._sync_word) - self.get_max_bit_errors()):
+        if self._sync_word.is_synced():
+            get_metrics().count("sync_hits")
             self._decoded_bytes = 0
             self._pkt_detected = True
             self._byte_buf.clear()
 
         return None
 
+    @timed("bit_decoder")
+    def decode_bits(self, bits, final=True):
+        """
+        Decodes a whole bitstream at once.
+
+        The sync words are located in bulk, and the bytes following each one of them are packed as a candidate frame.
+        A frame ends at the next sync word, at the end of the bitstream or after the maximum number of bytes to decode
+        (the same limits used by decode_bit). This method does not use or change the state of the bit-by-bit decoder.
+
+        A long bitstream can be decoded in blocks with final=False. In this case, the bits of a frame that may
+        continue in the next block (and of a sync word that may be split between blocks) are kept and decoded with
+        the next call. The last block must be decoded with final=True.
+
+        :param bits: Is the bitstream to decode (one bit per element).
+        :type: np.ndarray or list[int]
+
+        :param final: If False, the end of the given bits is not considered as the end of the bitstream.
+        :type: bool
+
+        :return: The candidate frames found in the bitstream, in the order they were received.
+        :rtype: list[bytes]
+        """
+        bits = (np.asarray(bits).reshape(-1) != 0).astype(np.uint8)
+
+        if len(self._bits_buf) > 0:
+            bits = np.concatenate((self._bits_buf, bits))
+
+        max_frame_bits = 8*(_BIT_DECODER_MAX_BYTES_TO_DECODE - 1)
+
+        starts = self._sync_word.find_sync(bits)
+        ends = np.minimum(np.append(starts[1:], len(bits)), starts + max_frame_bits)
+
+        if final:
+            self._bits_buf = bits[:0]
+        else:
+            keep = len(bits) - (len(self._sync_word) - 1)   # A sync word can be completed by the next block
+            if len(starts) > 0 and ends[-1] == len(bits) and starts[-1] + max_frame_bits > len(bits):
+                # The last frame is still open, it will be found again from its sync word with the next block
+                keep = min(keep, starts[-1] - len(self._sync_word))
+                starts = starts[:-1]
+                ends = ends[:-1]
+
+            self._bits_buf = bits[max(keep, 0):].copy()
+
+        get_metrics().count("sync_candidates", len(starts))
+
+        frames = list()
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            num_bytes = (end - start) // 8
+            if num_bytes > 0:
+                frames.append(np.packbits(bits[start:start + 8*num_bytes]).tobytes())
+
+        return frames
+
+    @timed("bit_decoder")
+    def decode_candidates(self, bits, final=True):
+        """
+        Decodes a bitstream into overlapping candidate frames.
+
+        Unlike decode_bits, a frame is not ended by the next sync word: each sync word found (with up to the maximum
+        bit errors, and also inverted if enabled) starts a candidate with the maximum number of bytes to decode, so a
+        false sync match before or inside a packet does not cut it. The candidates are meant to be checked by the FEC
+        of the link layer, where the ones that decode win. Bytes of inverted candidates are already flipped back.
+
+        The bitstream can also be given as soft symbols (a floating-point array, as returned by TimeSync with
+        soft=True). In this case, the bytes of each candidate with a bit much weaker than the rest of the frame are
+        returned as erasures (the weakest first), so the Reed-Solomon decoder can correct more of them.
+
+        A long bitstream can be decoded in blocks with final=False (the last block must be decoded with final=True).
+        The positions are counted from the beginning of the whole bitstream.
+
+        :param bits: Is the bitstream to decode (one bit per element), or the soft symbols (one symbol per bit).
+        :type: np.ndarray or list[int]
+
+        :param final: If False, the end of the given bits is not considered as the end of the bitstream.
+        :type: bool
+
+        :return: The position of the first bit after the sync word, the candidate frame, the number of bit errors of
+        the sync word, if it is inverted and the position of the low-confidence bytes in the frame (empty without soft
+        symbols), for each candidate (in the order they were received).
+        :rtype: list[tuple[int, bytes, int, bool, tuple[int]]]
+        """
+        data = np.asarray(bits).reshape(-1)
+        if data.size == 0 or not np.issubdtype(data.dtype, np.floating):
+            data = (data != 0).astype(np.uint8)
+
+        if len(self._cand_buf) > 0:
+            data = np.concatenate((self._cand_buf, data))
+
+        soft = np.issubdtype(data.dtype, np.floating)
+
+        bits = (data > 0).view(np.uint8) if soft else data
+
+        max_frame_bits = 8*(_BIT_DECODER_MAX_BYTES_TO_DECODE - 1)
+
+        starts, errors, flipped = self._sync_word.find_sync_candidates(bits, self._inverted)
+
+        offset = self._cand_pos
+
+        if final:
+            self._cand_buf = np.zeros(0, dtype=np.uint8)
+            self._cand_pos = 0
+        else:
+            keep = len(bits) - (len(self._sync_word) - 1)   # A sync word can be completed by the next block
+
+            # The candidates that are still open will be found again from their sync words with the next block
+            num_closed = int(np.searchsorted(starts, len(bits) - max_frame_bits, side='right'))
+            if num_closed < len(starts):
+                keep = min(keep, int(starts[num_closed]) - len(self._sync_word))
+                starts, errors, flipped = starts[:num_closed], errors[:num_closed], flipped[:num_closed]
+
+            keep = max(keep, 0)
+
+            self._cand_buf = data[keep:].copy()
+            self._cand_pos = offset + keep
+
+        metrics = get_metrics()
+        metrics.count("sync_candidates", len(starts))   # Including the matches inside a frame (the decoder skips them)
+        metrics.count("sync_candidates_inverted", int(np.count_nonzero(flipped)))
+
+        inv_bits = 1 - bits if flipped.any() else None
+        conf = np.abs(data) if soft else None
+
+        candidates = list()
+        for start, err, inv in zip(starts.tolist(), errors.tolist(), flipped.tolist()):
+            num_bytes = min(max_frame_bits, len(bits) - start) // 8
+            if num_bytes > 0:
+                frame = np.packbits((inv_bits if inv else bits)[start:start + 8*num_bytes]).tobytes()
+                erasures = self._get_erasures(conf[start:start + 8*num_bytes]) if soft else tuple()
+                candidates.append((offset + start, frame, err, inv, erasures))
+
+        return candidates
+
+    def _get_erasures(self, conf):
+        """
+        Finds the low-confidence bytes of a frame.
+
+        The confidence of a byte is the confidence of its weakest bit, and the bytes much weaker than the median bit
+        of the frame are erasure candidates.
+
+        :param conf: Is the confidence (symbol magnitude) of each bit of the frame.
+        :type: np.ndarray
+
+        :return: The position of the low-confidence bytes in the frame, from the weakest to the strongest.
+        :rtype: tuple[int]
+        """
+        byte_conf = conf.reshape(-1, 8).min(axis=1)
+
+        erasures = np.flatnonzero(byte_conf < _BIT_DECODER_ERASURE_THRESHOLD*np.median(conf))
+
+        return tuple(erasures[np.argsort(byte_conf[erasures], kind='stable')].tolist())
+
     def reset(self):
         """
         Resets the decoder.
@@ -92,10 +261,8 @@ class BitDecoder:
 
         :return: None
         """
-        if err > len(self._sync_word)/2:
-            raise ValueError("The maximum allowed bit errors in the sync word must not exceed 50 % of the sync word!")
-        else:
-            self._max_bit_err = err
+        self._sync_word.set_max_bit_errors(err)
+        self._max_bit_err = err
 
     def get_max_bit_errors(self):
         """
@@ -0,0 +1,496 @@
+#
+#  event_log.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import io
+import os
+import re
+import sys
+import json
+import gzip
+import time
+import zlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+
+_EVENT_LOG_INDEX_FILE           = "index.jsonl"
+_EVENT_LOG_SEGMENT_PREFIX       = "events-"
+_EVENT_LOG_EXTENSIONS           = {'gzip': ".jsonl.gz", 'zstd': ".jsonl.zst"}
+_EVENT_LOG_DEFAULT_COMPRESSION  = 'gzip'
+_EVENT_LOG_DEFAULT_MAX_SIZE     = 64*1024*1024  # Bytes of records (before compression) of each segment
+_EVENT_LOG_DEFAULT_MAX_DELAY_S  = 5.0           # Maximum time a record stays in the compressor before being readable
+
+_EVENT_LOG_PACKET               = "packet"
+_EVENT_LOG_ERROR                = "error"
+_EVENT_LOG_MESSAGE              = "message"     # Other events of the graphical interface
+
+_EVENT_LOG_RELATIVE_TIME        = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_EVENT_LOG_TIME_UNITS           = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+def _get_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("The zstandard module is required to use zstd compression!")
+
+    return zstandard
+
+def _parse_time(ts):
+    # Timestamps without a timezone are in UTC
+    dt = ts if isinstance(ts, datetime) else datetime.fromisoformat(ts)
+
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+class EventLog:
+    """
+    Structured event log.
+
+    Each event is a record (timestamp, satellite, link, event type, errors corrected by the link layer and the decoded
+    packet) written as a JSON line to a compressed segment. A new segment is started when the current one reaches the
+    maximum size or when the day (UTC) of the events changes. When a segment is closed, a line is added to the index
+    file of the directory with its time range, number of records, satellites, links and event types, so a query only
+    reads the segments that can have the requested events.
+
+    The segments are compressed with gzip, or with zstd if the zstandard module is installed.
+    """
+    def __init__(self, path, compression=_EVENT_LOG_DEFAULT_COMPRESSION, max_size=_EVENT_LOG_DEFAULT_MAX_SIZE, rotate_daily=True, max_delay=_EVENT_LOG_DEFAULT_MAX_DELAY_S):
+        """
+        Constructor.
+
+        :param path: Is the directory of the segments (created if it does not exist).
+        :type: str
+
+        :param compression: Is the compression of the segments ("gzip" or "zstd").
+        :type: str
+
+        :param max_size: Is the maximum size of the records of a segment in bytes (before compression).
+        :type: int
+
+        :param rotate_daily: If True, a new segment is started for each day (UTC).
+        :type: bool
+
+        :param max_delay: Is the maximum time in seconds a record is kept in the compressor before it can be read
+        from the segment.
+        :type: float
+
+        :return: None
+        """
+        if compression not in _EVENT_LOG_EXTENSIONS:
+            raise ValueError("The compression must be \"gzip\" or \"zstd\"!")
+
+        if compression == 'zstd':
+            _get_zstandard()
+
+        if max_size < 1:
+            raise ValueError("The maximum segment size must be positive!")
+
+        self._path = path
+        self._compression = compression
+        self._max_size = int(max_size)
+        self._rotate_daily = bool(rotate_daily)
+        self._max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._segment = None
+        self._segment_name = None
+        self._file = None
+        self._raw_file = None
+        self._last_flush = 0.0
+        self._seq = 0
+        self._closed = False
+
+        os.makedirs(self._path, exist_ok=True)
+
+    def get_path(self):
+        """
+        Gets the directory of the segments.
+
+        :return: The directory of the segments.
+        :rtype: str
+        """
+        return self._path
+
+    def get_compression(self):
+        """
+        Gets the compression of the segments.
+
+        :return: The compression of the segments ("gzip" or "zstd").
+        :rtype: str
+        """
+        return self._compression
+
+    def get_segment(self):
+        """
+        Gets the segment being written.
+
+        :return: The file name of the current segment, or None if no segment is open.
+        :rtype: str
+        """
+        return self._segment_name
+
+    def write(self, event, satellite, link, ts=None, **fields):
+        """
+        Writes an event.
+
+        :param event: Is the type of the event (ex.: "packet" or "error").
+        :type: str
+
+        :param satellite: Is the name of the satellite.
+        :type: str
+
+        :param link: Is the ID of the link.
+        :type: str
+
+        :param ts: Is the time of the event (the current time if None).
+        :type: datetime or str
+
+        :param fields: Are the other fields of the record (ex.: rs_errors=2).
+        :type: dict
+
+        :return: The written record.
+        :rtype: dict
+        """
+        dt = datetime.now(timezone.utc) if ts is None else _parse_time(ts)
+
+        rec = {'time': dt.isoformat(), 'event': event, 'satellite': satellite, 'link': link}
+        rec.update(fields)
+
+        line = (json.dumps(rec) + "\n").encode()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The event log is closed!")
+
+            seg = self._segment
+            if seg is not None and (seg['size'] + len(line) > self._max_size or (self._rotate_daily and dt.date() != seg['day'])):
+                self._close_segment()
+
+            if self._segment is None:
+                self._open_segment(dt)
+
+            seg = self._segment
+            self._file.write(line)
+
+            seg['size'] += len(line)
+            seg['records'] += 1
+            seg['start'] = dt if seg['start'] is None else min(seg['start'], dt)
+            seg['end'] = dt if seg['end'] is None else max(seg['end'], dt)
+            seg['satellites'].add(satellite)
+            seg['links'].add(link)
+            seg['events'].add(event)
+
+            if time.monotonic() - self._last_flush >= self._max_delay:
+                self._flush()
+
+        return rec
+
+    def write_record(self, rec):
+        """
+        Writes the record of a decoded packet (as given by BatchDecoder or SourceDecoder).
+
+        The record is an "error" event if the packet could not be decoded by the network layer, otherwise it is a
+        "packet" event.
+
+        :param rec: Is the record of the packet.
+        :type: dict
+
+        :return: The written record.
+        :rtype: dict
+        """
+        fields = {key: val for key, val in rec.items() if key not in ('time', 'satellite', 'link')}
+
+        return self.write(_EVENT_LOG_ERROR if 'error' in rec else _EVENT_LOG_PACKET, rec['satellite'], rec['link'], rec.get('time'), **fields)
+
+    def flush(self):
+        """
+        Makes the written records readable from the current segment.
+
+        :return: None
+        """
+        with self._lock:
+            self._flush()
+
+    def rotate(self):
+        """
+        Closes the current segment (the next event starts a new one).
+
+        :return: None
+        """
+        with self._lock:
+            self._close_segment()
+
+    def close(self):
+        """
+        Closes the current segment.
+
+        :return: None
+        """
+        with self._lock:
+            self._close_segment()
+            self._closed = True
+
+    def query(self, start=None, end=None, satellite=None, link=None, event=None):
+        """
+        Finds the events of the log (including the ones of the current segment).
+
+        :param start: Is the time of the first event (inclusive).
+        :type: datetime or str
+
+        :param end: Is the time of the last event (exclusive).
+        :type: datetime or str
+
+        :param satellite: Is the name of the satellite (case insensitive).
+        :type: str
+
+        :param link: Is the ID of the link.
+        :type: str
+
+        :param event: Is the type of the event.
+        :type: str
+
+        :return: The records of the events, in the order they were written.
+        :rtype: generator
+        """
+        self.flush()
+
+        return query_events(self._path, start, end, satellite, link, event)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open_segment(self, dt):
+        # The name starts with the time of the first event, so the segments are sorted by name
+        while True:
+            name = _EVENT_LOG_SEGMENT_PREFIX + dt.strftime("%Y%m%dT%H%M%S") + "-" + str(self._seq).zfill(4) + _EVENT_LOG_EXTENSIONS[self._compression]
+            self._seq += 1
+            if not os.path.exists(os.path.join(self._path, name)):
+                break
+
+        self._raw_file = open(os.path.join(self._path, name), 'xb')
+        if self._compression == 'gzip':
+            self._file = gzip.GzipFile(fileobj=self._raw_file, mode='wb')
+        else:
+            self._file = _get_zstandard().ZstdCompressor().stream_writer(self._raw_file, closefd=False)
+
+        self._segment_name = name
+        self._segment = {'day': dt.date(), 'size': 0, 'records': 0, 'start': None, 'end': None, 'satellites': set(), 'links': set(), 'events': set()}
+        self._last_flush = time.monotonic()
+
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()     # Ends the compressed block, so the records can be read by a query
+            self._raw_file.flush()
+
+        self._last_flush = time.monotonic()
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+
+        self._file.close()
+        self._raw_file.close()
+
+        seg = self._segment
+        entry = {'segment': self._segment_name,
+                 'start': seg['start'].isoformat(),
+                 'end': seg['end'].isoformat(),
+                 'records': seg['records'],
+                 'satellites': sorted(seg['satellites']),
+                 'links': sorted(seg['links']),
+                 'events': sorted(seg['events'])}
+
+        with open(os.path.join(self._path, _EVENT_LOG_INDEX_FILE), 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+        self._segment = None
+        self._segment_name = None
+        self._file = None
+        self._raw_file = None
+
+def read_index(path):
+    """
+    Reads the index of the closed segments of an event log.
+
+    :param path: Is the directory of the segments.
+    :type: str
+
+    :return: The index entry of each closed segment (segment, start, end, records, satellites, links and events).
+    :rtype: list[dict]
+    """
+    index = os.path.join(path, _EVENT_LOG_INDEX_FILE)
+    if not os.path.exists(index):
+        return list()
+
+    entries = list()
+    with open(index) as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                pass    # A line being written by another process
+
+    return entries
+
+def read_segment(filename):
+    """
+    Reads the records of a segment.
+
+    A segment still being written can be read up to the last flushed record.
+
+    :param filename: Is the segment file.
+    :type: str
+
+    :return: The records of the segment.
+    :rtype: generator
+    """
+    if filename.endswith(_EVENT_LOG_EXTENSIONS['zstd']):
+        reader = io.BufferedReader(_get_zstandard().ZstdDecompressor().stream_reader(open(filename, 'rb'), read_across_frames=True, closefd=True))
+    else:
+        reader = gzip.open(filename, 'rb')
+
+    with reader:
+        try:
+            for line in reader:
+                if line.endswith(b"\n"):
+                    yield json.loads(line)
+        except (EOFError, zlib.error):
+            pass    # End of the flushed records of an open segment
+
+def query_events(path, start=None, end=None, satellite=None, link=None, event=None):
+    """
+    Finds the events of an event log.
+
+    The closed segments are selected by the index, and only the segments that can have the requested events are read.
+    The segments not in the index (the ones still being written) are always read.
+
+    :param path: Is the directory of the segments.
+    :type: str
+
+    :param start: Is the time of the first event (inclusive).
+    :type: datetime or str
+
+    :param end: Is the time of the last event (exclusive).
+    :type: datetime or str
+
+    :param satellite: Is the name of the satellite (case insensitive).
+    :type: str
+
+    :param link: Is the ID of the link.
+    :type: str
+
+    :param event: Is the type of the event.
+    :type: str
+
+    :return: The records of the events, sorted by segment.
+    :rtype: generator
+    """
+    start = None if start is None else _parse_time(start)
+    end = None if end is None else _parse_time(end)
+    satellite = None if satellite is None else satellite.lower()
+
+    indexed = dict()
+    for entry in read_index(path):
+        indexed[entry['segment']] = entry
+
+    segments = sorted(name for name in os.listdir(path) if name.startswith(_EVENT_LOG_SEGMENT_PREFIX) and name.endswith(tuple(_EVENT_LOG_EXTENSIONS.values())))
+
+    for name in segments:
+        entry = indexed.get(name)
+        if entry is not None:
+            if start is not None and _parse_time(entry['end']) < start:
+                continue
+            if end is not None and _parse_time(entry['start']) >= end:
+                continue
+            if satellite is not None and satellite not in (sat.lower() for sat in entry['satellites'] if sat is not None):
+                continue
+            if link is not None and link not in entry['links']:
+                continue
+            if event is not None and event not in entry['events']:
+                continue
+
+        for rec in read_segment(os.path.join(path, name)):
+            if start is not None or end is not None:
+                dt = _parse_time(rec['time'])
+                if (start is not None and dt < start) or (end is not None and dt >= end):
+                    continue
+            if satellite is not None and (rec['satellite'] or "").lower() != satellite:
+                continue
+            if link is not None and rec['link'] != link:
+                continue
+            if event is not None and rec['event'] != event:
+                continue
+
+            yield rec
+
+def _parse_query_time(text):
+    # Relative to the current time (ex.: "7d" is seven days ago) or an ISO 8601 timestamp
+    match = _EVENT_LOG_RELATIVE_TIME.match(text)
+    if match:
+        return datetime.now(timezone.utc) - timedelta(seconds=float(match.group(1))*_EVENT_LOG_TIME_UNITS[match.group(2)])
+
+    try:
+        return _parse_time(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid time \"" + text + "\" (expected an ISO 8601 timestamp or a duration as 7d, 12h, 30m)")
+
+def main(args=None):
+    """
+    Event log query command line interface.
+
+    :param args: Are the command line arguments (without the program name and the "events" command).
+    :type: list[str]
+
+    :return: The exit code.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="spacelab-decoder events", description="Finds the events of an event log directory, writing them as JSON Lines.")
+    parser.add_argument("path", help="directory of the event log")
+    parser.add_argument("--since", type=_parse_query_time, help="time of the first event (ISO 8601, or a duration before now, ex.: 7d)")
+    parser.add_argument("--until", type=_parse_query_time, help="time after the last event (ISO 8601, or a duration before now)")
+    parser.add_argument("-s", "--satellite", help="name of the satellite (ex.: Catarina-A2)")
+    parser.add_argument("-l", "--link", help="ID of the communication link (ex.: downlink)")
+    parser.add_argument("-e", "--event", help="type of the events (ex.: packet or error)")
+    parser.add_argument("-c", "--count", action="store_true", help="only print the number of events")
+
+    opts = parser.parse_args(args)
+
+    if not os.path.isdir(opts.path):
+        print("Error: the event log directory \"" + opts.path + "\" does not exist!", file=sys.stderr)
+        return 1
+
+    num = 0
+    try:
+        for rec in query_events(opts.path, opts.since, opts.until, opts.satellite, opts.link, opts.event):
+            num += 1
+            if not opts.count:
+                sys.stdout.write(json.dumps(rec) + "\n")
+    except (RuntimeError, OSError) as e:
+        print("Error: " + str(e), file=sys.stderr)
+        return 1
+
+    if opts.count:
+        print(num)
+
+    return 0
@@ -0,0 +1,220 @@
+#
+#  frame_parser.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+_FRAME_PARSER_LENGTH_SIZE       = 2         # Bytes of the length prefix (big-endian)
+_FRAME_PARSER_MAX_FRAME_LEN     = 65535     # Bytes
+
+_KISS_FEND                      = 0xC0      # Frame end
+_KISS_FESC                      = 0xDB      # Frame escape
+_KISS_TFEND                     = 0xDC      # Transposed frame end
+_KISS_TFESC                     = 0xDD      # Transposed frame escape
+_KISS_CMD_DATA                  = 0x00      # Data frame command (low nibble of the type byte)
+
+class LengthFrameParser:
+    """
+    Parser of length-prefixed frames.
+
+    Each frame is preceded by its length as a 16-bit big-endian integer. The received bytes are appended to a single
+    buffer, the frames are sliced from a memoryview of it, and the parsed bytes are removed once per call, so the cost
+    of a call does not depend on the number of frames or on how the stream was split.
+    """
+    def __init__(self):
+        """
+        Class constructor.
+        """
+        self._buf = bytearray()
+
+    def __len__(self):
+        """
+        Number of buffered bytes.
+
+        :return: The number of received bytes that are not part of a parsed frame yet.
+        :rtype: int
+        """
+        return len(self._buf)
+
+    @staticmethod
+    def encode(frame):
+        """
+        Encodes a frame.
+
+        :param frame: Is the content of the frame.
+        :type: bytes
+
+        :return: The frame with the length prefix.
+        :rtype: bytes
+        """
+        if len(frame) > _FRAME_PARSER_MAX_FRAME_LEN:
+            raise ValueError("The frame length must not exceed " + str(_FRAME_PARSER_MAX_FRAME_LEN) + " bytes!")
+
+        return len(frame).to_bytes(_FRAME_PARSER_LENGTH_SIZE, 'big') + bytes(frame)
+
+    def feed(self, data):
+        """
+        Parses the received bytes.
+
+        :param data: Are the received bytes (any part of the stream).
+        :type: bytes
+
+        :return: The frames completed by the given bytes (without the length prefix).
+        :rtype: list[bytes]
+        """
+        self._buf += data
+
+        frames = list()
+        pos = 0
+        with memoryview(self._buf) as buf:
+            n = len(buf)
+            while n - pos >= _FRAME_PARSER_LENGTH_SIZE:
+                end = pos + _FRAME_PARSER_LENGTH_SIZE + ((buf[pos] << 8) | buf[pos + 1])
+                if end > n:
+                    break   # Incomplete frame
+
+                if end > pos + _FRAME_PARSER_LENGTH_SIZE:
+                    frames.append(bytes(buf[pos + _FRAME_PARSER_LENGTH_SIZE:end]))
+
+                pos = end
+
+        del self._buf[:pos]
+
+        return frames
+
+    def reset(self):
+        """
+        Discards the buffered bytes.
+
+        :return: None
+        """
+        self._buf.clear()
+
+class KissFrameParser:
+    """
+    Parser of KISS frames.
+
+    The frames are delimited by FEND bytes and the FEND and FESC bytes of their content are escaped. The delimiters are
+    located with bytearray.find() and the escape sequences are replaced with bytes.replace(), so the bytes of the
+    stream are never handled one by one in Python. Only data frames are returned (the type byte is removed).
+    """
+    def __init__(self, max_len=_FRAME_PARSER_MAX_FRAME_LEN):
+        """
+        Class constructor.
+
+        :param max_len: Is the maximum length of a frame (longer frames are discarded).
+        :type: int
+        """
+        if max_len < 1:
+            raise ValueError("The maximum frame length must be greater than zero!")
+
+        self._max_len = max_len
+        self._buf = bytearray()
+        self._discard = False   # The frame in progress is too long
+
+    def __len__(self):
+        """
+        Number of buffered bytes.
+
+        :return: The number of received bytes that are not part of a parsed frame yet.
+        :rtype: int
+        """
+        return len(self._buf)
+
+    @staticmethod
+    def encode(frame, port=0):
+        """
+        Encodes a data frame.
+
+        :param frame: Is the content of the frame.
+        :type: bytes
+
+        :param port: Is the KISS port of the frame (0 to 15).
+        :type: int
+
+        :return: The escaped frame between FEND bytes.
+        :rtype: bytes
+        """
+        data = bytes(frame).replace(bytes([_KISS_FESC]), bytes([_KISS_FESC, _KISS_TFESC])).replace(bytes([_KISS_FEND]), bytes([_KISS_FESC, _KISS_TFEND]))
+
+        return bytes([_KISS_FEND, ((port & 0x0F) << 4) | _KISS_CMD_DATA]) + data + bytes([_KISS_FEND])
+
+    def feed(self, data):
+        """
+        Parses the received bytes.
+
+        :param data: Are the received bytes (any part of the stream).
+        :type: bytes
+
+        :return: The data frames completed by the given bytes (unescaped and without the type byte).
+        :rtype: list[bytes]
+        """
+        self._buf += data
+
+        frames = list()
+        pos = 0
+        with memoryview(self._buf) as buf:
+            while True:
+                end = self._buf.find(_KISS_FEND, pos)
+                if end < 0:
+                    break
+
+                if self._discard:
+                    self._discard = False
+                elif end - pos > 1 and buf[pos] & 0x0F == _KISS_CMD_DATA:
+                    frame = bytes(buf[pos + 1:end])
+                    if _KISS_FESC in frame:
+                        frame = frame.replace(bytes([_KISS_FESC, _KISS_TFEND]), bytes([_KISS_FEND])).replace(bytes([_KISS_FESC, _KISS_TFESC]), bytes([_KISS_FESC]))
+                    frames.append(frame)
+
+                pos = end + 1
+
+        del self._buf[:pos]
+
+        if len(self._buf) > self._max_len + 1:
+            self._buf.clear()       # The rest of the frame is discarded up to the next FEND
+            self._discard = True
+
+        return frames
+
+    def reset(self):
+        """
+        Discards the buffered bytes.
+
+        :return: None
+        """
+        self._buf.clear()
+        self._discard = False
+
+_FRAME_PARSERS = {'length': LengthFrameParser, 'kiss': KissFrameParser}
+
+def get_frame_parser(framing):
+    """
+    Creates a frame parser.
+
+    :param framing: Is the framing of the stream ("length" or "kiss").
+    :type: str
+
+    :return: A new parser of the given framing.
+    :rtype: LengthFrameParser or KissFrameParser
+    """
+    if framing not in _FRAME_PARSERS:
+        raise ValueError("The framing must be one of: " + ", ".join(_FRAME_PARSERS) + "!")
+
+    return _FRAME_PARSERS[framing]()
@@ -22,38 +22,52 @@
 
 import numpy as np
 
+# Parity-check matrix for Golay(24, 12) code
+_GOLAY24_H = (0x8008ED,
+              0x4001DB,
+              0x2003B5,
+              0x100769,
+              0x080ED1,
+              0x040DA3,
+              0x020B47,
+              0x01068F,
+              0x008D1D,
+              0x004A3B,
+              0x002477,
+              0x001FFE)
+
 class Golay24:
     """
     Golay24 class.
 
     This class implements the Golay(24,12,8) code.
 
+    The codewords of all 4096 data values and the error pattern of all 4096 syndromes are computed once (when the
+    first instance is created) and shared by all instances, so encoding and decoding are table lookups.
+
     Based on the implementation of:
     https://github.com/daniestevez/gr-satellites/blob/master/lib/golay24.c
     """
 
+    _encode_table = None        # Codeword of each 12-bit value
+    _syndrome_tables = None     # Syndrome contribution of each byte of a 24-bit word (MSB first)
+    _error_table = None         # Error pattern of each syndrome (-1 if uncorrectable)
+    _weight_table = None        # Hamming weight of each error pattern (-1 if uncorrectable)
+    _array_tables = None        # NumPy versions of the decoding tables (used by decode_array)
+
     def __init__(self):
         """
         Class initialization.
 
-        This method initializes the Golay parity matrix.
+        This method initializes the Golay parity matrix and the lookup tables (if not initialized yet).
 
         :return: None
         :rtype: None
         """
-        # Parity-check matrix for Golay(24, 12) code
-        self.H = [0x8008ED,
-                  0x4001DB,
-                  0x2003B5,
-                  0x100769,
-                  0x080ED1,
-                  0x040DA3,
-                  0x020B47,
-                  0x01068F,
-                  0x008D1D,
-                  0x004A3B,
-                  0x002477,
-                  0x001FFE]
+        self.H = _GOLAY24_H
+
+        if Golay24._error_table is None:
+            self._build_tables()
 
     def encode(self, data):
         """
@@ -68,27 +82,10 @@ class Golay24:
         if data < 0 or data > 4095:
             raise ValueError("Input data must be a 12-bit integer (0 to 4095)!")
 
-        # Extract the lower 12 bits of the input data
-        r = data & 0xFFF
-        s = 0
-
-        # Compute the parity bits
-        for i in range(len(self.H)):    # Number of rows in H
-            s <<= 1
-            # Calculate parity of (H[i] & r) using the built-in bin().count('1')
-            parity = bin(self.H[i] & r).count('1') % 2
-            s |= parity
-
-        # Combine the parity bits (s) and the original data (r) into the final codeword
-        encoded_data = ((s & 0xFFF) << len(self.H)) | r
+        encoded_data = Golay24._encode_table[data]
 
         # Translate the result to a list with three bytes
-        res = list()
-        res.append((encoded_data >> 16) & 0xFF)
-        res.append((encoded_data >> 8) & 0xFF)
-        res.append(encoded_data & 0xFF)
-
-        return res
+        return [(encoded_data >> 16) & 0xFF, (encoded_data >> 8) & 0xFF, encoded_data & 0xFF]
 
     def decode(self, encoded_bytes):
         """
@@ -103,61 +100,134 @@ class Golay24:
         if len(encoded_bytes) != 3 or any(byte < 0 or byte > 255 for byte in encoded_bytes):
             raise ValueError("Input must be a list of 3 bytes (integers between 0 and 255)!")
 
+        syn = Golay24._syndrome_tables
+        s = syn[0][encoded_bytes[0]] ^ syn[1][encoded_bytes[1]] ^ syn[2][encoded_bytes[2]]
+
+        e = Golay24._error_table[s]
+        if e < 0:
+            return -1, None
+
         r = (encoded_bytes[0] << 16) | (encoded_bytes[1] << 8) | (encoded_bytes[2])
-        s = 0     # Syndrome
-        q = 0     # Modified syndrome
-        e = 0     # Estimated error vector
 
-        # Step 1. Compute syndrome s = H * r
+        # Correct the codeword (c = r + e) and return the number of errors corrected (Hamming weight of e)
+        return (r ^ e) & 0xFFF, Golay24._weight_table[s]
+
+    def decode_array(self, words):
+        """
+        Decodes an array of 24-bit Golay codes at once.
+
+        :param words: An array of integers with a 24-bit Golay code in each element.
+        :type: np.ndarray
+
+        :return: An array with the decoded 12-bit data of each word (-1 if uncorrectable).
+        :rtype: np.ndarray
+
+        :return: An array with the number of errors corrected in each word (-1 if uncorrectable).
+        :rtype: np.ndarray
+        """
+        words = np.asarray(words, dtype=np.int64)
+
+        syn, error_table, weight_table = Golay24._array_tables
+
+        s = syn[0][(words >> 16) & 0xFF] ^ syn[1][(words >> 8) & 0xFF] ^ syn[2][words & 0xFF]
+
+        e = error_table[s]
+        weight = weight_table[s]
+
+        data = np.where(e < 0, -1, (words ^ e) & 0xFFF)
+
+        return data, weight
+
+    def _build_tables(self):
+        """
+        Builds the encoding and decoding lookup tables.
+
+        :return: None
+        """
+        # The code is linear, so the syndrome of a word is the XOR of the syndromes of its bytes
+        syndrome_tables = list()
+        for shift in (16, 8, 0):
+            syndrome_tables.append([self._syndrome(byte << shift) for byte in range(256)])
+
+        # The parity bits are the syndrome of the data placed in the 12 least significant bits
+        encode_table = [((self._syndrome(data) & 0xFFF) << len(self.H)) | data for data in range(4096)]
+
+        error_table = list()
+        weight_table = list()
+        for s in range(4096):
+            e = self._error_pattern(s)
+            error_table.append(e)
+            weight_table.append(-1 if e < 0 else self._hamming_weight(e))
+
+        array_tables = (np.array(syndrome_tables, dtype=np.int64),
+                        np.array(error_table, dtype=np.int64),
+                        np.array(weight_table, dtype=np.int64))
+
+        for table in array_tables:
+            table.flags.writeable = False   # Shared by all instances
+
+        Golay24._syndrome_tables = tuple(tuple(table) for table in syndrome_tables)
+        Golay24._encode_table = tuple(encode_table)
+        Golay24._weight_table = tuple(weight_table)
+        Golay24._error_table = tuple(error_table)
+        Golay24._array_tables = array_tables
+
+    def _syndrome(self, r):
+        """
+        Computes the syndrome of a 24-bit word (s = H * r).
+
+        :param r: The 24-bit word.
+        :type: int
+
+        :return: The 12-bit syndrome.
+        :rtype: int
+        """
+        s = 0
         for i in range(len(self.H)):
             s <<= 1
-            parity = bin(self.H[i] & r).count('1') % 2
-            s |= parity
+            s |= bin(self.H[i] & r).count('1') % 2
+
+        return s
+
+    def _error_pattern(self, s):
+        """
+        Estimates the error vector of a given syndrome.
 
+        :param s: The 12-bit syndrome.
+        :type: int
+
+        :return: The estimated 24-bit error vector, or -1 if the error is uncorrectable.
+        :rtype: int
+        """
         # Step 2. If w(s) <= 3, then e = (s, 0) and go to step 8
         if self._hamming_weight(s) <= 3:
-            e = s << len(self.H)
-            goto_step8 = True
-        else:
-            # Step 3. If w(s + B[i]) <= 2, then e = (s + B[i], e_{i+1}) and go to step 8
-            goto_step8 = False
-            for i in range(len(self.H)):
-                s_xor_B = s ^ self._B(i)
-                if self._hamming_weight(s_xor_B) <= 2:
-                    e = (s_xor_B << len(self.H)) | (1 << (len(self.H) - i - 1))
-                    goto_step8 = True
-                    break
-
-            if not goto_step8:
-                # Step 4. Compute q = B * s
-                q = 0
-                for i in range(len(self.H)):
-                    q <<= 1
-                    parity = bin(self._B(i) & s).count('1') % 2
-                    q |= parity
-
-                # Step 5. If w(q) <= 3, then e = (0, q) and go to step 8
-                if self._hamming_weight(q) <= 3:
-                    e = q
-                    goto_step8 = True
-                else:
-                    # Step 6. If w(q + B[i]) <= 2, then e = (e_{i+1}, q + B[i]) and go to step 8
-                    for i in range(len(self.H)):
-                        q_xor_B = q ^ self._B(i)
-                        if self._hamming_weight(q_xor_B) <= 2:
-                            e = (1 << (2 * len(self.H) - i - 1)) | q_xor_B
-                            goto_step8 = True
-                            break
-
-                    # Step 7. If no condition is met, r is uncorrectable
-                    if not goto_step8:
-                        return -1, None
-
-        # Step 8. Correct the codeword: c = r + e
-        corrected_data = r ^ e
-
-        # Return the number of errors corrected (Hamming weight of e)
-        return corrected_data & 0xFFF, self._hamming_weight(e)
+            return s << len(self.H)
+
+        # Step 3. If w(s + B[i]) <= 2, then e = (s + B[i], e_{i+1}) and go to step 8
+        for i in range(len(self.H)):
+            s_xor_B = s ^ self._B(i)
+            if self._hamming_weight(s_xor_B) <= 2:
+                return (s_xor_B << len(self.H)) | (1 << (len(self.H) - i - 1))
+
+        # Step 4. Compute q = B * s
+        q = 0
+        for i in range(len(self.H)):
+            q <<= 1
+            parity = bin(self._B(i) & s).count('1') % 2
+            q |= parity
+
+        # Step 5. If w(q) <= 3, then e = (0, q) and go to step 8
+        if self._hamming_weight(q) <= 3:
+            return q
+
+        # Step 6. If w(q + B[i]) <= 2, then e = (e_{i+1}, q + B[i]) and go to step 8
+        for i in range(len(self.H)):
+            q_xor_B = q ^ self._B(i)
+            if self._hamming_weight(q_xor_B) <= 2:
+                return (1 << (2 * len(self.H) - i - 1)) | q_xor_B
+
+        # Step 7. If no condition is met, r is uncorrectable
+        return -1
 
     def _B(self, i):
         """
@@ -0,0 +1,779 @@
+#
+#  input_server.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import sys
+import json
+import socket
+import asyncio
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from spacelab_decoder.batch import BatchDecoder
+from spacelab_decoder.packet import PacketCSP
+from spacelab_decoder.time_sync import TimeSync
+from spacelab_decoder.stream_input import StreamInput
+from spacelab_decoder.satellite_registry import find_sat_config
+from spacelab_decoder.frame_parser import get_frame_parser
+from spacelab_decoder.metrics import get_metrics, PrometheusServer, MetricsReporter, JsonFileSink
+from spacelab_decoder.event_log import EventLog
+
+_INPUT_SERVER_DEFAULT_MAX_BIT_ERR   = 4
+_INPUT_SERVER_DEFAULT_SAMPLE_RATE   = 48000
+_INPUT_SERVER_DEFAULT_FORMAT        = 'int16'
+_INPUT_SERVER_DEFAULT_BLOCK_SIZE    = 2048      # Samples
+_INPUT_SERVER_TCP_READ_SIZE         = 65536     # Bytes
+_INPUT_SERVER_UDP_SOCKET_BUFFER     = 2**22     # Bytes
+_INPUT_SERVER_UDP_MAX_BACKLOG       = 2**20     # Samples (about 20 seconds at 48 kHz)
+_INPUT_SERVER_ZMQ_TOPIC             = bytes([10])
+
+_PROTOCOL_NGHAM                     = "NGHam"
+_PROTOCOL_AX100MODE5                = "AX100-Mode5"
+
+class SourceDecoder(BatchDecoder):
+    """
+    Decoder of a single input source.
+
+    Each source has its own stream input, clock recovery, bit decoder, link layer decoders and CSP reassembly state,
+    so the samples or frames of a source never interfere with the decoding of the other ones.
+    """
+    def __init__(self, name, sat_config, link_id, max_bit_err=_INPUT_SERVER_DEFAULT_MAX_BIT_ERR, ax100_len_err=False, sample_rate=_INPUT_SERVER_DEFAULT_SAMPLE_RATE, sample_format=_INPUT_SERVER_DEFAULT_FORMAT, block_size=_INPUT_SERVER_DEFAULT_BLOCK_SIZE):
+        """
+        Class constructor.
+
+        :param name: Is the name of the source (ex.: "udp:0.0.0.0:7355").
+        :type: str
+
+        :param sat_config: Is the satellite configuration file (JSON).
+        :type: str
+
+        :param link_id: Is the ID of the communication link to decode.
+        :type: str
+
+        :param max_bit_err: Is the maximum allowed bit errors in the sync word.
+        :type: int
+
+        :param ax100_len_err: If True, the length field of AX100-Mode5 packets is used even with a Golay24 error.
+        :type: bool
+
+        :param sample_rate: Is the sample rate of the stream in Hertz.
+        :type: int
+
+        :param sample_format: Is the format of the samples ("int16", "float32" or "complex64").
+        :type: str
+
+        :param block_size: Is the number of samples of each processed block.
+        :type: int
+        """
+        super().__init__(sat_config, link_id, max_bit_err, ax100_len_err)
+
+        self._name = name
+
+        self._stream_input = StreamInput(self.get_link().get_baudrate(), sample_rate, sample_format, block_size)
+        self._time_sync = TimeSync(self._stream_input.get_output_sample_rate(), self._stream_input.get_baudrate())
+        self._bit_decoder = self._get_bit_decoder()
+        self._pkt_csp = PacketCSP()
+
+        self._buf = bytearray()     # Received bytes not processed yet
+
+        self._received_samples = 0
+        self._packets = 0
+        self._errors = 0
+        self._overruns = 0
+        self._dropped_bytes = 0
+
+    def get_name(self):
+        """
+        Gets the name of the source.
+
+        :return: The name of the source.
+        :rtype: str
+        """
+        return self._name
+
+    def get_stream_input(self):
+        """
+        Gets the stream input configuration of the source.
+
+        :return: The stream input object.
+        :rtype: StreamInput
+        """
+        return self._stream_input
+
+    def get_received_samples(self):
+        """
+        Gets the number of samples received from the source.
+
+        :return: The number of samples.
+        :rtype: int
+        """
+        return self._received_samples
+
+    def get_packets(self):
+        """
+        Gets the number of packets decoded from the source.
+
+        :return: The number of packets.
+        :rtype: int
+        """
+        return self._packets
+
+    def get_errors(self):
+        """
+        Gets the number of frames of the source that could not be decoded.
+
+        :return: The number of errors.
+        :rtype: int
+        """
+        return self._errors
+
+    def get_overruns(self):
+        """
+        Gets the number of data blocks of the source dropped because they were not decoded in time.
+
+        :return: The number of dropped blocks.
+        :rtype: int
+        """
+        return self._overruns
+
+    def get_dropped_samples(self):
+        """
+        Gets the number of samples of the source dropped because they were not decoded in time.
+
+        :return: The number of dropped samples.
+        :rtype: int
+        """
+        return self._dropped_bytes//self._stream_input.get_dtype().itemsize
+
+    def drop(self, data):
+        """
+        Counts a block of data dropped as an overrun.
+
+        :param data: Are the dropped bytes.
+        :type: bytes
+
+        :return: None
+        """
+        self._overruns += 1
+        self._dropped_bytes += len(data)
+
+    def feed(self, data):
+        """
+        Decodes the bytes of a samples stream.
+
+        The bytes are buffered until a whole block of samples is available, so the data can be split in any way (ex.:
+        in TCP segments or UDP datagrams not aligned to the samples).
+
+        :param data: Are the received bytes, with samples in the format of the stream.
+        :type: bytes
+
+        :return: The records of the decoded packets.
+        :rtype: list[dict]
+        """
+        self._buf += data
+
+        itemsize = self._stream_input.get_dtype().itemsize
+
+        if len(self._buf) < self._stream_input.get_block_size()*itemsize:
+            return list()
+
+        num_bytes = len(self._buf) - len(self._buf) % itemsize
+
+        samples = np.frombuffer(bytes(self._buf[:num_bytes]), dtype=self._stream_input.get_dtype())
+        del self._buf[:num_bytes]
+
+        return self.decode_samples(samples)
+
+    def decode_samples(self, samples):
+        """
+        Decodes a block of samples of the stream.
+
+        The state of the decoding is kept between blocks, so the packets split between blocks are also decoded.
+
+        :param samples: Are the samples to decode, in the format of the stream.
+        :type: np.ndarray
+
+        :return: The records of the decoded packets.
+        :rtype: list[dict]
+        """
+        self._received_samples += len(samples)
+
+        return self._decode_bits(self._time_sync.decode_stream(self._stream_input.process(samples), soft=True), False)
+
+    def flush(self):
+        """
+        Decodes the buffered samples and the frame in progress at the end of the stream.
+
+        :return: The records of the decoded packets.
+        :rtype: list[dict]
+        """
+        itemsize = self._stream_input.get_dtype().itemsize
+        num_bytes = len(self._buf) - len(self._buf) % itemsize
+
+        records = list()
+        if num_bytes > 0:
+            samples = np.frombuffer(bytes(self._buf[:num_bytes]), dtype=self._stream_input.get_dtype())
+            self._received_samples += len(samples)
+            records += self._decode_bits(self._time_sync.decode_stream(self._stream_input.process(samples), soft=True), False)
+
+        self._buf.clear()
+
+        return records + self._decode_bits([], True)
+
+    def decode_frame(self, frame, link_layer=True):
+        """
+        Decodes a single frame received from the source.
+
+        :param frame: Is the link layer frame (with the preamble and the sync word) or the packet payload.
+        :type: bytes or list[int]
+
+        :param link_layer: If True, the frame is decoded by the link layer protocol, otherwise it is the payload.
+        :type: bool
+
+        :return: The records of the decoded packets.
+        :rtype: list[dict]
+        """
+        frame = list(frame)
+
+        if link_layer:
+            protocol = self.get_link().get_link_protocol()
+            try:
+                if protocol == _PROTOCOL_NGHAM:
+                    pl, err, err_loc = self._ngham.decode(frame)
+                    if err == -1:
+                        pl = list()
+                    fec = {'rs_errors': err}
+                elif protocol == _PROTOCOL_AX100MODE5:
+                    pl = self._ax100.decode(frame[len(self.get_link().get_preamble()) + len(self.get_link().get_sync_word()):])
+                    golay_err, rs_err = self._ax100.get_errors()
+                    fec = {'golay_errors': golay_err, 'rs_errors': rs_err}
+                else:
+                    raise RuntimeError("The protocol \"" + protocol + "\" is not supported!")
+            except RuntimeError:
+                pl = list()
+
+            if len(pl) == 0:
+                self._errors += 1
+                return list()
+        else:
+            pl = frame
+            fec = None
+
+        return [self._make_record(pl, fec)]
+
+    def _decode_bits(self, bits, final):
+        try:
+            pkts = self._decode_candidates(self._bit_decoder.decode_candidates(bits, final=final))
+        except RuntimeError:
+            self._errors += 1
+            return list()
+        finally:
+            if final:
+                self._busy_until = 0    # The positions of the next stream start from zero
+
+        return [self._make_record(pkt, fec) for pkt, fec, pos in pkts]
+
+    def _make_record(self, pkt, fec=None):
+        rec = dict()
+        rec['source'] = self._name
+        rec['time'] = datetime.now(timezone.utc).isoformat()
+        rec.update(self._decode_packet(pkt, self._pkt_csp, fec))
+
+        self._packets += 1
+
+        return rec
+
+class _UdpSourceProtocol(asyncio.DatagramProtocol):
+    """
+    Datagram protocol of a UDP source.
+    """
+    def __init__(self, server, source):
+        self._server = server
+        self._source = source
+
+    def connection_made(self, transport):
+        try:
+            transport.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _INPUT_SERVER_UDP_SOCKET_BUFFER)
+        except OSError:
+            pass    # The default size of the system is used
+
+    def datagram_received(self, data, addr):
+        self._server._receive_datagram(self._source, data)
+
+class InputServer:
+    """
+    Network input server.
+
+    A single asyncio event loop receives samples streams or framed packets from several TCP clients, samples streams
+    from several UDP ports, and link layer frames from several ZMQ SUB endpoints. Each TCP connection, UDP port and ZMQ
+    endpoint is decoded by its own SourceDecoder.
+
+    The event loop only receives the data: the DSP and the FEC decoding of each source run in a worker thread of the
+    source, which decodes its blocks and frames in the order they were received. A TCP client is not read while its
+    previous data is being decoded, and the datagrams of a UDP port are queued until they are decoded. When the queue
+    of a UDP port is full (the decoding is slower than the stream), the received datagrams are dropped and counted as
+    overruns of the source.
+    """
+    def __init__(self, sat_config, link_id, callback=None, log=None, max_bit_err=_INPUT_SERVER_DEFAULT_MAX_BIT_ERR, ax100_len_err=False, sample_rate=_INPUT_SERVER_DEFAULT_SAMPLE_RATE, sample_format=_INPUT_SERVER_DEFAULT_FORMAT, block_size=_INPUT_SERVER_DEFAULT_BLOCK_SIZE):
+        """
+        Class constructor.
+
+        :param sat_config: Is the satellite configuration file (JSON).
+        :type: str
+
+        :param link_id: Is the ID of the communication link to decode.
+        :type: str
+
+        :param callback: Is the function called with the record of each decoded packet.
+        :type: function
+
+        :param log: Is the function called with the messages of the server (connections and errors).
+        :type: function
+
+        :param max_bit_err: Is the maximum allowed bit errors in the sync word.
+        :type: int
+
+        :param ax100_len_err: If True, the length field of AX100-Mode5 packets is used even with a Golay24 error.
+        :type: bool
+
+        :param sample_rate: Is the sample rate of the samples streams in Hertz.
+        :type: int
+
+        :param sample_format: Is the format of the samples ("int16", "float32" or "complex64").
+        :type: str
+
+        :param block_size: Is the number of samples of each processed block.
+        :type: int
+        """
+        self._decoder_args = (sat_config, link_id, max_bit_err, ax100_len_err, sample_rate, sample_format, block_size)
+
+        SourceDecoder("", *self._decoder_args)  # Validates the configuration before receiving any data
+
+        self._callback = callback
+        self._log = log
+
+        self._listeners = list()
+        self._sources = list()
+        self._executors = dict()    # Source -> worker thread decoding its data
+        self._backlogs = dict()     # UDP source -> received bytes not decoded yet
+        self._drains = dict()       # UDP source -> task decoding its backlog
+
+        self._servers = list()
+        self._clients = dict()      # Handler -> stream writer of each connected TCP client
+        self._transports = list()
+        self._tasks = list()
+        self._addresses = list()
+
+        self._loop = None
+        self._stop_event = None
+        self._closing = False
+
+    def add_tcp(self, address, port, framing=None, link_layer=True):
+        """
+        Adds a TCP port where the clients send samples streams or framed packets.
+
+        :param address: Is the address to listen.
+        :type: str
+
+        :param port: Is the TCP port to listen (0 to use any free port).
+        :type: int
+
+        :param framing: Is the framing of the packets ("length" or "kiss"), or None if the clients send samples.
+        :type: str
+
+        :param link_layer: If True, the framed packets are link layer frames, otherwise they are packet payloads.
+        :type: bool
+
+        :return: None
+        """
+        if framing is not None:
+            get_frame_parser(framing)   # Validates the framing
+
+        self._listeners.append(("tcp", address, int(port), framing, link_layer))
+
+    def add_udp(self, address, port):
+        """
+        Adds a UDP port where a samples stream is received.
+
+        :param address: Is the address to listen.
+        :type: str
+
+        :param port: Is the UDP port to listen (0 to use any free port).
+        :type: int
+
+        :return: None
+        """
+        self._listeners.append(("udp", address, int(port)))
+
+    def add_zmq(self, endpoint, link_layer=True):
+        """
+        Adds a ZMQ publisher of frames.
+
+        :param endpoint: Is the endpoint of the publisher (ex.: "tcp://127.0.0.1:2112").
+        :type: str
+
+        :param link_layer: If True, the messages are link layer frames, otherwise they are packet payloads.
+        :type: bool
+
+        :return: None
+        """
+        self._listeners.append(("zmq", endpoint, link_layer))
+
+    def get_sources(self):
+        """
+        Gets the sources connected since the server was started.
+
+        :return: The decoder of each source.
+        :rtype: list[SourceDecoder]
+        """
+        return list(self._sources)
+
+    def get_addresses(self):
+        """
+        Gets the addresses of the TCP and UDP sockets being listened.
+
+        :return: The protocol, address and port of each socket, in the order they were added.
+        :rtype: list[tuple[str, str, int]]
+        """
+        return list(self._addresses)
+
+    async def start(self):
+        """
+        Opens all the added inputs.
+
+        :return: None
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._closing = False
+
+        for kind, adr, arg, *opts in self._listeners:
+            if kind == "tcp":
+                server = await asyncio.start_server(functools.partial(self._handle_tcp_client, *opts), adr, arg)
+                self._servers.append(server)
+                self._add_address(kind, server.sockets[0].getsockname())
+            elif kind == "udp":
+                source = self._new_source("udp:" + adr + ":" + str(arg))
+                self._backlogs[source] = bytearray()
+                transport, protocol = await self._loop.create_datagram_endpoint(lambda: _UdpSourceProtocol(self, source), local_addr=(adr, arg))
+                self._transports.append((transport, source))
+                self._add_address(kind, transport.get_extra_info('sockname'))
+            else:
+                self._tasks.append(asyncio.ensure_future(self._run_zmq(adr, arg)))
+
+    async def close(self):
+        """
+        Closes all the inputs.
+
+        :return: None
+        """
+        self._closing = True
+
+        for server in self._servers:
+            server.close()
+
+        # The connected clients are closed before waiting for the servers, as wait_closed() also waits for them (since
+        # Python 3.12). Their handlers still decode the data received before closing.
+        for writer in self._clients.values():
+            writer.close()
+
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+        for server in self._servers:
+            await server.wait_closed()
+
+        for transport, source in self._transports:
+            transport.close()
+
+        # The datagrams received before closing the UDP sockets are still decoded
+        await asyncio.gather(*self._drains.values(), return_exceptions=True)
+
+        for transport, source in self._transports:
+            await self._decode(source, source.flush)
+            self._close_source(source)
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self._servers.clear()
+        self._transports.clear()
+        self._tasks.clear()
+        self._backlogs.clear()
+        self._drains.clear()
+
+    async def serve(self):
+        """
+        Receives and decodes the inputs until stop() is called.
+
+        :return: None
+        """
+        await self.start()
+        try:
+            await self._stop_event.wait()
+        finally:
+            await self.close()
+
+    def run(self):
+        """
+        Runs the server in a new event loop until stop() is called or the process is interrupted.
+
+        :return: None
+        """
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+
+    def stop(self):
+        """
+        Stops the server (it can be called from any thread).
+
+        :return: None
+        """
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    def _add_address(self, kind, sockname):
+        self._addresses.append((kind, sockname[0], sockname[1]))
+        self._write_log("Listening " + kind.upper() + " port " + str(sockname[1]) + " from " + sockname[0])
+
+    def _new_source(self, name):
+        source = SourceDecoder(name, *self._decoder_args)
+        self._sources.append(source)
+        self._executors[source] = ThreadPoolExecutor(1, "decoder-" + name)   # A single worker keeps the data in order
+
+        return source
+
+    def _close_source(self, source):
+        self._executors.pop(source).shutdown(wait=False)
+
+    async def _decode(self, source, func, *args):
+        # The records are given to the callback in the event loop, so the callback is never called by two threads
+        self._emit(await self._loop.run_in_executor(self._executors[source], func, *args))
+
+    def _receive_datagram(self, source, data):
+        backlog = self._backlogs[source]
+
+        if len(backlog) + len(data) > _INPUT_SERVER_UDP_MAX_BACKLOG*source.get_stream_input().get_dtype().itemsize:
+            source.drop(data)
+            return
+
+        backlog += data
+
+        drain = self._drains.get(source)
+        if drain is None or drain.done():
+            self._drains[source] = self._loop.create_task(self._drain(source))
+
+    async def _drain(self, source):
+        backlog = self._backlogs[source]
+
+        # The datagrams received while a block is decoded are decoded together in the next one
+        while len(backlog) > 0:
+            data = bytes(backlog)
+            backlog.clear()
+            try:
+                await self._decode(source, source.feed, data)
+            except Exception as e:
+                self._write_log("Error decoding the data of " + source.get_name() + ": " + str(e))
+
+    def _emit(self, records):
+        if self._callback is not None:
+            for rec in records:
+                self._callback(rec)
+
+    def _write_log(self, msg):
+        if self._log is not None:
+            self._log(msg)
+
+    async def _handle_tcp_client(self, framing, link_layer, reader, writer):
+        if self._closing:
+            writer.close()  # Accepted while the server was closing
+            return
+
+        peer = writer.get_extra_info('peername')
+        source = self._new_source("tcp:" + str(peer[0]) + ":" + str(peer[1]))
+        self._write_log("TCP client " + source.get_name() + " connected!")
+
+        parser = None if framing is None else get_frame_parser(framing)
+
+        handler = asyncio.current_task()
+        self._clients[handler] = writer
+
+        try:
+            while True:
+                data = await reader.read(_INPUT_SERVER_TCP_READ_SIZE)
+                if not data:
+                    break
+
+                if parser is None:
+                    await self._decode(source, source.feed, data)
+                else:
+                    # The frames can be split or coalesced by TCP, so they are delimited by the framing
+                    for frame in parser.feed(data):
+                        await self._decode(source, source.decode_frame, frame, link_layer)
+        except ConnectionError as e:
+            self._write_log("Error receiving data from TCP client " + source.get_name() + ": " + str(e))
+        finally:
+            await self._decode(source, source.flush)
+            self._close_source(source)
+            writer.close()
+            del self._clients[handler]
+
+        self._write_log("TCP client " + source.get_name() + " disconnected (" + str(source.get_packets()) + " packet(s) decoded)!")
+
+    async def _run_zmq(self, endpoint, link_layer):
+        import zmq
+        import zmq.asyncio
+
+        source = self._new_source("zmq:" + endpoint)
+
+        sub = zmq.asyncio.Context.instance().socket(zmq.SUB)
+        sub.connect(endpoint)
+        sub.setsockopt(zmq.SUBSCRIBE, _INPUT_SERVER_ZMQ_TOPIC)
+
+        self._write_log("Subscribed to " + endpoint)
+
+        try:
+            while True:
+                data = await sub.recv()
+                try:
+                    # The payload messages start with a header byte (the frames are passed as received, as in the graphical interface)
+                    await self._decode(source, source.decode_frame, data if link_layer else data[1:], link_layer)
+                except Exception as e:
+                    self._write_log("Error decoding a frame from " + source.get_name() + ": " + str(e))
+        except zmq.ZMQError as e:
+            self._write_log("Error receiving data from " + source.get_name() + ": " + str(e))
+        finally:
+            sub.close(linger=0)
+            self._close_source(source)
+
+        self._write_log("Unsubscribed from " + endpoint + " (" + str(source.get_packets()) + " packet(s) decoded)!")
+
+def _parse_address(text, default="0.0.0.0"):
+    adr, sep, port = text.rpartition(':')
+    if not sep:
+        adr = default
+
+    try:
+        return adr, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid address \"" + text + "\" (expected [ADDRESS:]PORT)")
+
+def main(args=None):
+    """
+    Network input server command line interface.
+
+    :param args: Are the command line arguments (without the program name and the "server" command).
+    :type: list[str]
+
+    :return: The exit code.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="spacelab-decoder server", description="Decodes samples streams (TCP and UDP) and frames (TCP and ZMQ) from many sources without the graphical interface, writing the packets as JSON Lines.")
+    parser.add_argument("-s", "--satellite", required=True, help="satellite configuration file (or the name of a distributed one, ex.: golds-ufsc)")
+    parser.add_argument("-l", "--link", required=True, help="ID of the communication link (ex.: downlink_vhf)")
+    parser.add_argument("--tcp", action="append", default=[], type=_parse_address, metavar="[ADDRESS:]PORT", help="TCP port of samples streams or framed packets (one source per client, can be repeated)")
+    parser.add_argument("--tcp-framing", choices=["length", "kiss"], help="the TCP clients send length-prefixed or KISS frames instead of samples")
+    parser.add_argument("--tcp-payload", action="store_true", help="the TCP frames are packet payloads instead of link layer frames")
+    parser.add_argument("--udp", action="append", default=[], type=_parse_address, metavar="[ADDRESS:]PORT", help="UDP port of a samples stream (can be repeated)")
+    parser.add_argument("--zmq", action="append", default=[], metavar="ENDPOINT", help="ZMQ publisher of link layer frames (ex.: tcp://127.0.0.1:2112, can be repeated)")
+    parser.add_argument("--zmq-payload", action="store_true", help="the ZMQ messages are packet payloads instead of link layer frames")
+    parser.add_argument("--sample-rate", type=int, default=_INPUT_SERVER_DEFAULT_SAMPLE_RATE, help="sample rate of the streams in Hz (default: %(default)s)")
+    parser.add_argument("--sample-format", choices=["int16", "float32", "complex64"], default=_INPUT_SERVER_DEFAULT_FORMAT, help="format of the samples (default: %(default)s)")
+    parser.add_argument("--block-size", type=int, default=_INPUT_SERVER_DEFAULT_BLOCK_SIZE, help="samples of each processed block (default: %(default)s)")
+    parser.add_argument("-o", "--output", default="-", help="JSON Lines output file (default: stdout)")
+    parser.add_argument("--max-bit-err", type=int, default=_INPUT_SERVER_DEFAULT_MAX_BIT_ERR, help="maximum bit errors in the sync word (default: %(default)s)")
+    parser.add_argument("--ax100-len-err", action="store_true", help="use the AX100-Mode5 length field even with a Golay24 error")
+    parser.add_argument("--event-log", metavar="DIR", help="also write the packets to a compressed event log directory")
+    parser.add_argument("--event-log-compression", choices=["gzip", "zstd"], default="gzip", help="compression of the event log segments (default: %(default)s)")
+    parser.add_argument("--metrics", type=lambda text: _parse_address(text, "127.0.0.1"), metavar="[ADDRESS:]PORT", help="serve the decoding metrics in the Prometheus format at /metrics (default address: 127.0.0.1)")
+    parser.add_argument("--metrics-json", metavar="FILE", help="write the decoding metrics to a JSON file periodically")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, help="interval between the writes of the metrics JSON file in seconds (default: %(default)s)")
+
+    opts = parser.parse_args(args)
+
+    if len(opts.tcp) + len(opts.udp) + len(opts.zmq) == 0:
+        parser.error("at least one input (--tcp, --udp or --zmq) is required")
+
+    if opts.metrics_interval <= 0:
+        parser.error("the metrics interval must be positive")
+
+    out = sys.stdout if opts.output == "-" else open(opts.output, "a")
+
+    event_log = None
+
+    def write_record(rec):
+        out.write(json.dumps(rec) + "\n")
+        out.flush()
+        if event_log is not None:
+            event_log.write_record(rec)
+
+    def write_log(msg):
+        print(msg, file=sys.stderr)
+
+    metrics_outputs = list()
+    if opts.metrics is not None:
+        metrics_outputs.append(PrometheusServer(*opts.metrics))
+    if opts.metrics_json is not None:
+        metrics_outputs.append(MetricsReporter(JsonFileSink(opts.metrics_json), opts.metrics_interval))
+
+    get_metrics().set_enabled(len(metrics_outputs) > 0)
+
+    try:
+        if opts.event_log is not None:
+            event_log = EventLog(opts.event_log, opts.event_log_compression)
+
+        server = InputServer(find_sat_config(opts.satellite), opts.link, write_record, write_log, opts.max_bit_err, opts.ax100_len_err, opts.sample_rate, opts.sample_format, opts.block_size)
+
+        for adr, port in opts.tcp:
+            server.add_tcp(adr, port, opts.tcp_framing, not opts.tcp_payload)
+        for adr, port in opts.udp:
+            server.add_udp(adr, port)
+        for endpoint in opts.zmq:
+            server.add_zmq(endpoint, not opts.zmq_payload)
+
+        for output in metrics_outputs:
+            output.start()
+            if isinstance(output, PrometheusServer):
+                write_log("Serving the metrics at http://%s:%d/metrics" % output.get_address())
+
+        server.run()
+    except (RuntimeError, ValueError, KeyError, OSError) as e:
+        print("Error: " + str(e), file=sys.stderr)
+        return 1
+    finally:
+        for output in metrics_outputs:
+            output.stop()
+        if event_log is not None:
+            event_log.close()
+        if out is not sys.stdout:
+            out.close()
+
+    for source in server.get_sources():
+        print(source.get_name() + ": " + str(source.get_packets()) + " packet(s), " + str(source.get_errors()) + " error(s), " + str(source.get_received_samples()) + " sample(s), " + str(source.get_overruns()) + " overrun(s), " + str(source.get_dropped_samples()) + " sample(s) dropped", file=sys.stderr)
+
+    return 0
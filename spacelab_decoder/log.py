@@ -23,6 +23,11 @@
 from datetime import datetime
 import os
 import csv
+import time
+import threading
+
+_LOG_DEFAULT_MAX_ROWS       = 256   # Buffered rows written at once
+_LOG_DEFAULT_MAX_DELAY_S    = 1.0   # Maximum time a row stays in the buffer
 
 class Log:
     """
@@ -107,3 +112,225 @@ class Log:
         with open(self.get_path() + '/' + self.get_filename(), 'a') as logfile:
             writer = csv.writer(logfile, delimiter='\t')
             writer.writerow(event)
+
+class BufferedLog(Log):
+    """
+    Buffered log handling class.
+
+    The log file is opened once and kept open, and the events are buffered and written in batches: when the buffer has
+    the maximum number of rows, when the oldest row is older than the maximum delay, when flush() is called and when
+    the log is closed. The events are written in the same format of Log.
+
+    Without the background thread, the buffer is only checked when an event is written (the rows of a quiet period are
+    written with the next event or by flush()). With the background thread, the rows are written by the thread, and the
+    callers never wait for the file.
+
+    The rows that could not be written (ex.: the disk is full) are kept in the buffer and written again later. An error
+    of the background thread is raised by the next write() (or by close()). After close(), the events are written
+    directly to the file, as by Log.
+    """
+    def __init__(self, filename, path, max_rows=_LOG_DEFAULT_MAX_ROWS, max_delay=_LOG_DEFAULT_MAX_DELAY_S, background=False):
+        """
+        Constructor.
+
+        :param filename: Is the name of the log file.
+        :type: str
+
+        :param path: Is the path to save the log file.
+        :type: str
+
+        :param max_rows: Is the maximum number of buffered rows.
+        :type: int
+
+        :param max_delay: Is the maximum time a row is kept in the buffer in seconds.
+        :type: float
+
+        :param background: If True, the rows are written by a background thread.
+        :type: bool
+
+        :return: None
+        """
+        if max_rows < 1:
+            raise ValueError("The maximum number of buffered rows must be at least 1!")
+
+        if max_delay <= 0:
+            raise ValueError("The maximum delay of the buffered rows must be positive!")
+
+        self._file = None
+        self._writer = None
+        self._file_lock = threading.Lock()  # Held while writing to the file
+
+        self._rows = list()
+        self._first_row_time = 0.0
+        self._lock = threading.Lock()       # Held while changing the buffer
+
+        self._max_rows = int(max_rows)
+        self._max_delay = max_delay
+
+        super().__init__(filename, path)
+
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._closing = False
+        self._error = None                  # Error of the background thread, raised by the next write() or close()
+        if background:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def set_filename(self, filename):
+        """
+        Sets the name of the log file (the buffered events are written to the previous file).
+
+        :param filename: Is the name of the log file.
+        :type: str
+
+        :return: None
+        """
+        self._close_file()
+        super().set_filename(filename)
+
+    def set_path(self, path):
+        """
+        Sets the path of the log file (the buffered events are written to the previous file).
+
+        :param path: Is the path to save the log file.
+        :type: str
+
+        :return: None
+        """
+        self._close_file()
+        super().set_path(path)
+
+    def write(self, msg, ts=None):
+        """
+        Buffers a log message.
+
+        :param msg: Is the log message to write.
+        :type: str
+
+        :param ts: Is the timestamp of the log event as an string.
+        :type: str
+
+        :return: None.
+        """
+        if self._closing:
+            super().write(msg, ts)
+            return
+
+        with self._lock:
+            if len(self._rows) == 0:
+                self._first_row_time = time.monotonic()
+
+            self._rows.append([str(datetime.now()) if ts is None else ts, msg])
+
+            full = len(self._rows) >= self._max_rows
+            due = full or time.monotonic() - self._first_row_time >= self._max_delay
+
+        if self._thread is None:
+            if due:
+                self.flush()
+        else:
+            if full:
+                self._wakeup.set()
+
+            self._raise_error()     # The event is kept in the buffer
+
+    def flush(self):
+        """
+        Writes the buffered events to the log file.
+
+        :return: None
+        """
+        with self._file_lock:
+            with self._lock:
+                rows = self._rows
+                first_row_time = self._first_row_time
+                self._rows = list()
+
+            if len(rows) == 0:
+                return
+
+            try:
+                if self._file is None:
+                    if not os.path.exists(self.get_path()):
+                        os.mkdir(self.get_path())
+
+                    self._file = open(self.get_path() + '/' + self.get_filename(), 'a')
+                    self._writer = csv.writer(self._file, delimiter='\t')
+
+                self._writer.writerows(rows)
+                self._file.flush()
+                self._error = None  # The rows of a previous error are written
+            except OSError:
+                # The rows are written again by the next flush, before the ones buffered in the meantime
+                with self._lock:
+                    self._rows[:0] = rows
+                    self._first_row_time = first_row_time
+
+                if self._file is not None:
+                    try:
+                        self._file.close()
+                    except OSError:
+                        pass
+                    self._file = None   # Opened again by the next flush
+                    self._writer = None
+
+                raise
+
+    def close(self):
+        """
+        Writes the buffered events and closes the log file (and stops the background thread).
+
+        An error of the background thread writing the file, not raised yet by write(), is raised here.
+
+        :return: None
+        """
+        self._closing = True
+
+        if self._thread is not None:
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+        self._close_file()
+        self._raise_error()
+
+    def get_buffered_rows(self):
+        """
+        Gets the number of events not written yet.
+
+        :return: The number of buffered events.
+        :rtype: int
+        """
+        with self._lock:
+            return len(self._rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _close_file(self):
+        if self._file is not None or len(self._rows) > 0:
+            self.flush()
+
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._writer = None
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while not self._closing:
+            self._wakeup.wait(self._max_delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                self._error = e
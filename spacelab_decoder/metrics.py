@@ -0,0 +1,436 @@
+#
+#  metrics.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import json
+import time
+import bisect
+import functools
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+_METRICS_BUCKETS_US         = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+_METRICS_PROMETHEUS_PREFIX  = "spacelab_decoder_"
+_METRICS_PROMETHEUS_TYPE    = "text/plain; version=0.0.4; charset=utf-8"
+_METRICS_DEFAULT_ADDRESS    = "127.0.0.1"
+_METRICS_DEFAULT_INTERVAL_S = 10.0
+
+class Metrics:
+    """
+    Decoding metrics.
+
+    The decoding stages count their events (sync words found, corrected symbols, ...) and the time spent in each call,
+    kept as a histogram in microseconds. The metrics are disabled by default, and in this case a stage only checks a
+    flag in each call (the counters are not updated inside the per-sample and per-bit loops).
+    """
+    def __init__(self):
+        """
+        Class constructor.
+
+        :return: None
+        """
+        self._enabled = False
+        self._lock = threading.Lock()
+        self._counters = dict()
+        self._stages = dict()   # Stage -> [counts of each bucket (and above the last one), sum in us]
+
+    def set_enabled(self, enabled):
+        """
+        Enables or disables the metrics (the collected values are kept).
+
+        :param enabled: If True, the metrics are collected.
+        :type: bool
+
+        :return: None
+        """
+        self._enabled = bool(enabled)
+
+    def is_enabled(self):
+        """
+        Checks if the metrics are enabled.
+
+        :return: True if the metrics are collected.
+        :rtype: bool
+        """
+        return self._enabled
+
+    def count(self, name, value=1):
+        """
+        Increments a counter.
+
+        :param name: Is the name of the counter.
+        :type: str
+
+        :param value: Is the value to add to the counter.
+        :type: int
+
+        :return: None
+        """
+        if self._enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, stage, us):
+        """
+        Adds the duration of a call to the histogram of a stage.
+
+        :param stage: Is the name of the stage.
+        :type: str
+
+        :param us: Is the duration in microseconds.
+        :type: float
+
+        :return: None
+        """
+        if self._enabled:
+            with self._lock:
+                hist = self._stages.get(stage)
+                if hist is None:
+                    hist = self._stages[stage] = [[0]*(len(_METRICS_BUCKETS_US) + 1), 0.0]
+
+                hist[0][bisect.bisect_left(_METRICS_BUCKETS_US, us)] += 1
+                hist[1] += us
+
+    def start(self):
+        """
+        Starts measuring a call of a stage (for the stages called too often to use the timed decorator).
+
+        :return: The start time, or None if the metrics are disabled.
+        :rtype: int or None
+        """
+        return time.perf_counter_ns() if self._enabled else None
+
+    def stop(self, stage, start):
+        """
+        Ends measuring a call of a stage, counting it as <stage>_calls.
+
+        :param stage: Is the name of the stage.
+        :type: str
+
+        :param start: Is the start time given by start().
+        :type: int or None
+
+        :return: None
+        """
+        if start is not None:
+            self.observe(stage, (time.perf_counter_ns() - start)/1000)
+            self.count(stage + "_calls")
+
+    def snapshot(self):
+        """
+        Gets a copy of the current values.
+
+        :return: The counters, and the histogram of each stage (the count of each bucket, where the last one has the
+        calls longer than the last bound, the number of calls and the total time in microseconds).
+        :rtype: dict
+        """
+        with self._lock:
+            return {'enabled': self._enabled,
+                    'counters': dict(self._counters),
+                    'stages': {stage: {'bounds_us': list(_METRICS_BUCKETS_US),
+                                       'buckets': list(hist[0]),
+                                       'count': sum(hist[0]),
+                                       'sum_us': hist[1]} for stage, hist in self._stages.items()}}
+
+    def merge(self, snapshot):
+        """
+        Adds the values of a snapshot (ex.: taken in another process) to the current values.
+
+        :param snapshot: Is the snapshot to add (as given by snapshot()).
+        :type: dict
+
+        :return: None
+        """
+        with self._lock:
+            for name, value in snapshot['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+            for stage, values in snapshot['stages'].items():
+                if values['bounds_us'] != list(_METRICS_BUCKETS_US):
+                    raise ValueError("The histogram buckets of the snapshot are different!")
+
+                hist = self._stages.setdefault(stage, [[0]*(len(_METRICS_BUCKETS_US) + 1), 0.0])
+                hist[0] = [a + b for a, b in zip(hist[0], values['buckets'])]
+                hist[1] += values['sum_us']
+
+    def reset(self):
+        """
+        Clears all the collected values.
+
+        :return: None
+        """
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+
+    def to_prometheus(self):
+        """
+        Renders the current values in the Prometheus text format.
+
+        The counters are named spacelab_decoder_<name>_total, and the histograms spacelab_decoder_<stage>_seconds.
+
+        :return: The metrics as text.
+        :rtype: str
+        """
+        snap = self.snapshot()
+
+        lines = list()
+        for name, value in sorted(snap['counters'].items()):
+            metric = _METRICS_PROMETHEUS_PREFIX + name + "_total"
+            lines.append("# TYPE " + metric + " counter")
+            lines.append(metric + " " + str(value))
+
+        for stage, hist in sorted(snap['stages'].items()):
+            metric = _METRICS_PROMETHEUS_PREFIX + stage + "_seconds"
+            lines.append("# TYPE " + metric + " histogram")
+
+            total = 0
+            for bound, count in zip(hist['bounds_us'] + ["+Inf"], hist['buckets']):
+                total += count
+                le = bound if bound == "+Inf" else repr(bound/1e6)
+                lines.append(metric + "_bucket{le=\"" + le + "\"} " + str(total))
+
+            lines.append(metric + "_sum " + repr(hist['sum_us']/1e6))
+            lines.append(metric + "_count " + str(hist['count']))
+
+        return "\n".join(lines) + "\n"
+
+_metrics = Metrics()
+
+def get_metrics():
+    """
+    Gets the metrics shared by the whole process.
+
+    :return: The metrics.
+    :rtype: Metrics
+    """
+    return _metrics
+
+def timed(stage):
+    """
+    Decorator measuring the calls of a decoding stage.
+
+    Each call is added to the histogram of the stage, and counted as <stage>_calls (and as <stage>_errors if it raises
+    an exception). With the metrics disabled, only the flag is checked before the call.
+
+    :param stage: Is the name of the stage.
+    :type: str
+
+    :return: The decorator.
+    :rtype: function
+    """
+    calls = stage + "_calls"
+    errors = stage + "_errors"
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _metrics._enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                _metrics.count(errors)
+                raise
+            finally:
+                _metrics.observe(stage, (time.perf_counter_ns() - start)/1000)
+                _metrics.count(calls)
+
+        return wrapper
+
+    return decorator
+
+class JsonFileSink:
+    """
+    Metrics sink writing each snapshot to a JSON file.
+
+    The file is replaced at once, so a reader never sees a partially written snapshot.
+    """
+    def __init__(self, filename):
+        """
+        Class constructor.
+
+        :param filename: Is the JSON file to write.
+        :type: str
+
+        :return: None
+        """
+        self._filename = filename
+
+    def get_filename(self):
+        """
+        Gets the JSON file.
+
+        :return: The name of the JSON file.
+        :rtype: str
+        """
+        return self._filename
+
+    def __call__(self, snapshot):
+        snapshot = dict(snapshot, time=time.time())
+
+        tmp = self._filename + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+
+        os.replace(tmp, self._filename)
+
+class MetricsReporter:
+    """
+    Periodic metrics reporter.
+
+    A background thread gives a snapshot of the metrics to a sink (any function receiving the snapshot, as a
+    JsonFileSink) at a fixed interval, and once more when it is stopped.
+    """
+    def __init__(self, sink, interval=_METRICS_DEFAULT_INTERVAL_S, metrics=None):
+        """
+        Class constructor.
+
+        :param sink: Is the function called with each snapshot.
+        :type: function
+
+        :param interval: Is the interval between the snapshots in seconds.
+        :type: float
+
+        :param metrics: Are the metrics to report (the ones of the process if None).
+        :type: Metrics
+
+        :return: None
+        """
+        if interval <= 0:
+            raise ValueError("The reporting interval must be positive!")
+
+        self._sink = sink
+        self._interval = interval
+        self._metrics = get_metrics() if metrics is None else metrics
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the reporting thread.
+
+        :return: None
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-reporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the reporting thread, reporting the last values.
+
+        :return: None
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+            self._sink(self._metrics.snapshot())
+
+    def _run(self):
+        while not self._stop_event.wait(self._interval):
+            self._sink(self._metrics.snapshot())
+
+class _PrometheusHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.server.metrics.to_prometheus().encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", _METRICS_PROMETHEUS_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class PrometheusServer:
+    """
+    HTTP endpoint serving the metrics in the Prometheus text format (at /metrics) from a background thread.
+    """
+    def __init__(self, address=_METRICS_DEFAULT_ADDRESS, port=0, metrics=None):
+        """
+        Class constructor.
+
+        :param address: Is the address to listen (only the local host by default).
+        :type: str
+
+        :param port: Is the TCP port to listen (0 to use any free port).
+        :type: int
+
+        :param metrics: Are the metrics to serve (the ones of the process if None).
+        :type: Metrics
+
+        :return: None
+        """
+        self._address = address
+        self._port = int(port)
+        self._metrics = get_metrics() if metrics is None else metrics
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """
+        Starts listening.
+
+        :return: None
+        """
+        self._server = ThreadingHTTPServer((self._address, self._port), _PrometheusHandler)
+        self._server.daemon_threads = True
+        self._server.metrics = self._metrics
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops listening.
+
+        :return: None
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def get_address(self):
+        """
+        Gets the address being listened.
+
+        :return: The address and the TCP port (the actual one if any free port was requested).
+        :rtype: tuple[str, int]
+        """
+        if self._server is None:
+            return self._address, self._port
+
+        return self._server.server_address[:2]
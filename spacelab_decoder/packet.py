@@ -21,6 +21,7 @@
 #
 
 
+import os
 import json
 
 # Used inside `eval()` calls
@@ -28,78 +29,283 @@ import numpy as np
 import struct
 import datetime
 
+from spacelab_decoder.satellite_registry import get_satellite_registry
+from spacelab_decoder.metrics import timed
+
+_PACKET_DECODE_PLANS = dict()   # Compiled decode plans, by configuration file: (configuration, plan)
+
+class _PacketDecodePlan:
+    """
+    Decode plan of a satellite configuration.
+
+    The conversion of each field is compiled once, and the packet types are indexed by packet ID (SLP) and by
+    destination port (CSP), in the same order they are searched in the configuration.
+    """
+    def __init__(self, sat_packet):
+        self.slp = dict()   # Packet ID -> (link index, type index, fields)
+        self.csp = dict()   # Destination port -> list of (link index, list of (type index, type, fields))
+
+        for i in range(len(sat_packet['links'])):
+            link = sat_packet['links'][i]
+            if link['protocol_network'] == "SLP":
+                ids = set()
+                for j in range(len(link['types'])):
+                    pkt_id = link['types'][j]['fields'][0]['value']
+                    if pkt_id not in ids:   # Only the first type with a given ID is used in a link
+                        ids.add(pkt_id)
+                        self.slp[pkt_id] = (i, j, self._compile_fields(link['types'][j]))
+            elif link['protocol_network'] == "CSP":
+                ports = dict()
+                for j in range(len(link['types'])):
+                    ports.setdefault(link['types'][j]['fields'][3]['value'], list()).append((j, link['types'][j], self._compile_fields(link['types'][j])))
+
+                for port in ports:
+                    self.csp.setdefault(port, list()).append((i, ports[port]))
+
+    def _compile_fields(self, pkt_type):
+        fields = list()
+        for field in pkt_type['fields']:
+            try:
+                conversion = compile(field['conversion'], "<" + field['id'] + ">", "eval")
+            except SyntaxError:
+                conversion = field['conversion']    # The error is raised when the field is decoded, as before
+
+            fields.append((field['id'], field['name'], field['unit'], conversion))
+
+        return fields
+
+def _get_decode_plan(sat_config, sat_packet):
+    filename = os.path.abspath(sat_config)
+    entry = _PACKET_DECODE_PLANS.get(filename)
+
+    # The registry returns a new configuration object when the file changes
+    if entry is None or entry[0] is not sat_packet:
+        entry = (sat_packet, _PacketDecodePlan(sat_packet))
+        _PACKET_DECODE_PLANS[filename] = entry
+
+    return entry[1]
+
+class PacketRecord:
+    """
+    Decoded packet.
+
+    The value of each field is evaluated only once, and both the text and the JSON representations of the packet are
+    rendered from it.
+    """
+    __slots__ = ('_satellite', '_link', '_data_source', '_link_protocol', '_network_protocol', '_fields')
+
+    def __init__(self, satellite, link, data_source, link_protocol, network_protocol, fields):
+        """
+        Class constructor.
+
+        :param satellite: Is the name of the satellite.
+        :type: str
+
+        :param link: Is the name of the communication link.
+        :type: str
+
+        :param data_source: Is the name of the packet type.
+        :type: str
+
+        :param link_protocol: Is the link layer protocol.
+        :type: str
+
+        :param network_protocol: Is the network layer protocol.
+        :type: str
+
+        :param fields: Are the decoded fields, as (ID, name, value, unit).
+        :type: tuple[tuple[str, str, str, str]]
+        """
+        self._satellite = satellite
+        self._link = link
+        self._data_source = data_source
+        self._link_protocol = link_protocol
+        self._network_protocol = network_protocol
+        self._fields = tuple(fields)
+
+    def __str__(self):
+        """
+        Text representation of the packet.
+
+        :return: The name and the value of each field, one per line.
+        :rtype: str
+        """
+        buf = "\t" + "Satellite" + ": " + self._satellite + "\n"
+        buf = buf + "\t" + "Link" + ": " + self._link + "\n"
+        buf = buf + "\t" + "Data Source" + ": " + self._data_source + "\n"
+        buf = buf + "\t" + "Link Protocol" + ": " + self._link_protocol + "\n"
+        buf = buf + "\t" + "Network Protocol" + ": " + self._network_protocol + "\n"
+        buf = buf + "\t" + "Data" + ":" + "\n"
+
+        return buf + "".join(["\t\t" + name + ": " + value + " " + unit + "\n" for field_id, name, value, unit in self._fields])
+
+    def __reduce__(self):
+        return (PacketRecord, (self._satellite, self._link, self._data_source, self._link_protocol, self._network_protocol, self._fields))
+
+    def get_satellite(self):
+        """
+        Gets the name of the satellite.
+
+        :return: The satellite name.
+        :rtype: str
+        """
+        return self._satellite
+
+    def get_link(self):
+        """
+        Gets the name of the communication link.
+
+        :return: The link name.
+        :rtype: str
+        """
+        return self._link
+
+    def get_data_source(self):
+        """
+        Gets the name of the packet type.
+
+        :return: The packet type name.
+        :rtype: str
+        """
+        return self._data_source
+
+    def get_link_protocol(self):
+        """
+        Gets the link layer protocol.
+
+        :return: The link layer protocol.
+        :rtype: str
+        """
+        return self._link_protocol
+
+    def get_network_protocol(self):
+        """
+        Gets the network layer protocol.
+
+        :return: The network layer protocol.
+        :rtype: str
+        """
+        return self._network_protocol
+
+    def get_fields(self):
+        """
+        Gets the decoded fields.
+
+        :return: The ID, name, value and unit of each field.
+        :rtype: tuple[tuple[str, str, str, str]]
+        """
+        return self._fields
+
+    def get_data(self):
+        """
+        Gets the value of each field.
+
+        :return: The field values by field ID.
+        :rtype: dict
+        """
+        return {field_id: value for field_id, name, value, unit in self._fields}
+
+    def to_json(self):
+        """
+        JSON representation of the packet.
+
+        :return: The field values by field ID, as a JSON object.
+        :rtype: str
+        """
+        return json.dumps(self.get_data())
+
+    def to_dict(self):
+        """
+        Converts the packet to a dictionary (only built-in types, ready to be serialized).
+
+        :return: The packet information and its field values (in the "data" key).
+        :rtype: dict
+        """
+        return {'satellite': self._satellite,
+                'link': self._link,
+                'data_source': self._data_source,
+                'link_protocol': self._link_protocol,
+                'network_protocol': self._network_protocol,
+                'data': self.get_data()}
+
 class PacketSLP:
 
     def __init__(self, sat_config, pkt_raw):
-        with open(sat_config) as f:
-            self.sat_packet = json.load(f)
+        self.set_config(sat_config)
 
         self.packet = pkt_raw
+        self._record = None
+        self._record_pkt = None
 
     def set_config(self, sat_config):
-        with open(sat_config) as f:
-            self.sat_packet = json.load(f)
+        self.sat_packet = get_satellite_registry().get_config(sat_config)   # Loaded only once (read-only)
+
+        self._sat_config = sat_config
+        self._plan = None   # Compiled on the first decoded packet
 
     def set_pkt(self, pkt_raw):
         self.packet = pkt_raw.copy()
+        self._record_pkt = None
 
     def __str__(self):
-        buf = str()
+        record = self._get_record()
 
-        pkt = self.packet
+        return str() if record is None else str(record)
 
-        link_idx = int()
-        type_idx = int()
-        pkt_type_found = False
-        for i in range(len(self.sat_packet['links'])):
-            if self.sat_packet['links'][i]['protocol_network'] == "SLP":    # Check if the link uses SLP
-                for j in range(len(self.sat_packet['links'][i]['types'])):
-                    if pkt[0] == self.sat_packet['links'][i]['types'][j]['fields'][0]['value']:
-                        link_idx = i
-                        type_idx = j
-                        pkt_type_found = True
-                        break
-
-        if pkt_type_found:
-            buf = buf + "\t" + "Satellite" + ": " + self.sat_packet['name'] + "\n"
-            buf = buf + "\t" + "Link" + ": " + self.sat_packet['links'][link_idx]['name'] + "\n"
-            buf = buf + "\t" + "Data Source" + ": " + self.sat_packet['links'][link_idx]['types'][type_idx]['name'] + "\n"
-            buf = buf + "\t" + "Link Protocol" + ": " + self.sat_packet['links'][link_idx]['protocol_link'] + "\n"
-            buf = buf + "\t" + "Network Protocol" + ": " + self.sat_packet['links'][link_idx]['protocol_network'] + "\n"
-            buf = buf + "\t" + "Data" + ":" + "\n"
-
-            for i in range(len(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'])):
-                buf = buf + "\t\t" + self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['name'] + ": " + str(eval(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['conversion'])) + " " + self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['unit'] + "\n"
-        else:
-            raise RuntimeError("Unknown packet ID!")
+    def get_data(self):
+        record = self._get_record()
 
-        return buf
+        return json.dumps(dict()) if record is None else record.to_json()
 
-    def get_data(self):
+    @timed("packet")
+    def decode(self):
+        """
+        Decodes the packet, evaluating the conversion of each field only once.
+
+        :return: The decoded packet.
+        :rtype: PacketRecord
+        """
         pkt = self.packet
 
-        link_idx = int()
-        type_idx = int()
-        pkt_type_found = False
-        for i in range(len(self.sat_packet['links'])):
-            if self.sat_packet['links'][i]['protocol_network'] == "SLP":    # Check if the link uses SLP
-                for j in range(len(self.sat_packet['links'][i]['types'])):
-                    if pkt[0] == self.sat_packet['links'][i]['types'][j]['fields'][0]['value']:
-                        link_idx = i
-                        type_idx = j
-                        pkt_type_found = True
-                        break
-
-        data = dict()
-
-        if pkt_type_found:
-            for i in range(len(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'])):
-                data[self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['id']] = str(eval(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['conversion']))
+        link_idx, type_idx, fields = self._find_type(pkt)
+
+        return self._set_record(pkt, self._make_record(pkt, link_idx, type_idx, fields))
+
+    def _get_record(self):
+        # The text and the JSON representations of the same packet are rendered from a single decoding
+        if self._record_pkt is None or self._record_pkt is not self.packet:
+            self.decode()
+
+        return self._record
+
+    def _set_record(self, pkt, record):
+        self._record = record
+        self._record_pkt = pkt
+
+        return record
+
+    def _make_record(self, pkt, link_idx, type_idx, fields):
+        link = self.sat_packet['links'][link_idx]
+
+        env = {'pkt': pkt, 'self': self}
+        values = [(field_id, name, str(eval(conversion, globals(), env)), unit) for field_id, name, unit, conversion in fields]
+
+        return PacketRecord(self.sat_packet['name'], link['name'], link['types'][type_idx]['name'], link['protocol_link'], link['protocol_network'], values)
+
+    def _get_plan(self):
+        if self._plan is None:
+            self._plan = _get_decode_plan(self._sat_config, self.sat_packet)
+
+        return self._plan
+
+    def _find_type(self, pkt):
+        plan = self._get_plan()
+
+        if len(plan.slp) > 0 and pkt[0] in plan.slp:
+            return plan.slp[pkt[0]]
         else:
             raise RuntimeError("Unknown packet ID!")
 
-        return json.dumps(data)
-
     def _decode_callsign(self, cs_raw):
         found = False
         buf = str()
@@ -120,96 +326,67 @@ class PacketCSP(PacketSLP):
         self._pkt_buf = list()
         self._pkt_counter = 0
         self._data_request_pkt_received = False
+        self._plan = None
+        self._record = None
+        self._record_pkt = None
 
-    def __str__(self):
-        buf = str()
+    @timed("packet")
+    def decode(self):
+        """
+        Decodes the packet, evaluating the conversion of each field only once.
 
-        pkt = self.packet
+        The fragments of a data request are buffered until the last one is received.
 
-        link_idx = int()
-        type_idx = int()
-        pkt_type_found = False
-        dst_port = int(((pkt[1] & 15) << 2) | (pkt[2] >> 6))
-        for i in range(len(self.sat_packet['links'])):
-            if self.sat_packet['links'][i]['protocol_network'] == "CSP":    # Check if the link uses CSP
-                for j in range(len(self.sat_packet['links'][i]['types'])):
-                    if dst_port == self.sat_packet['links'][i]['types'][j]['fields'][3]['value']: # Search for the destination port
-                        if dst_port == 0:   # CSP CMP packets
-                            if pkt[5] != self.sat_packet['links'][i]['types'][j]['fields'][11]['value']:    # 11 = CMP Code field
-                                continue
-                        if dst_port == 46:  # Set parameter packets
-                            if pkt[6] != self.sat_packet['links'][i]['types'][j]['fields'][12]['value']:    # 12 = Parameter size field
-                                continue
-                        if dst_port == 38:  # Data request
-                            if self._data_request_pkt_received == False:
-                                if struct.unpack('>H', bytes(pkt[9:11]))[0] > 200:
-                                    self._pkt_buf = pkt.copy()
-                                    self._pkt_counter = struct.unpack('>H', bytes(pkt[6:8]))[0]
-                                    self._data_request_pkt_received = True
-                                    return str()
-                            else:
-                                if self._pkt_counter == struct.unpack('>H', bytes(pkt[6:8]))[0]:
-                                    if pkt[4] < pkt[5]-1:
-                                        self._pkt_buf += pkt[11:]
-                                        return str()
-                                    elif pkt[4] == pkt[5]-1:
-                                        self._pkt_buf += pkt[11:]
-                                        self._pkt_counter = 0
-                                        self._data_request_pkt_received = False
-                                        pkt.clear()
-                                        pkt = self._pkt_buf.copy()
-                                        self.packet = pkt.copy()
-                                        self._pkt_buf.clear()
-                                else:
-                                    self._pkt_buf.clear()
-                                    self._pkt_counter = 0
-                                    self._data_request_pkt_received = False
-                                    raise RuntimeError("Data request packet lost!")
-                        link_idx = i
-                        type_idx = j
-                        pkt_type_found = True
-                        break
-
-        if pkt_type_found:
-            buf = buf + "\t" + "Satellite" + ": " + self.sat_packet['name'] + "\n"
-            buf = buf + "\t" + "Link" + ": " + self.sat_packet['links'][link_idx]['name'] + "\n"
-            buf = buf + "\t" + "Data Source" + ": " + self.sat_packet['links'][link_idx]['types'][type_idx]['name'] + "\n"
-            buf = buf + "\t" + "Link Protocol" + ": " + self.sat_packet['links'][link_idx]['protocol_link'] + "\n"
-            buf = buf + "\t" + "Network Protocol" + ": " + self.sat_packet['links'][link_idx]['protocol_network'] + "\n"
-            buf = buf + "\t" + "Data" + ":" + "\n"
-
-            for i in range(len(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'])):
-                buf = buf + "\t\t" + self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['name'] + ": " + str(eval(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['conversion'])) + " " + self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['unit'] + "\n"
-        else:
-            raise RuntimeError("Unknown destination port!")
-
-        return buf
-
-    def get_data(self):
+        :return: The decoded packet, or None if the packet is a fragment of a data request not completed yet.
+        :rtype: PacketRecord
+        """
         pkt = self.packet
 
         link_idx = int()
         type_idx = int()
+        type_fields = None
         pkt_type_found = False
         dst_port = int(((pkt[1] & 15) << 2) | (pkt[2] >> 6))
-        for i in range(len(self.sat_packet['links'])):
-            if self.sat_packet['links'][i]['protocol_network'] == "CSP":    # Check if the link uses CSP
-                for j in range(len(self.sat_packet['links'][i]['types'])):
-                    if dst_port == self.sat_packet['links'][i]['types'][j]['fields'][3]['value']:   # Search for the destination port
-                        if dst_port == 0:   # CSP CMP packets
-                            if pkt[5] != self.sat_packet['links'][i]['types'][j]['fields'][11]['value']:    # 11 = CMP Code field
-                                continue
-                        link_idx = i
-                        type_idx = j
-                        pkt_type_found = True
-                        break
-
-        data = dict()
-
-        if pkt_type_found:
-            for i in range(len(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'])):
-                data[self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['id']] = str(eval(self.sat_packet['links'][link_idx]['types'][type_idx]['fields'][i]['conversion']))
-        else:
+        for i, types in self._get_plan().csp.get(dst_port, list()):
+            for j, pkt_type, fields in types:
+                if dst_port == 0:   # CSP CMP packets
+                    if pkt[5] != pkt_type['fields'][11]['value']:   # 11 = CMP Code field
+                        continue
+                if dst_port == 46:  # Set parameter packets
+                    if pkt[6] != pkt_type['fields'][12]['value']:   # 12 = Parameter size field
+                        continue
+                if dst_port == 38:  # Data request
+                    if self._data_request_pkt_received == False:
+                        if struct.unpack('>H', bytes(pkt[9:11]))[0] > 200:
+                            self._pkt_buf = pkt.copy()
+                            self._pkt_counter = struct.unpack('>H', bytes(pkt[6:8]))[0]
+                            self._data_request_pkt_received = True
+                            return self._set_record(pkt, None)
+                    else:
+                        if self._pkt_counter == struct.unpack('>H', bytes(pkt[6:8]))[0]:
+                            if pkt[4] < pkt[5]-1:
+                                self._pkt_buf += pkt[11:]
+                                return self._set_record(pkt, None)
+                            elif pkt[4] == pkt[5]-1:
+                                self._pkt_buf += pkt[11:]
+                                self._pkt_counter = 0
+                                self._data_request_pkt_received = False
+                                pkt.clear()
+                                pkt = self._pkt_buf.copy()
+                                self.packet = pkt.copy()
+                                self._pkt_buf.clear()
+                        else:
+                            self._pkt_buf.clear()
+                            self._pkt_counter = 0
+                            self._data_request_pkt_received = False
+                            raise RuntimeError("Data request packet lost!")
+                link_idx = i
+                type_idx = j
+                type_fields = fields
+                pkt_type_found = True
+                break
+
+        if not pkt_type_found:
             raise RuntimeError("Unknown destination port!")
 
-        return json.dumps(data)
+        return self._set_record(self.packet, self._make_record(pkt, link_idx, type_idx, type_fields))
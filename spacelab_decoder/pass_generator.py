@@ -0,0 +1,660 @@
+#
+#  pass_generator.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import sys
+import time
+import socket
+import argparse
+
+import numpy as np
+from scipy.io import wavfile
+
+import pyngham
+
+from spacelab_decoder.ax100 import AX100Mode5
+from spacelab_decoder.satellite_registry import get_satellite_registry, find_sat_config
+
+_PASS_GENERATOR_DEFAULT_SAMPLE_RATE = 48000
+_PASS_GENERATOR_DEFAULT_FORMAT      = 'int16'     # As the input of the server and the recordings of the discriminator output
+_PASS_GENERATOR_DEFAULT_GAP         = 0.2       # Seconds between two frames
+_PASS_GENERATOR_DEFAULT_BLOCK_SIZE  = 2048      # Samples per UDP datagram
+_PASS_GENERATOR_FORMATS             = {'int16': np.int16, 'float32': np.float32, 'complex64': np.complex64}
+_PASS_GENERATOR_INT16_AMPLITUDE     = 1000      # Amplitude of the int16 symbols (as in recordings of the discriminator output)
+_PASS_GENERATOR_GAUSSIAN_BT         = 0.5       # Bandwidth-time product of the Gaussian filter
+_PASS_GENERATOR_GAUSSIAN_SPAN       = 4         # Length of the Gaussian filter in symbols
+_PASS_GENERATOR_LOWPASS_TAPS        = 128       # Length of the channel filter of the complex samples
+_PASS_GENERATOR_MOD_INDEX           = 0.5       # Modulation index (the frequency deviation is h*baudrate/2)
+_PASS_GENERATOR_ZMQ_HEADER          = bytes([10])   # First byte of the payload messages (the topic of the subscribers)
+_PASS_GENERATOR_MAX_ZMQ_RATE        = 1000      # Messages per second
+
+_PROTOCOL_NGHAM                     = "NGHam"
+_PROTOCOL_AX100MODE5                = "AX100-Mode5"
+
+class PassGenerator:
+    """
+    Synthetic pass generator.
+
+    The frames of a link of a satellite configuration file are built with the encoders of its link layer protocol and
+    GMSK modulated at the given sample rate. The signal is given as the output of a FM discriminator (int16 or float32
+    audio) or as complex baseband samples (complex64), with optional channel impairments: white noise, clock offset,
+    frequency offset (with a linear Doppler ramp) and bursts where the signal is lost.
+
+    The SNR is the same in all the sample formats, but the clock recovery of the decoder depends on the amplitude of the
+    samples (int16 symbols have an amplitude of 1000, and float32 symbols of 1). So the decoding rates for a given SNR
+    are only comparable between passes of the same sample format.
+    """
+    def __init__(self, sat_config, link_id, sample_rate=_PASS_GENERATOR_DEFAULT_SAMPLE_RATE, sample_format=_PASS_GENERATOR_DEFAULT_FORMAT, seed=None):
+        """
+        Class constructor.
+
+        :param sat_config: Is the satellite configuration file (JSON).
+        :type: str
+
+        :param link_id: Is the ID of the communication link to generate.
+        :type: str
+
+        :param sample_rate: Is the sample rate of the signal in Hertz.
+        :type: int
+
+        :param sample_format: Is the format of the samples ("int16", "float32" or "complex64").
+        :type: str
+
+        :param seed: Is the seed of the random data, noise and bursts (the same seed gives the same signal).
+        :type: int
+        """
+        self._satellite = get_satellite_registry().get_satellite(sat_config)
+
+        links = self._satellite.get_links()
+        for i in range(len(links)):
+            if links[i].get_id() == link_id:
+                self._satellite.set_active_link(i)
+                break
+        else:
+            raise RuntimeError("The link \"" + link_id + "\" does not exist in the satellite configuration file!")
+
+        if self.get_link().get_link_protocol() not in (_PROTOCOL_NGHAM, _PROTOCOL_AX100MODE5):
+            raise RuntimeError("The protocol \"" + self.get_link().get_link_protocol() + "\" is not supported!")
+
+        self._rng = np.random.default_rng(seed)
+
+        self._sample_rate = 0
+        self._sample_format = _PASS_GENERATOR_DEFAULT_FORMAT
+        self._baudrate = self.get_link().get_baudrate()
+        self._snr = None            # dB per symbol (None = no noise)
+        self._clock_offset = 0.0    # ppm
+        self._freq_offset = 0.0     # Hz
+        self._doppler_rate = 0.0    # Hz/s
+        self._burst_rate = 0.0      # Bursts per second
+        self._burst_len = 0.0       # Seconds
+
+        self.set_sample_rate(sample_rate)
+        self.set_sample_format(sample_format)
+
+    def get_link(self):
+        """
+        Gets the communication link being generated.
+
+        :return: The active link of the satellite.
+        :rtype: Link
+        """
+        return self._satellite.get_active_link()
+
+    def set_sample_rate(self, sample_rate):
+        """
+        Sets the sample rate of the signal.
+
+        :param sample_rate: Is the sample rate in Hertz.
+        :type: int
+
+        :return: None
+        """
+        if sample_rate < 2*self._baudrate:
+            raise ValueError("The sample rate must be at least twice the baudrate!")
+
+        self._sample_rate = int(sample_rate)
+
+    def get_sample_rate(self):
+        """
+        Gets the sample rate of the signal.
+
+        :return: The sample rate in Hertz.
+        :rtype: int
+        """
+        return self._sample_rate
+
+    def set_sample_format(self, sample_format):
+        """
+        Sets the format of the samples.
+
+        :param sample_format: Is the sample format ("int16", "float32" or "complex64").
+        :type: str
+
+        :return: None
+        """
+        if sample_format not in _PASS_GENERATOR_FORMATS:
+            raise ValueError("The sample format must be one of: " + ", ".join(_PASS_GENERATOR_FORMATS) + "!")
+
+        self._sample_format = sample_format
+
+    def get_sample_format(self):
+        """
+        Gets the format of the samples.
+
+        :return: The sample format.
+        :rtype: str
+        """
+        return self._sample_format
+
+    def get_dtype(self):
+        """
+        Gets the NumPy type of the samples.
+
+        :return: The type of the samples.
+        :rtype: type
+        """
+        return _PASS_GENERATOR_FORMATS[self._sample_format]
+
+    def set_baudrate(self, baudrate):
+        """
+        Sets the baudrate of the signal (the baudrate of the link by default).
+
+        :param baudrate: Is the baudrate in bps.
+        :type: int
+
+        :return: None
+        """
+        if baudrate <= 0 or 2*baudrate > self._sample_rate:
+            raise ValueError("The baudrate must be greater than zero and at most half the sample rate!")
+
+        self._baudrate = baudrate
+
+    def get_baudrate(self):
+        """
+        Gets the baudrate of the signal.
+
+        :return: The baudrate in bps.
+        :rtype: int
+        """
+        return self._baudrate
+
+    def set_snr(self, snr):
+        """
+        Sets the signal to noise ratio of the white noise.
+
+        :param snr: Is the signal to noise ratio per symbol in dB (None to disable the noise).
+        :type: float
+
+        :return: None
+        """
+        self._snr = snr
+
+    def get_snr(self):
+        """
+        Gets the signal to noise ratio of the white noise.
+
+        :return: The signal to noise ratio per symbol in dB (None if the noise is disabled).
+        :rtype: float
+        """
+        return self._snr
+
+    def set_clock_offset(self, ppm):
+        """
+        Sets the offset of the symbol clock of the transmitter.
+
+        :param ppm: Is the clock offset in parts per million.
+        :type: float
+
+        :return: None
+        """
+        if abs(ppm) >= 1e5:
+            raise ValueError("The clock offset must be lower than 100000 ppm!")
+
+        self._clock_offset = ppm
+
+    def get_clock_offset(self):
+        """
+        Gets the offset of the symbol clock of the transmitter.
+
+        :return: The clock offset in parts per million.
+        :rtype: float
+        """
+        return self._clock_offset
+
+    def set_frequency_offset(self, offset, doppler_rate=0.0):
+        """
+        Sets the frequency offset of the carrier.
+
+        :param offset: Is the frequency offset at the start of the signal in Hertz.
+        :type: float
+
+        :param doppler_rate: Is the change of the frequency offset in Hertz per second (ex.: -30 for a VHF pass).
+        :type: float
+
+        :return: None
+        """
+        self._freq_offset = offset
+        self._doppler_rate = doppler_rate
+
+    def get_frequency_offset(self):
+        """
+        Gets the frequency offset of the carrier.
+
+        :return: The frequency offset at the start of the signal (Hz) and its change (Hz/s).
+        :rtype: tuple[float, float]
+        """
+        return self._freq_offset, self._doppler_rate
+
+    def set_burst_errors(self, rate, length):
+        """
+        Sets the bursts where the signal is lost (replaced by noise).
+
+        :param rate: Is the mean number of bursts per second (0 to disable the bursts).
+        :type: float
+
+        :param length: Is the length of each burst in seconds.
+        :type: float
+
+        :return: None
+        """
+        if rate < 0 or length < 0:
+            raise ValueError("The burst rate and length must not be negative!")
+
+        self._burst_rate = rate
+        self._burst_len = length
+
+    def get_burst_errors(self):
+        """
+        Gets the bursts where the signal is lost.
+
+        :return: The mean number of bursts per second and the length of each burst in seconds.
+        :rtype: tuple[float, float]
+        """
+        return self._burst_rate, self._burst_len
+
+    def random_payloads(self, num, length):
+        """
+        Generates random packet payloads.
+
+        :param num: Is the number of payloads.
+        :type: int
+
+        :param length: Is the length of each payload in bytes.
+        :type: int
+
+        :return: The payloads.
+        :rtype: list[list[int]]
+        """
+        return [self._rng.integers(0, 256, length).tolist() for i in range(num)]
+
+    def encode(self, payload):
+        """
+        Encodes a packet payload with the link layer protocol of the link.
+
+        :param payload: Is the packet payload.
+        :type: list[int]
+
+        :return: The frame (with the preamble and the sync word).
+        :rtype: list[int]
+        """
+        link = self.get_link()
+
+        if link.get_link_protocol() == _PROTOCOL_NGHAM:
+            return pyngham.PyNGHam().encode(list(payload))
+
+        ax100 = AX100Mode5()
+        ax100.set_preamble(link.get_preamble())
+        ax100.set_sync_word(link.get_sync_word())
+
+        return ax100.encode(list(payload))
+
+    def generate(self, payloads, gap=_PASS_GENERATOR_DEFAULT_GAP):
+        """
+        Generates the signal of a sequence of packets.
+
+        Between two frames (and before the first and after the last one) the transmitter sends random symbols.
+
+        :param payloads: Are the packet payloads.
+        :type: list[list[int]]
+
+        :param gap: Is the time between two frames in seconds.
+        :type: float
+
+        :return: The samples of the signal, in the sample format.
+        :rtype: np.ndarray
+        """
+        gap_bits = int(gap*self._baudrate)
+
+        bits = [self._rng.integers(0, 2, gap_bits, dtype=np.uint8)]
+        for pl in payloads:
+            bits.append(np.unpackbits(np.array(self.encode(pl), dtype=np.uint8)))
+            bits.append(self._rng.integers(0, 2, gap_bits, dtype=np.uint8))
+
+        return self.modulate(np.concatenate(bits))
+
+    def modulate(self, bits):
+        """
+        Modulates a bitstream with the channel impairments.
+
+        :param bits: Is the bitstream (one bit per element).
+        :type: np.ndarray
+
+        :return: The samples of the signal, in the sample format.
+        :rtype: np.ndarray
+        """
+        bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+
+        baud = self._baudrate*(1 + self._clock_offset*1e-6)
+        sps = self._sample_rate/baud
+
+        # NRZ symbols, sampled by the clock of the receiver
+        num_samples = int(len(bits)*sps)
+        nrz = 2.0*bits[(np.arange(num_samples)*(baud/self._sample_rate)).astype(np.int64)] - 1.0
+
+        deviation = _PASS_GENERATOR_MOD_INDEX*self._baudrate/2
+        t = np.arange(num_samples)/self._sample_rate
+        offset = (self._freq_offset + self._doppler_rate*t)/deviation   # In units of the deviation
+
+        burst = self._get_burst_mask(num_samples)
+
+        if self._sample_format == 'complex64':
+            freq = self._gaussian_filter(nrz, sps) + offset
+            samples = np.exp(1j*np.pi*np.cumsum(freq*deviation*2/self._sample_rate))
+            samples[burst] = 0
+
+            if self._snr is not None:
+                std = np.sqrt(sps/10**(self._snr/10)/2)     # Per component, for the given SNR per symbol
+                noise = self._rng.normal(0, std, num_samples) + 1j*self._rng.normal(0, std, num_samples)
+                samples += self._lowpass_filter(noise, deviation + self._baudrate)    # Channel filter of the receiver
+
+            return samples.astype(np.complex64)
+
+        # FM discriminator output: the noise is filtered by the audio filter of the receiver (the Gaussian filter)
+        if self._snr is not None:
+            nrz += self._rng.normal(0, np.sqrt(sps/10**(self._snr/10)), num_samples)
+
+        samples = self._gaussian_filter(nrz, sps) + offset
+        samples[burst] = self._rng.normal(0, 1, np.count_nonzero(burst))
+
+        if self._sample_format == 'int16':
+            return np.clip(np.round(samples*_PASS_GENERATOR_INT16_AMPLITUDE), -32768, 32767).astype(np.int16)
+
+        return samples.astype(np.float32)
+
+    def write_wav(self, filename, samples):
+        """
+        Writes a signal to a WAV file.
+
+        :param filename: Is the WAV file to write.
+        :type: str
+
+        :param samples: Are the samples of the signal (int16 or float32).
+        :type: np.ndarray
+
+        :return: None
+        """
+        if np.iscomplexobj(samples):
+            raise ValueError("Complex samples can not be written to a WAV file!")
+
+        wavfile.write(filename, self._sample_rate, samples)
+
+    def stream_udp(self, address, port, samples, speed=1.0, block_size=_PASS_GENERATOR_DEFAULT_BLOCK_SIZE):
+        """
+        Streams a signal over UDP (one block of samples per datagram).
+
+        :param address: Is the address of the receiver.
+        :type: str
+
+        :param port: Is the UDP port of the receiver.
+        :type: int
+
+        :param samples: Are the samples of the signal.
+        :type: np.ndarray
+
+        :param speed: Is the speed of the stream relative to the sample rate (ex.: 10 for ten times the real-time).
+        :type: float
+
+        :param block_size: Is the number of samples of each datagram.
+        :type: int
+
+        :return: The number of sent datagrams.
+        :rtype: int
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            return self._stream(samples, speed, block_size, lambda block: sock.sendto(block.tobytes(), (address, port)))
+        finally:
+            sock.close()
+
+    def publish_zmq(self, endpoint, payloads, rate=1.0):
+        """
+        Publishes packet payloads over ZMQ, as the payload messages of the network inputs of the decoder.
+
+        :param endpoint: Is the endpoint to bind (ex.: tcp://127.0.0.1:2112).
+        :type: str
+
+        :param payloads: Are the packet payloads.
+        :type: list[list[int]]
+
+        :param rate: Is the number of messages per second.
+        :type: float
+
+        :return: The number of published messages.
+        :rtype: int
+        """
+        import zmq  # Only required to publish over ZMQ
+
+        pub = zmq.Context.instance().socket(zmq.PUB)
+        try:
+            pub.bind(endpoint)
+            time.sleep(1/rate)  # Time for the subscribers to connect
+
+            t_start = time.monotonic()
+            for i in range(len(payloads)):
+                self._wait(t_start + i/rate)
+                pub.send(_PASS_GENERATOR_ZMQ_HEADER + bytes(payloads[i]))
+        finally:
+            pub.close(linger=1000)
+
+        return len(payloads)
+
+    def _stream(self, samples, speed, block_size, send):
+        """
+        Sends the blocks of a signal paced by the sample rate.
+
+        :param samples: Are the samples of the signal.
+        :type: np.ndarray
+
+        :param speed: Is the speed of the stream relative to the sample rate.
+        :type: float
+
+        :param block_size: Is the number of samples of each block.
+        :type: int
+
+        :param send: Is the function that sends a block.
+        :type: function
+
+        :return: The number of sent blocks.
+        :rtype: int
+        """
+        if speed <= 0:
+            raise ValueError("The speed must be greater than zero!")
+
+        t_start = time.monotonic()
+
+        blocks = 0
+        for pos in range(0, len(samples), block_size):
+            self._wait(t_start + pos/(self._sample_rate*speed))
+            send(samples[pos:pos + block_size])
+            blocks += 1
+
+        return blocks
+
+    def _wait(self, t):
+        """
+        Waits until a given time.
+
+        :param t: Is the time to wait for (from time.monotonic()).
+        :type: float
+
+        :return: None
+        """
+        delay = t - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _gaussian_filter(self, nrz, sps):
+        """
+        Applies the Gaussian filter of the GMSK modulation.
+
+        :param nrz: Are the NRZ symbols at the sample rate.
+        :type: np.ndarray
+
+        :param sps: Is the number of samples per symbol.
+        :type: float
+
+        :return: The filtered signal.
+        :rtype: np.ndarray
+        """
+        t = np.arange(-_PASS_GENERATOR_GAUSSIAN_SPAN*sps/2, _PASS_GENERATOR_GAUSSIAN_SPAN*sps/2 + 1)/sps
+        sigma = np.sqrt(np.log(2))/(2*np.pi*_PASS_GENERATOR_GAUSSIAN_BT)
+        taps = np.exp(-t**2/(2*sigma**2))
+
+        return np.convolve(nrz, taps/taps.sum(), mode='same')
+
+    def _lowpass_filter(self, samples, cutoff):
+        """
+        Applies a low-pass filter (windowed sinc).
+
+        :param samples: Are the samples to filter.
+        :type: np.ndarray
+
+        :param cutoff: Is the cutoff frequency in Hertz.
+        :type: float
+
+        :return: The filtered samples.
+        :rtype: np.ndarray
+        """
+        fc = min(cutoff/self._sample_rate, 0.5)
+        n = np.arange(-_PASS_GENERATOR_LOWPASS_TAPS//2, _PASS_GENERATOR_LOWPASS_TAPS//2 + 1)
+        taps = 2*fc*np.sinc(2*fc*n)*np.hamming(len(n))
+
+        return np.convolve(samples, taps, mode='same')
+
+    def _get_burst_mask(self, num_samples):
+        """
+        Draws the samples where the signal is lost.
+
+        :param num_samples: Is the number of samples of the signal.
+        :type: int
+
+        :return: A mask with the samples of the bursts.
+        :rtype: np.ndarray
+        """
+        mask = np.zeros(num_samples, dtype=bool)
+
+        if self._burst_rate > 0 and self._burst_len > 0:
+            num_bursts = self._rng.poisson(self._burst_rate*num_samples/self._sample_rate)
+            burst_len = int(self._burst_len*self._sample_rate)
+            for start in self._rng.integers(0, num_samples, num_bursts):
+                mask[start:start + burst_len] = True
+
+        return mask
+
+def _parse_address(text):
+    adr, sep, port = text.rpartition(':')
+    if not sep:
+        adr = "127.0.0.1"
+
+    try:
+        return adr, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid address \"" + text + "\" (expected [ADDRESS:]PORT)")
+
+def main(args=None):
+    """
+    Pass generator command line interface.
+
+    :param args: Are the command line arguments (without the program name and the "generate" command).
+    :type: list[str]
+
+    :return: The exit code.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="spacelab-decoder generate", description="Generates synthetic passes of a satellite link with channel impairments, writing a WAV file or streaming them to the network inputs of the decoder.")
+    parser.add_argument("-s", "--satellite", required=True, help="satellite configuration file (or the name of a distributed one, ex.: golds-ufsc)")
+    parser.add_argument("-l", "--link", required=True, help="ID of the communication link (ex.: downlink_vhf)")
+    parser.add_argument("-n", "--packets", type=int, default=10, help="number of packets (default: %(default)s)")
+    parser.add_argument("--payload-len", type=int, default=64, help="length of the random payloads in bytes (default: %(default)s)")
+    parser.add_argument("--gap", type=float, default=_PASS_GENERATOR_DEFAULT_GAP, help="time between two packets in seconds (default: %(default)s)")
+    parser.add_argument("--sample-rate", type=int, default=_PASS_GENERATOR_DEFAULT_SAMPLE_RATE, help="sample rate in Hz (default: %(default)s)")
+    parser.add_argument("--sample-format", choices=list(_PASS_GENERATOR_FORMATS), default=_PASS_GENERATOR_DEFAULT_FORMAT, help="format of the samples (default: %(default)s; the decoding rates for a given SNR are only comparable within a format)")
+    parser.add_argument("--baudrate", type=int, help="baudrate in bps (default: the baudrate of the link)")
+    parser.add_argument("--snr", type=float, help="signal to noise ratio per symbol in dB (default: no noise; the decoding rates are only comparable within a sample format)")
+    parser.add_argument("--clock-offset", type=float, default=0.0, help="symbol clock offset in ppm (default: %(default)s)")
+    parser.add_argument("--freq-offset", type=float, default=0.0, help="carrier frequency offset in Hz (default: %(default)s)")
+    parser.add_argument("--doppler-rate", type=float, default=0.0, help="change of the frequency offset in Hz/s (default: %(default)s)")
+    parser.add_argument("--burst-rate", type=float, default=0.0, help="mean number of signal losses per second (default: %(default)s)")
+    parser.add_argument("--burst-len", type=float, default=0.01, help="length of each signal loss in seconds (default: %(default)s)")
+    parser.add_argument("--seed", type=int, help="seed of the random payloads and impairments")
+    parser.add_argument("-o", "--output", help="WAV file to write")
+    parser.add_argument("--udp", type=_parse_address, metavar="[ADDRESS:]PORT", help="stream the samples to a UDP input")
+    parser.add_argument("--zmq", metavar="ENDPOINT", help="publish the payloads to ZMQ subscribers (ex.: tcp://127.0.0.1:2112)")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed of the UDP stream and of the ZMQ messages relative to real-time (default: %(default)s)")
+    parser.add_argument("--block-size", type=int, default=_PASS_GENERATOR_DEFAULT_BLOCK_SIZE, help="samples of each UDP datagram (default: %(default)s)")
+
+    opts = parser.parse_args(args)
+
+    if opts.output is None and opts.udp is None and opts.zmq is None:
+        parser.error("at least one output (-o, --udp or --zmq) is required")
+
+    try:
+        gen = PassGenerator(find_sat_config(opts.satellite), opts.link, opts.sample_rate, opts.sample_format, opts.seed)
+
+        if opts.baudrate is not None:
+            gen.set_baudrate(opts.baudrate)
+        gen.set_snr(opts.snr)
+        gen.set_clock_offset(opts.clock_offset)
+        gen.set_frequency_offset(opts.freq_offset, opts.doppler_rate)
+        gen.set_burst_errors(opts.burst_rate, opts.burst_len)
+
+        payloads = gen.random_payloads(opts.packets, opts.payload_len)
+
+        if opts.output or opts.udp:
+            samples = gen.generate(payloads, opts.gap)
+
+            print("%d packet(s), %d sample(s) (%.1f s)" % (len(payloads), len(samples), len(samples)/gen.get_sample_rate()), file=sys.stderr)
+
+            if opts.output:
+                gen.write_wav(opts.output, samples)
+
+            if opts.udp:
+                t_start = time.monotonic()
+                datagrams = gen.stream_udp(opts.udp[0], opts.udp[1], samples, opts.speed, opts.block_size)
+                print("%d datagram(s) sent in %.1f s" % (datagrams, time.monotonic() - t_start), file=sys.stderr)
+
+        if opts.zmq:
+            gen.publish_zmq(opts.zmq, payloads, opts.speed/opts.gap if opts.gap > 0 else _PASS_GENERATOR_MAX_ZMQ_RATE)
+    except (RuntimeError, ValueError, KeyError, OSError) as e:
+        print("Error: " + str(e), file=sys.stderr)
+        return 1
+
+    return 0
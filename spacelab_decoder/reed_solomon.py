@@ -22,6 +22,111 @@
 
 import numpy as np
 
+from spacelab_decoder.metrics import get_metrics, timed
+
+_RS_MM          = 8
+_RS_NN          = 255
+_RS_NROOTS      = 32
+_RS_FCR         = 112
+_RS_PRIM        = 11
+_RS_IPRIM       = 116
+_RS_A0          = _RS_NN    # Special reserved value encoding zero in index form
+
+_RS_CCSDS_ALPHA_TO = (
+    0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x87, 0x89, 0x95, 0xad, 0xdd, 0x3d, 0x7a, 0xf4,
+    0x6f, 0xde, 0x3b, 0x76, 0xec, 0x5f, 0xbe, 0xfb, 0x71, 0xe2, 0x43, 0x86, 0x8b, 0x91, 0xa5, 0xcd,
+    0x1d, 0x3a, 0x74, 0xe8, 0x57, 0xae, 0xdb, 0x31, 0x62, 0xc4, 0x0f, 0x1e, 0x3c, 0x78, 0xf0, 0x67,
+    0xce, 0x1b, 0x36, 0x6c, 0xd8, 0x37, 0x6e, 0xdc, 0x3f, 0x7e, 0xfc, 0x7f, 0xfe, 0x7b, 0xf6, 0x6b,
+    0xd6, 0x2b, 0x56, 0xac, 0xdf, 0x39, 0x72, 0xe4, 0x4f, 0x9e, 0xbb, 0xf1, 0x65, 0xca, 0x13, 0x26,
+    0x4c, 0x98, 0xb7, 0xe9, 0x55, 0xaa, 0xd3, 0x21, 0x42, 0x84, 0x8f, 0x99, 0xb5, 0xed, 0x5d, 0xba,
+    0xf3, 0x61, 0xc2, 0x03, 0x06, 0x0c, 0x18, 0x30, 0x60, 0xc0, 0x07, 0x0e, 0x1c, 0x38, 0x70, 0xe0,
+    0x47, 0x8e, 0x9b, 0xb1, 0xe5, 0x4d, 0x9a, 0xb3, 0xe1, 0x45, 0x8a, 0x93, 0xa1, 0xc5, 0x0d, 0x1a,
+    0x34, 0x68, 0xd0, 0x27, 0x4e, 0x9c, 0xbf, 0xf9, 0x75, 0xea, 0x53, 0xa6, 0xcb, 0x11, 0x22, 0x44,
+    0x88, 0x97, 0xa9, 0xd5, 0x2d, 0x5a, 0xb4, 0xef, 0x59, 0xb2, 0xe3, 0x41, 0x82, 0x83, 0x81, 0x85,
+    0x8d, 0x9d, 0xbd, 0xfd, 0x7d, 0xfa, 0x73, 0xe6, 0x4b, 0x96, 0xab, 0xd1, 0x25, 0x4a, 0x94, 0xaf,
+    0xd9, 0x35, 0x6a, 0xd4, 0x2f, 0x5e, 0xbc, 0xff, 0x79, 0xf2, 0x63, 0xc6, 0x0b, 0x16, 0x2c, 0x58,
+    0xb0, 0xe7, 0x49, 0x92, 0xa3, 0xc1, 0x05, 0x0a, 0x14, 0x28, 0x50, 0xa0, 0xc7, 0x09, 0x12, 0x24,
+    0x48, 0x90, 0xa7, 0xc9, 0x15, 0x2a, 0x54, 0xa8, 0xd7, 0x29, 0x52, 0xa4, 0xcf, 0x19, 0x32, 0x64,
+    0xc8, 0x17, 0x2e, 0x5c, 0xb8, 0xf7, 0x69, 0xd2, 0x23, 0x46, 0x8c, 0x9f, 0xb9, 0xf5, 0x6d, 0xda,
+    0x33, 0x66, 0xcc, 0x1f, 0x3e, 0x7c, 0xf8, 0x77, 0xee, 0x5b, 0xb6, 0xeb, 0x51, 0xa2, 0xc3, 0x00
+    
+)
+
+_RS_CCSDS_INDEX_OF = (
+    0xFF, 0x00, 0x01, 0x63, 0x02, 0xC6, 0x64, 0x6A, 0x03, 0xCD, 0xC7, 0xBC, 0x65, 0x7E, 0x6B, 0x2A,
+    0x04, 0x8D, 0xCE, 0x4E, 0xC8, 0xD4, 0xBD, 0xE1, 0x66, 0xDD, 0x7F, 0x31, 0x6C, 0x20, 0x2B, 0xF3,
+    0x05, 0x57, 0x8E, 0xE8, 0xCF, 0xAC, 0x4F, 0x83, 0xC9, 0xD9, 0xD5, 0x41, 0xBE, 0x94, 0xE2, 0xB4,
+    0x67, 0x27, 0xDE, 0xF0, 0x80, 0xB1, 0x32, 0x35, 0x6D, 0x45, 0x21, 0x12, 0x2C, 0x0D, 0xF4, 0x38,
+    0x06, 0x9B, 0x58, 0x1A, 0x8F, 0x79, 0xE9, 0x70, 0xD0, 0xC2, 0xAD, 0xA8, 0x50, 0x75, 0x84, 0x48,
+    0xCA, 0xFC, 0xDA, 0x8A, 0xD6, 0x54, 0x42, 0x24, 0xBF, 0x98, 0x95, 0xF9, 0xE3, 0x5E, 0xB5, 0x15,
+    0x68, 0x61, 0x28, 0xBA, 0xDF, 0x4C, 0xF1, 0x2F, 0x81, 0xE6, 0xB2, 0x3F, 0x33, 0xEE, 0x36, 0x10,
+    0x6E, 0x18, 0x46, 0xA6, 0x22, 0x88, 0x13, 0xF7, 0x2D, 0xB8, 0x0E, 0x3D, 0xF5, 0xA4, 0x39, 0x3B,
+    0x07, 0x9E, 0x9C, 0x9D, 0x59, 0x9F, 0x1B, 0x08, 0x90, 0x09, 0x7A, 0x1C, 0xEA, 0xA0, 0x71, 0x5A,
+    0xD1, 0x1D, 0xC3, 0x7B, 0xAE, 0x0A, 0xA9, 0x91, 0x51, 0x5B, 0x76, 0x72, 0x85, 0xA1, 0x49, 0xEB,
+    0xCB, 0x7C, 0xFD, 0xC4, 0xDB, 0x1E, 0x8B, 0xD2, 0xD7, 0x92, 0x55, 0xAA, 0x43, 0x0B, 0x25, 0xAF,
+    0xC0, 0x73, 0x99, 0x77, 0x96, 0x5C, 0xFA, 0x52, 0xE4, 0xEC, 0x5F, 0x4A, 0xB6, 0xA2, 0x16, 0x86,
+    0x69, 0xC5, 0x62, 0xFE, 0x29, 0x7D, 0xBB, 0xCC, 0xE0, 0xD3, 0x4D, 0x8C, 0xF2, 0x1F, 0x30, 0xDC,
+    0x82, 0xAB, 0xE7, 0x56, 0xB3, 0x93, 0x40, 0xD8, 0x34, 0xB0, 0xEF, 0x26, 0x37, 0x0C, 0x11, 0x44,
+    0x6F, 0x78, 0x19, 0x9A, 0x47, 0x74, 0xA7, 0xC1, 0x23, 0x53, 0x89, 0xFB, 0x14, 0x5D, 0xF8, 0x97,
+    0x2E, 0x4B, 0xB9, 0x60, 0x0F, 0xED, 0x3E, 0xE5, 0xF6, 0x87, 0xA5, 0x17, 0x3A, 0xA3, 0x3C, 0xB7
+    
+)
+
+_RS_CCSDS_GENPOLY = (
+    0x00, 0xF9, 0x3B, 0x42, 0x04, 0x2B, 0x7E, 0xFB, 0x61, 0x1E, 0x03, 0xD5, 0x32, 0x42, 0xAA, 0x05,
+    0x18, 0x05, 0xAA, 0x42, 0x32, 0xD5, 0x03, 0x1E, 0x61, 0xFB, 0x7E, 0x2B, 0x04, 0x42, 0x3B, 0xF9,
+    0x00
+)
+
+_RS_ALPHA_TO = np.array(_RS_CCSDS_ALPHA_TO, dtype=np.uint8)
+_RS_ALPHA_TO.flags.writeable = False
+
+_RS_CHIEN_POINTS = np.arange(1, _RS_NN + 1, dtype=np.int64)
+
+# Antilog table extended to 2*NN entries, so a sum of two index values can be used without a modulo
+_RS_EXP = tuple(_RS_CCSDS_ALPHA_TO[i % _RS_NN] for i in range(2*_RS_NN))
+
+def _build_tables():
+    """
+    Builds the NumPy lookup tables used by the Reed-Solomon encoder and decoder.
+
+    :return: The GF(2^8) multiplication table, the syndrome tables and the encoder feedback table.
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray, tuple[int]]
+    """
+    alpha_to = _RS_ALPHA_TO
+    index_of = np.array(_RS_CCSDS_INDEX_OF, dtype=np.int32)
+
+    # mul[a, b] = a*b in GF(2^8)
+    mul = alpha_to[(index_of[:, np.newaxis] + index_of[np.newaxis, :]) % _RS_NN]
+    mul[0, :] = 0
+    mul[:, 0] = 0
+
+    # syn[i, p] = alpha^(root_i*p), with root_i = (FCR + i)*PRIM, so the syndrome i of a codeword with the
+    # symbol d_j at the power p_j of x is the sum of mul[d_j, syn[i, p_j]]
+    roots = (np.arange(_RS_FCR, _RS_FCR + _RS_NROOTS) * _RS_PRIM) % _RS_NN
+    syn = alpha_to[(roots[:, np.newaxis] * np.arange(_RS_NN)[np.newaxis, :]) % _RS_NN].astype(np.intp)
+
+    # step[256*i + x] = x*alpha^root_i (one step of Horner's method for the syndrome i)
+    step = mul[:, syn[:, 1]].T.ravel().astype(np.intp)
+
+    # enc[v] = parity register update (as a big-endian integer) for a feedback symbol v
+    enc = [0]
+    for v in range(1, 256):
+        fb = _RS_CCSDS_INDEX_OF[v]
+        row = bytes(_RS_CCSDS_ALPHA_TO[(fb + _RS_CCSDS_GENPOLY[_RS_NROOTS - 1 - k]) % _RS_NN] for k in range(_RS_NROOTS))
+        enc.append(int.from_bytes(row, 'big'))
+
+    for table in (mul, syn, step):
+        table.flags.writeable = False
+
+    return mul, syn, step, tuple(enc)
+
+_RS_GF_MUL, _RS_SYNDROME_POW, _RS_SYNDROME_STEP, _RS_ENCODE_FEEDBACK = _build_tables()
+
+_RS_GF_MUL_FLAT = _RS_GF_MUL.ravel()
+
+_RS_DECODE_MANY_CHUNK = 256 # Number of codewords processed at once by the batch syndrome computation
+
 class ReedSolomon:
     """
     CCSDS Reed-Solomon (without dual basis representation) class.
@@ -31,61 +136,16 @@ class ReedSolomon:
         """
         Constructor of the class with the Reed-Solomon paramenters initialization.
 
-        This class uses the Reed-Solomon scheme from CCSDS (without dual basis representation).
+        This class uses the Reed-Solomon scheme from CCSDS (without dual basis representation). The lookup tables
+        are shared by all the instances of the class.
         """
-        # Constants
-        self._MM        = 8
-        self._NN        = 255
-        self._NROOTS    = 32
-        self._FCR       = 112
-        self._PRIM      = 11
-        self._IPRIM     = 116
-        self._A0        = self._NN  # Special reserved value encoding zero in index form
-
-        # Precomputed tables
-        self._ccsds_alpha_to = [
-            0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x87, 0x89, 0x95, 0xad, 0xdd, 0x3d, 0x7a, 0xf4,
-            0x6f, 0xde, 0x3b, 0x76, 0xec, 0x5f, 0xbe, 0xfb, 0x71, 0xe2, 0x43, 0x86, 0x8b, 0x91, 0xa5, 0xcd,
-            0x1d, 0x3a, 0x74, 0xe8, 0x57, 0xae, 0xdb, 0x31, 0x62, 0xc4, 0x0f, 0x1e, 0x3c, 0x78, 0xf0, 0x67,
-            0xce, 0x1b, 0x36, 0x6c, 0xd8, 0x37, 0x6e, 0xdc, 0x3f, 0x7e, 0xfc, 0x7f, 0xfe, 0x7b, 0xf6, 0x6b,
-            0xd6, 0x2b, 0x56, 0xac, 0xdf, 0x39, 0x72, 0xe4, 0x4f, 0x9e, 0xbb, 0xf1, 0x65, 0xca, 0x13, 0x26,
-            0x4c, 0x98, 0xb7, 0xe9, 0x55, 0xaa, 0xd3, 0x21, 0x42, 0x84, 0x8f, 0x99, 0xb5, 0xed, 0x5d, 0xba,
-            0xf3, 0x61, 0xc2, 0x03, 0x06, 0x0c, 0x18, 0x30, 0x60, 0xc0, 0x07, 0x0e, 0x1c, 0x38, 0x70, 0xe0,
-            0x47, 0x8e, 0x9b, 0xb1, 0xe5, 0x4d, 0x9a, 0xb3, 0xe1, 0x45, 0x8a, 0x93, 0xa1, 0xc5, 0x0d, 0x1a,
-            0x34, 0x68, 0xd0, 0x27, 0x4e, 0x9c, 0xbf, 0xf9, 0x75, 0xea, 0x53, 0xa6, 0xcb, 0x11, 0x22, 0x44,
-            0x88, 0x97, 0xa9, 0xd5, 0x2d, 0x5a, 0xb4, 0xef, 0x59, 0xb2, 0xe3, 0x41, 0x82, 0x83, 0x81, 0x85,
-            0x8d, 0x9d, 0xbd, 0xfd, 0x7d, 0xfa, 0x73, 0xe6, 0x4b, 0x96, 0xab, 0xd1, 0x25, 0x4a, 0x94, 0xaf,
-            0xd9, 0x35, 0x6a, 0xd4, 0x2f, 0x5e, 0xbc, 0xff, 0x79, 0xf2, 0x63, 0xc6, 0x0b, 0x16, 0x2c, 0x58,
-            0xb0, 0xe7, 0x49, 0x92, 0xa3, 0xc1, 0x05, 0x0a, 0x14, 0x28, 0x50, 0xa0, 0xc7, 0x09, 0x12, 0x24,
-            0x48, 0x90, 0xa7, 0xc9, 0x15, 0x2a, 0x54, 0xa8, 0xd7, 0x29, 0x52, 0xa4, 0xcf, 0x19, 0x32, 0x64,
-            0xc8, 0x17, 0x2e, 0x5c, 0xb8, 0xf7, 0x69, 0xd2, 0x23, 0x46, 0x8c, 0x9f, 0xb9, 0xf5, 0x6d, 0xda,
-            0x33, 0x66, 0xcc, 0x1f, 0x3e, 0x7c, 0xf8, 0x77, 0xee, 0x5b, 0xb6, 0xeb, 0x51, 0xa2, 0xc3, 0x00
-        ]
-
-        self._ccsds_index_of = [
-            0xFF, 0x00, 0x01, 0x63, 0x02, 0xC6, 0x64, 0x6A, 0x03, 0xCD, 0xC7, 0xBC, 0x65, 0x7E, 0x6B, 0x2A,
-            0x04, 0x8D, 0xCE, 0x4E, 0xC8, 0xD4, 0xBD, 0xE1, 0x66, 0xDD, 0x7F, 0x31, 0x6C, 0x20, 0x2B, 0xF3,
-            0x05, 0x57, 0x8E, 0xE8, 0xCF, 0xAC, 0x4F, 0x83, 0xC9, 0xD9, 0xD5, 0x41, 0xBE, 0x94, 0xE2, 0xB4,
-            0x67, 0x27, 0xDE, 0xF0, 0x80, 0xB1, 0x32, 0x35, 0x6D, 0x45, 0x21, 0x12, 0x2C, 0x0D, 0xF4, 0x38,
-            0x06, 0x9B, 0x58, 0x1A, 0x8F, 0x79, 0xE9, 0x70, 0xD0, 0xC2, 0xAD, 0xA8, 0x50, 0x75, 0x84, 0x48,
-            0xCA, 0xFC, 0xDA, 0x8A, 0xD6, 0x54, 0x42, 0x24, 0xBF, 0x98, 0x95, 0xF9, 0xE3, 0x5E, 0xB5, 0x15,
-            0x68, 0x61, 0x28, 0xBA, 0xDF, 0x4C, 0xF1, 0x2F, 0x81, 0xE6, 0xB2, 0x3F, 0x33, 0xEE, 0x36, 0x10,
-            0x6E, 0x18, 0x46, 0xA6, 0x22, 0x88, 0x13, 0xF7, 0x2D, 0xB8, 0x0E, 0x3D, 0xF5, 0xA4, 0x39, 0x3B,
-            0x07, 0x9E, 0x9C, 0x9D, 0x59, 0x9F, 0x1B, 0x08, 0x90, 0x09, 0x7A, 0x1C, 0xEA, 0xA0, 0x71, 0x5A,
-            0xD1, 0x1D, 0xC3, 0x7B, 0xAE, 0x0A, 0xA9, 0x91, 0x51, 0x5B, 0x76, 0x72, 0x85, 0xA1, 0x49, 0xEB,
-            0xCB, 0x7C, 0xFD, 0xC4, 0xDB, 0x1E, 0x8B, 0xD2, 0xD7, 0x92, 0x55, 0xAA, 0x43, 0x0B, 0x25, 0xAF,
-            0xC0, 0x73, 0x99, 0x77, 0x96, 0x5C, 0xFA, 0x52, 0xE4, 0xEC, 0x5F, 0x4A, 0xB6, 0xA2, 0x16, 0x86,
-            0x69, 0xC5, 0x62, 0xFE, 0x29, 0x7D, 0xBB, 0xCC, 0xE0, 0xD3, 0x4D, 0x8C, 0xF2, 0x1F, 0x30, 0xDC,
-            0x82, 0xAB, 0xE7, 0x56, 0xB3, 0x93, 0x40, 0xD8, 0x34, 0xB0, 0xEF, 0x26, 0x37, 0x0C, 0x11, 0x44,
-            0x6F, 0x78, 0x19, 0x9A, 0x47, 0x74, 0xA7, 0xC1, 0x23, 0x53, 0x89, 0xFB, 0x14, 0x5D, 0xF8, 0x97,
-            0x2E, 0x4B, 0xB9, 0x60, 0x0F, 0xED, 0x3E, 0xE5, 0xF6, 0x87, 0xA5, 0x17, 0x3A, 0xA3, 0x3C, 0xB7
-        ]
-
-        self._ccsds_genpoly = [
-            0x00, 0xF9, 0x3B, 0x42, 0x04, 0x2B, 0x7E, 0xFB, 0x61, 0x1E, 0x03, 0xD5, 0x32, 0x42, 0xAA, 0x05,
-            0x18, 0x05, 0xAA, 0x42, 0x32, 0xD5, 0x03, 0x1E, 0x61, 0xFB, 0x7E, 0x2B, 0x04, 0x42, 0x3B, 0xF9,
-            0x00
-        ]
+        self._MM        = _RS_MM
+        self._NN        = _RS_NN
+        self._NROOTS    = _RS_NROOTS
+        self._FCR       = _RS_FCR
+        self._PRIM      = _RS_PRIM
+        self._IPRIM     = _RS_IPRIM
+        self._A0        = _RS_A0
 
     def encode(self, data, pad):
         """
@@ -97,27 +157,17 @@ class ReedSolomon:
         :return: Parity data list with 32 bytes.
         :rtype: list
         """
-        parity = np.zeros(self._NROOTS, dtype=np.uint8)
-    
-        for i in range(self._NN - self._NROOTS - pad):
-            feedback = self._ccsds_index_of[data[i] ^ parity[0]]  # Compute feedback term
-            if feedback != self._A0:  # If feedback term is non-zero
-                # Optional: Uncomment if UNNORMALIZED is defined
-                # feedback = mod255(NN - GENPOLY[NROOTS] + feedback)
-    
-                x = list()
-                for j in range(1, self._NROOTS):
-                    parity[j] ^= self._ccsds_alpha_to[self._mod255(feedback + self._ccsds_genpoly[self._NROOTS - j])]
-    
-            # Shift parity array
-            parity[:-1] = parity[1:].copy() # Shift left by one
-            if feedback != self._A0:
-                parity[-1] = self._ccsds_alpha_to[self._mod255(feedback + self._ccsds_genpoly[0])]
-            else:
-                parity[-1] = np.int8(0)
-    
-        return list(parity)
+        mask = (1 << (8*_RS_NROOTS)) - 1
+        shift = 8*(_RS_NROOTS - 1)
 
+        # The parity register is kept as a big-endian integer (parity[0] is the most significant byte)
+        parity = 0
+        for i in range(_RS_NN - _RS_NROOTS - pad):
+            parity = ((parity << 8) & mask) ^ _RS_ENCODE_FEEDBACK[data[i] ^ (parity >> shift)]
+
+        return list(parity.to_bytes(_RS_NROOTS, 'big'))
+
+    @timed("reed_solomon")
     def decode(self, data, pad, eras_pos=None, no_eras=0):
         """
         Decodes a Reed-Solomon codeword (data + parity).
@@ -128,6 +178,12 @@ class ReedSolomon:
         :param pad: The number of pad symbols in a block.
         :type: int
 
+        :param eras_pos: Is a list with the position of the erased symbols (in the full 255 symbols block).
+        :type: list
+
+        :param no_eras: Is the number of erased symbols.
+        :type: int
+
         :return: The decoded data.
         :rtype: list
 
@@ -137,139 +193,204 @@ class ReedSolomon:
         :return: The number of detected errors.
         :rtype: int
         """
-        deg_lambda  = np.int16()
-        el          = np.int16()
-        deg_omega   = np.int16()
-        i           = np.int16()
-        j           = np.int16()
-        r           = np.int16()
-        k           = np.int16()
-        u           = np.uint8()
-        q           = np.uint8()
-        tmp         = np.uint8()
-        num1        = np.uint8()
-        num2        = np.uint8()
-        den         = np.uint8()
-        discr_r     = np.uint8()
-        lambda_poly = np.zeros(self._NROOTS + 1, dtype=np.uint8)
-        s           = np.zeros(self._NROOTS, dtype=np.uint8)
-        b           = np.zeros(self._NROOTS + 1, dtype=np.uint8)
-        t           = np.zeros(self._NROOTS + 1, dtype=np.uint8)
-        omega       = np.zeros(self._NROOTS + 1, dtype=np.uint8)
-        root        = np.zeros(self._NROOTS, dtype=np.uint8)
-        reg         = np.zeros(self._NROOTS + 1, dtype=np.uint8)
-        loc         = np.zeros(self._NROOTS, dtype=np.uint8)
-        syn_error   = np.int16()
-        count       = np.int16()
+        codeword = np.asarray(data, dtype=np.uint8)
 
         # Form the syndromes; i.e., evaluate data(x) at roots of g(x)
-        for i in range(self._NROOTS):
-            s[i] = data[0]
-    
-        for j in range(1, self._NN - pad):
-            for i in range(self._NROOTS):
-                if s[i] == 0:
-                    s[i] = data[j]
+        s = self._syndromes(codeword, pad)
+
+        if not s.any():
+            # If syndrome is zero, data[] is a codeword and there are no errors to correct
+            return codeword[:-_RS_NROOTS].tolist(), list(), 0
+
+        data = codeword.tolist()
+
+        try:
+            err_pos, count = self._correct(data, pad, s.tolist(), eras_pos, no_eras)
+        except RuntimeError:
+            get_metrics().count("rs_uncorrectable")
+            raise
+
+        get_metrics().count("rs_corrected_symbols", count)
+
+        return data[:-_RS_NROOTS], err_pos, count
+
+    @timed("reed_solomon_many")
+    def decode_many(self, codewords, pads):
+        """
+        Decodes a batch of Reed-Solomon codewords.
+
+        The syndromes of all codewords are computed at once, and only the codewords with a non-zero syndrome go
+        through the error correction.
+
+        :param codewords: Is a 2-D array where each row holds a codeword (data + parity) in its first 255 - pad symbols.
+        :type: np.ndarray
+
+        :param pads: The number of pad symbols of each codeword (or a single value for all of them).
+        :type: list[int] or int
+
+        :return: A copy of the codewords with the errors corrected.
+        :rtype: np.ndarray
+
+        :return: The number of corrected symbols of each codeword, or -1 if the codeword is uncorrectable.
+        :rtype: np.ndarray
+        """
+        codewords = np.array(codewords, dtype=np.uint8, ndmin=2)
+        pads = np.broadcast_to(np.asarray(pads, dtype=np.int64), (codewords.shape[0],))
+
+        counts = np.zeros(codewords.shape[0], dtype=np.int64)
+
+        for start in range(0, codewords.shape[0], _RS_DECODE_MANY_CHUNK):
+            stop = min(start + _RS_DECODE_MANY_CHUNK, codewords.shape[0])
+            s = self._syndromes_many(codewords[start:stop], pads[start:stop])
+
+            for row in np.flatnonzero(s.any(axis=1)):
+                k = start + row
+                length = _RS_NN - int(pads[k])
+                data = codewords[k, :length].tolist()
+                try:
+                    err_pos, counts[k] = self._correct(data, int(pads[k]), s[row].tolist(), None, 0)
+                except RuntimeError:
+                    counts[k] = -1
                 else:
-                    s[i] = data[j] ^ self._ccsds_alpha_to[self._mod255(self._ccsds_index_of[s[i]] + (self._FCR + i) * self._PRIM)]
+                    codewords[k, :length] = data
 
-        # Convert syndromes to index form, checking for nonzero condition
-        syn_error = 0
-        for i in range(self._NROOTS):
-            syn_error |= s[i]
-            s[i] = self._ccsds_index_of[s[i]]
+        metrics = get_metrics()
+        metrics.count("rs_uncorrectable", int(np.count_nonzero(counts < 0)))
+        metrics.count("rs_corrected_symbols", int(counts[counts > 0].sum()))
 
-        if not syn_error:
-            # If syndrome is zero, data[] is a codeword and there are no errors to correct
-            return data[:-32], list(), 0
+        return codewords, counts
+
+    def _syndromes(self, codeword, pad):
+        """
+        Computes the syndromes of a codeword.
+
+        :param codeword: Is the codeword (data + parity).
+        :type: np.ndarray
+
+        :param pad: The number of pad symbols in the block.
+        :type: int
+
+        :return: The 32 syndromes in polynomial form.
+        :rtype: np.ndarray
+        """
+        length = _RS_NN - pad
+
+        # The symbol j is the coefficient of x^(length - 1 - j), mul[a, b] = mul_flat[256*a + b]
+        terms = np.take(_RS_GF_MUL_FLAT, (codeword[:length].astype(np.intp) << 8) + _RS_SYNDROME_POW[:, length - 1::-1])
+
+        return np.bitwise_xor.reduce(terms, axis=1)
+
+    def _syndromes_many(self, codewords, pads):
+        """
+        Computes the syndromes of a batch of codewords.
+
+        :param codewords: Is a 2-D array with a codeword in the first 255 - pad symbols of each row.
+        :type: np.ndarray
+
+        :param pads: The number of pad symbols of each codeword.
+        :type: np.ndarray
+
+        :return: A 2-D array with the 32 syndromes of each codeword in polynomial form.
+        :rtype: np.ndarray
+        """
+        # Align the codewords to the end of a full block (the pad symbols are zeros at the beginning)
+        idx = np.arange(_RS_NN)[:, np.newaxis] - pads[np.newaxis, :]
+        valid = (idx >= 0) & (idx < codewords.shape[1])
+        blocks = np.where(valid, codewords.T[np.clip(idx, 0, codewords.shape[1] - 1), np.arange(codewords.shape[0])], 0).astype(np.intp)
+
+        # Horner's method over the symbols, evaluating all codewords and all roots at once
+        offset = (np.arange(_RS_NROOTS, dtype=np.intp) << 8)[:, np.newaxis]
+        s = np.zeros((_RS_NROOTS, codewords.shape[0]), dtype=np.intp)
+        for j in range(_RS_NN):
+            s = np.take(_RS_SYNDROME_STEP, s + offset) ^ blocks[j]
+
+        return s.T.astype(np.uint8)
 
-        lambda_poly[0] = np.uint8(1)
+    def _correct(self, data, pad, s, eras_pos, no_eras):
+        """
+        Corrects a codeword with a non-zero syndrome (Berlekamp-Massey, Chien search and Forney algorithms).
+
+        :param data: Is the codeword as a list of integers (corrected in place).
+        :type: list
+
+        :param pad: The number of pad symbols in a block.
+        :type: int
+
+        :param s: Is a list with the 32 syndromes in polynomial form.
+        :type: list
+
+        :param eras_pos: Is a list with the position of the erased symbols (in the full 255 symbols block).
+        :type: list
+
+        :param no_eras: Is the number of erased symbols.
+        :type: int
+
+        :return: A list with the position of the detected errors and the number of detected errors.
+        :rtype: tuple[list, int]
+        """
+        NN      = _RS_NN
+        NROOTS  = _RS_NROOTS
+        A0      = _RS_A0
+        exp     = _RS_EXP
+        log     = _RS_CCSDS_INDEX_OF
+
+        # Convert syndromes to index form
+        s = [log[x] for x in s]
+
+        lambda_poly = [0]*(NROOTS + 1)
+        lambda_poly[0] = 1
 
         if no_eras > 0 and eras_pos is not None:
             # Init lambda to be the erasure locator polynomial
-            lambda_poly[1] = self._ccsds_alpha_to[self._mod255(self._PRIM * (self._NN - 1 - eras_pos[0]))]
+            lambda_poly[1] = exp[(_RS_PRIM * (NN - 1 - eras_pos[0])) % NN]
             for i in range(1, no_eras):
-                u = self._mod255(self._PRIM * (self._NN - 1 - eras_pos[i]))
+                u = (_RS_PRIM * (NN - 1 - eras_pos[i])) % NN
                 for j in range(i + 1, 0, -1):
-                    tmp = self._ccsds_index_of[lambda_poly[j - 1]]
-                    if tmp != self._A0:
-                        lambda_poly[j] ^= self._ccsds_alpha_to[self._mod255(u + tmp)]
+                    tmp = log[lambda_poly[j - 1]]
+                    if tmp != A0:
+                        lambda_poly[j] ^= exp[u + tmp]
 
-        for i in range(self._NROOTS + 1):
-            b[i] = self._ccsds_index_of[lambda_poly[i]]
+        b = [log[x] for x in lambda_poly]
 
         # Begin Berlekamp-Massey algorithm to determine error+erasure locator polynomial
-        r = no_eras
         el = no_eras
-        r += 1
-        while r <= self._NROOTS:
+        for r in range(no_eras + 1, NROOTS + 1):
             # Compute discrepancy at the r-th step in poly-form
-            discr_r = np.uint8(0)
+            discr_r = 0
             for i in range(r):
-                if lambda_poly[i] != 0 and s[r - i - 1] != self._A0:
-                    discr_r ^= self._ccsds_alpha_to[self._mod255(np.uint16(self._ccsds_index_of[lambda_poly[i]]) + np.uint16(s[r - i - 1]))]
-            discr_r = self._ccsds_index_of[discr_r] # Index form
-            if discr_r == self._A0:
+                if lambda_poly[i] != 0 and s[r - i - 1] != A0:
+                    discr_r ^= exp[log[lambda_poly[i]] + s[r - i - 1]]
+            discr_r = log[discr_r]  # Index form
+
+            if discr_r == A0:
                 # B(x) <-- x*B(x)
-                b[1:] = b[:-1].copy()
-                b[0] = self._A0
+                b = [A0] + b[:-1]
             else:
                 # T(x) <-- lambda(x) - discr_r*x*b(x)
-                t[0] = lambda_poly[0]
-                for i in range(self._NROOTS):
-                    if b[i] != self._A0:
-                        t[i + 1] = lambda_poly[i + 1] ^ self._ccsds_alpha_to[self._mod255(np.uint16(discr_r) + np.uint16(b[i]))]
-                    else:
-                        t[i + 1] = lambda_poly[i + 1]
+                t = [lambda_poly[0]] + [lambda_poly[i + 1] ^ exp[discr_r + b[i]] if b[i] != A0 else lambda_poly[i + 1] for i in range(NROOTS)]
                 if 2 * el <= r + no_eras - 1:
                     el = r + no_eras - el
                     # B(x) <-- inv(discr_r) * lambda(x)
-                    for i in range(self._NROOTS + 1):
-                        b[i] = self._A0 if lambda_poly[i] == 0 else self._mod255(self._ccsds_index_of[lambda_poly[i]] - discr_r + self._NN)
+                    b = [A0 if x == 0 else (log[x] - discr_r + NN) % NN for x in lambda_poly]
                 else:
                     # B(x) <-- x*B(x)
-                    b[1:] = b[:-1].copy()
-                    b[0] = self._A0
-                lambda_poly = t.copy()
-            r += 1
+                    b = [A0] + b[:-1]
+                lambda_poly = t
 
         # Convert lambda to index form and compute deg(lambda(x))
-        deg_lambda = 0
-        for i in range(self._NROOTS + 1):
-            lambda_poly[i] = self._ccsds_index_of[lambda_poly[i]]
-            if lambda_poly[i] != self._A0:
-                deg_lambda = i
-
-        # Find roots of the error+erasure locator polynomial by Chien search
-        reg[1:] = lambda_poly[1:].copy()
-        count = 0  # Number of roots of lambda(x)
-        i = 1
-        k = self._IPRIM - 1
-        while i <= self._NN:
-            q = 1  # lambda[0] is always 0
-            for j in range(deg_lambda, 0, -1):
-                if reg[j] != self._A0:
-                    reg[j] = self._mod255(np.uint16(reg[j]) + np.uint16(j))
-                    q ^= self._ccsds_alpha_to[reg[j]]
-
-            if q != 0:
-                # Not a root, continue to the next iteration
-                i += 1
-                k = self._mod255(k + self._IPRIM)
-                continue
-
-            # Store root (index-form) and error location number
-            root[count] = i
-            loc[count] = k
-
-            # If we've already found max possible roots, abort the search to save time
-            count += 1
-            if count == deg_lambda:
-                break
-
-            # Update i and k for the next iteration
-            i += 1
-            k = self._mod255(k + self._IPRIM)
+        lambda_poly = [log[x] for x in lambda_poly]
+        deg_lambda = max(i for i in range(NROOTS + 1) if lambda_poly[i] != A0)
+
+        # Find roots of the error+erasure locator polynomial by Chien search (all the 255 points at once)
+        j = np.array([i for i in range(1, deg_lambda + 1) if lambda_poly[i] != A0], dtype=np.int64)
+        q = np.ones(NN, dtype=np.uint8)     # lambda[0] is always 0
+        if j.size > 0:
+            reg = np.array(lambda_poly, dtype=np.int64)[j, np.newaxis] + j[:, np.newaxis] * _RS_CHIEN_POINTS[np.newaxis, :]
+            q ^= np.bitwise_xor.reduce(_RS_ALPHA_TO[reg % NN], axis=0)
+
+        root = (np.flatnonzero(q == 0) + 1)[:deg_lambda].tolist()
+        loc = [(i * _RS_IPRIM - 1) % NN for i in root]     # Error location numbers
+        count = len(root)
 
         if deg_lambda != count:
             # deg(lambda) unequal to number of roots => uncorrectable error detected
@@ -277,36 +398,36 @@ class ReedSolomon:
 
         # Compute err+eras evaluator poly omega(x) = s(x)*lambda(x) (modulo x**NROOTS)
         deg_omega = deg_lambda - 1
+        omega = list()
         for i in range(deg_omega + 1):
-            tmp = np.uint8(0)
+            tmp = 0
             for j in range(i, -1, -1):
-                if s[i - j] != self._A0 and lambda_poly[j] != self._A0:
-                    tmp ^= self._ccsds_alpha_to[self._mod255(np.uint16(s[i - j]) + np.uint16(lambda_poly[j]))]
-            omega[i] = self._ccsds_index_of[tmp]
+                if s[i - j] != A0 and lambda_poly[j] != A0:
+                    tmp ^= exp[s[i - j] + lambda_poly[j]]
+            omega.append(log[tmp])
 
         # Compute error values in poly-form
         for j in range(count - 1, -1, -1):
             num1 = 0
             for i in range(deg_omega, -1, -1):
-                if omega[i] != self._A0:
-                    num1 ^= self._ccsds_alpha_to[self._mod255(np.uint16(omega[i]) + np.uint16(i) * np.uint16(root[j]))]
-            num2 = self._ccsds_alpha_to[self._mod255(np.uint16(root[j]) * np.uint16(self._FCR - 1) + np.uint16(self._NN))]
+                if omega[i] != A0:
+                    num1 ^= exp[(omega[i] + i * root[j]) % NN]
+            num2 = exp[(root[j] * (_RS_FCR - 1) + NN) % NN]
             den = 0
 
             # lambda[i+1] for i even is the formal derivative lambda_pr of lambda[i]
-            for i in range(min(deg_lambda, self._NROOTS - 1) & ~1, -1, -2):
-                if lambda_poly[i + 1] != self._A0:
-                    den ^= self._ccsds_alpha_to[self._mod255(np.uint16(lambda_poly[i + 1]) + np.uint16(i) * np.uint16(root[j]))]
+            for i in range(min(deg_lambda, NROOTS - 1) & ~1, -1, -2):
+                if lambda_poly[i + 1] != A0:
+                    den ^= exp[(lambda_poly[i + 1] + i * root[j]) % NN]
+
+            if den == 0:
+                raise RuntimeError("Uncorrectable errors detected in Reed-Solomon codeword!")
 
             # Apply error to data
             if num1 != 0 and loc[j] >= pad:
-                data[loc[j] - pad] ^= self._ccsds_alpha_to[self._mod255(self._ccsds_index_of[num1] + self._ccsds_index_of[num2] + self._NN - self._ccsds_index_of[den])]
-
-        eras_pos = list()
-        for i in range(count):
-            eras_pos.append(loc[i] - pad)
+                data[loc[j] - pad] ^= exp[(log[num1] + log[num2] + NN - log[den]) % NN]
 
-        return data[:-32], eras_pos, count
+        return [i - pad for i in loc], count
 
     def _mod255(self, x):
         """
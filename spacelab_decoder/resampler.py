@@ -0,0 +1,149 @@
+#
+#  resampler.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+from fractions import Fraction
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+
+_RESAMPLER_TAPS_PER_FACTOR  = 8   # Filter length for each unit of the largest of the interpolation and decimation factors
+_RESAMPLER_KAISER_BETA      = 5.0
+
+class Resampler:
+    """
+    Polyphase resampler.
+
+    The input is upsampled by L and downsampled by M (where L/M is the reduced ratio of the output and input sample
+    rates), with a low-pass FIR filter split in L phases, so only the output samples are computed. The filter state is
+    kept between blocks, so a stream can be resampled in blocks of any size.
+
+    The cutoff of the filter is at 1/max(L, M) of the upsampled band, so its length is scaled by max(L, M) to keep the
+    same transition width for any ratio (ex.: 40 taps for 48 kHz to 9.6 kHz).
+    """
+    def __init__(self, in_rate, out_rate, taps_per_phase=None):
+        """
+        Class constructor.
+
+        :param in_rate: Is the input sample rate in Hertz.
+        :type: int
+
+        :param out_rate: Is the output sample rate in Hertz.
+        :type: int
+
+        :param taps_per_phase: Is the number of filter taps of each phase (if None, it is given by the resampling ratio).
+        :type: int
+        """
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("The sample rates must be greater than zero!")
+
+        if taps_per_phase is not None and taps_per_phase < 1:
+            raise ValueError("The number of taps per phase must be greater than zero!")
+
+        self._in_rate = int(in_rate)
+        self._out_rate = int(out_rate)
+
+        ratio = Fraction(self._out_rate, self._in_rate)
+        self._interp = ratio.numerator
+        self._decim = ratio.denominator
+
+        if taps_per_phase is None:
+            taps_per_phase = -(-_RESAMPLER_TAPS_PER_FACTOR*max(self._interp, self._decim) // self._interp)
+
+        if self._interp == self._decim:
+            taps_per_phase = 1  # Same sample rate: no filtering
+            taps = np.ones(1)
+        else:
+            # Anti-aliasing/anti-imaging filter at the upsampled rate (the gain compensates the zeros of the upsampling)
+            taps = signal.firwin(self._interp*taps_per_phase, 1/max(self._interp, self._decim), window=('kaiser', _RESAMPLER_KAISER_BETA))*self._interp
+
+        # Phase p has the taps p, p + L, p + 2L, ..., reversed to be applied to the input samples in time order
+        self._phases = taps.reshape(taps_per_phase, self._interp).T[:, ::-1].copy()
+        self._taps_per_phase = taps_per_phase
+
+        self.reset()
+
+    def process(self, samples):
+        """
+        Resamples a block of samples.
+
+        :param samples: Is the block of samples.
+        :type: np.ndarray
+
+        :return: The resampled block (its length depends on the state left by the previous blocks).
+        :rtype: np.ndarray
+        """
+        samples = np.asarray(samples)
+        if not np.iscomplexobj(samples):
+            samples = samples.astype(np.float64, copy=False)
+
+        buf = np.concatenate((self._hist.astype(samples.dtype, copy=False), samples))
+
+        # Output k is at the position t0 + k*M of the upsampled block, computed while its input sample is available
+        num_out = max(0, -(-(len(samples)*self._interp - self._next) // self._decim))
+        pos = self._next + self._decim*np.arange(num_out)
+        idx = pos // self._interp
+        phase = pos % self._interp
+
+        windows = sliding_window_view(buf, self._taps_per_phase)
+        out = np.einsum('ij,ij->i', self._phases[phase], windows[idx])
+
+        self._next += num_out*self._decim - len(samples)*self._interp
+        self._hist = buf[len(buf) - (self._taps_per_phase - 1):]
+
+        return out
+
+    def reset(self):
+        """
+        Clears the filter state.
+
+        :return: None
+        """
+        self._hist = np.zeros(self._taps_per_phase - 1)
+        self._next = 0  # Position of the next output in the upsampled block
+
+    def get_input_rate(self):
+        """
+        Gets the input sample rate.
+
+        :return: The input sample rate in Hertz.
+        :rtype: int
+        """
+        return self._in_rate
+
+    def get_output_rate(self):
+        """
+        Gets the output sample rate.
+
+        :return: The output sample rate in Hertz.
+        :rtype: int
+        """
+        return self._out_rate
+
+    def get_ratio(self):
+        """
+        Gets the resampling ratio.
+
+        :return: The interpolation and the decimation factors.
+        :rtype: tuple[int, int]
+        """
+        return self._interp, self._decim
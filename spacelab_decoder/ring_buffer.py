@@ -0,0 +1,220 @@
+#
+#  ring_buffer.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import time
+import threading
+
+import numpy as np
+
+_RING_BUFFER_DEFAULT_SIZE       = 2**20     # Samples (about 20 seconds at 48 kHz)
+_RING_BUFFER_DEFAULT_MAX_WRITE  = 65536     # Bytes (larger than the maximum UDP payload)
+
+class RingBuffer:
+    """
+    Single-producer/single-consumer ring buffer of samples.
+
+    The samples are stored as bytes in a preallocated NumPy array, with an extra region after its end where the
+    producer can write (ex.: with socket.recv_into()) without checking the wrap-around. Each side only advances its own
+    counter, so no lock is needed between one writer thread and one reader thread.
+    """
+    def __init__(self, size=_RING_BUFFER_DEFAULT_SIZE, dtype=np.int16, max_write=_RING_BUFFER_DEFAULT_MAX_WRITE):
+        """
+        Class constructor.
+
+        :param size: Is the capacity of the buffer in samples.
+        :type: int
+
+        :param dtype: Is the format of the samples.
+        :type: np.dtype
+
+        :param max_write: Is the maximum number of bytes of a single write.
+        :type: int
+        """
+        self._dtype = np.dtype(dtype)
+
+        if size < 1:
+            raise ValueError("The size of the ring buffer must be greater than zero!")
+
+        if max_write < 1 or max_write > size*self._dtype.itemsize:
+            raise ValueError("The maximum write size must be between 1 and the size of the ring buffer!")
+
+        self._capacity = size*self._dtype.itemsize  # Bytes
+        self._max_write = max_write
+        self._buf = np.zeros(self._capacity + max_write, dtype=np.uint8)
+        self._view = memoryview(self._buf)
+
+        self._written = 0   # Bytes written since the creation of the buffer (updated only by the producer)
+        self._read = 0      # Bytes read since the creation of the buffer (updated only by the consumer)
+        self._data_event = threading.Event()
+
+    def __len__(self):
+        """
+        Number of samples available to read.
+
+        :return: The number of samples written and not read yet.
+        :rtype: int
+        """
+        return (self._written - self._read)//self._dtype.itemsize
+
+    def get_size(self):
+        """
+        Gets the capacity of the buffer.
+
+        :return: The capacity in samples.
+        :rtype: int
+        """
+        return self._capacity//self._dtype.itemsize
+
+    def get_dtype(self):
+        """
+        Gets the format of the samples.
+
+        :return: The sample format.
+        :rtype: np.dtype
+        """
+        return self._dtype
+
+    def get_max_write(self):
+        """
+        Gets the maximum number of bytes of a single write.
+
+        :return: The maximum write size in bytes.
+        :rtype: int
+        """
+        return self._max_write
+
+    def get_free(self):
+        """
+        Gets the free space of the buffer.
+
+        :return: The number of bytes that can be written without overwriting samples not read yet.
+        :rtype: int
+        """
+        return self._capacity - (self._written - self._read)
+
+    def get_write_buffer(self):
+        """
+        Gets the region of the buffer where the next bytes must be written (producer side).
+
+        The written bytes are only visible to the consumer after calling commit().
+
+        :return: A writable memoryview of get_max_write() bytes, or None if there is not enough free space.
+        :rtype: memoryview
+        """
+        if self.get_free() < self._max_write:
+            return None
+
+        pos = self._written % self._capacity
+
+        return self._view[pos:pos + self._max_write]
+
+    def commit(self, num_bytes):
+        """
+        Makes the bytes written in the region returned by get_write_buffer() available to the consumer.
+
+        :param num_bytes: Is the number of bytes written.
+        :type: int
+
+        :return: None
+        """
+        if num_bytes < 0 or num_bytes > self._max_write:
+            raise ValueError("The number of committed bytes must be between 0 and the maximum write size!")
+
+        pos = self._written % self._capacity
+        end = pos + num_bytes
+        if end > self._capacity:
+            self._buf[:end - self._capacity] = self._buf[self._capacity:end]    # Wrap-around
+
+        self._written += num_bytes
+        self._data_event.set()
+
+    def write(self, samples):
+        """
+        Writes samples to the buffer (producer side).
+
+        :param samples: Are the samples to write (converted to the format of the buffer).
+        :type: np.ndarray
+
+        :return: True if the samples were written, or False if there was not enough free space (nothing is written).
+        :rtype: bool
+        """
+        data = np.ascontiguousarray(samples, dtype=self._dtype).view(np.uint8).ravel()
+
+        if len(data) > self.get_free():
+            return False
+
+        for i in range(0, len(data), self._max_write):
+            chunk = data[i:i + self._max_write]
+            pos = self._written % self._capacity
+            self._buf[pos:pos + len(chunk)] = chunk
+            self.commit(len(chunk))
+
+        return True
+
+    def read(self, num_samples, timeout=None):
+        """
+        Reads a block of samples from the buffer (consumer side).
+
+        :param num_samples: Is the number of samples to read.
+        :type: int
+
+        :param timeout: Is the maximum time to wait for the samples in seconds (None to wait forever).
+        :type: float
+
+        :return: The samples, or None if they were not available before the timeout.
+        :rtype: np.ndarray
+        """
+        if num_samples > self.get_size():
+            raise ValueError("The number of samples to read must not exceed the size of the ring buffer!")
+
+        num_bytes = num_samples*self._dtype.itemsize
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._written - self._read < num_bytes:
+            self._data_event.clear()
+            if self._written - self._read >= num_bytes:
+                break   # Written before clearing the event
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+
+            self._data_event.wait(remaining)
+
+        pos = self._read % self._capacity
+        end = pos + num_bytes
+        if end <= self._capacity:
+            data = self._buf[pos:end].copy()
+        else:
+            data = np.concatenate((self._buf[pos:self._capacity], self._buf[:end - self._capacity]))
+
+        self._read += num_bytes
+
+        return data.view(self._dtype)
+
+    def clear(self):
+        """
+        Discards all the samples not read yet (consumer side).
+
+        :return: None
+        """
+        self._read = self._written - (self._written - self._read) % self._dtype.itemsize
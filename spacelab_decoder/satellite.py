@@ -61,34 +61,43 @@ class Satellite:
         :return: None
         """
         with open(filename) as f:
-            sat_info = json.load(f)
-
-            if 'name' in sat_info:
-                self.set_name(sat_info['name'])
-            else:
-                raise RuntimeError("The satellite configuration file is corrupted!")
-
-            if 'links' in sat_info:
-                links = list()
-                for i in range(len(sat_info['links'])):
-                    link = Link()
-
-                    link.set_id(sat_info['links'][i]['id'])
-                    link.set_name(sat_info['links'][i]['name'])
-                    link.set_direction(sat_info['links'][i]['direction'])
-                    link.set_frequency(int(sat_info['links'][i]['frequency']))
-                    link.set_modulation(sat_info['links'][i]['modulation'])
-                    link.set_baudrate(sat_info['links'][i]['baudrate'])
-                    link.set_preamble(sat_info['links'][i]['preamble'])
-                    link.set_sync_word(sat_info['links'][i]['sync_word'])
-                    link.set_link_protocol(sat_info['links'][i]['protocol_link'])
-                    link.set_network_protocol(sat_info['links'][i]['protocol_network'])
-
-                    links.append(link)
-
-                self.set_links(links)
-            else:
-                raise RuntimeError("The satellite configuration file is corrupted!")
+            self.load_from_dict(json.load(f))
+
+    def load_from_dict(self, sat_info):
+        """
+        Loads the satellite parameters from a parsed configuration (the content of a JSON file).
+
+        :param sat_info: Is the satellite configuration.
+        :type: dict
+
+        :return: None
+        """
+        if 'name' in sat_info:
+            self.set_name(sat_info['name'])
+        else:
+            raise RuntimeError("The satellite configuration file is corrupted!")
+
+        if 'links' in sat_info:
+            links = list()
+            for i in range(len(sat_info['links'])):
+                link = Link()
+
+                link.set_id(sat_info['links'][i]['id'])
+                link.set_name(sat_info['links'][i]['name'])
+                link.set_direction(sat_info['links'][i]['direction'])
+                link.set_frequency(int(sat_info['links'][i]['frequency']))
+                link.set_modulation(sat_info['links'][i]['modulation'])
+                link.set_baudrate(sat_info['links'][i]['baudrate'])
+                link.set_preamble(sat_info['links'][i]['preamble'])
+                link.set_sync_word(sat_info['links'][i]['sync_word'])
+                link.set_link_protocol(sat_info['links'][i]['protocol_link'])
+                link.set_network_protocol(sat_info['links'][i]['protocol_network'])
+
+                links.append(link)
+
+            self.set_links(links)
+        else:
+            raise RuntimeError("The satellite configuration file is corrupted!")
 
     def set_name(self, name):
         """
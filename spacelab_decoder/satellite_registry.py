@@ -0,0 +1,252 @@
+#
+#  satellite_registry.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import glob
+import json
+import threading
+
+from spacelab_decoder.satellite import Satellite
+
+_SATELLITE_REGISTRY_LOCAL_PATH      = os.path.abspath(os.path.dirname(__file__)) + '/data/satellites/'
+_SATELLITE_REGISTRY_SYSTEM_PATH     = '/usr/share/spacelab_decoder/'
+
+_SATELLITE_REGISTRY_LINK_KEYS       = ['id', 'name', 'direction', 'frequency', 'modulation', 'baudrate', 'preamble', 'sync_word', 'protocol_link', 'protocol_network']
+_SATELLITE_REGISTRY_FIELD_KEYS      = ['id', 'name', 'conversion', 'unit']
+
+class _FrozenDict(dict):
+    """
+    Read-only dictionary (a copy or a pickled object is a regular dictionary).
+    """
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError("The satellite configuration is read-only!")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+class _FrozenList(list):
+    """
+    Read-only list (a copy or a pickled object is a regular list).
+    """
+    def _read_only(self, *args, **kwargs):
+        raise RuntimeError("The satellite configuration is read-only!")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def _freeze(obj):
+    if isinstance(obj, dict):
+        return _FrozenDict((key, _freeze(val)) for key, val in obj.items())
+    elif isinstance(obj, list):
+        return _FrozenList(_freeze(val) for val in obj)
+    else:
+        return obj
+
+class SatelliteRegistry:
+    """
+    Satellite configuration registry.
+
+    Each satellite configuration file is loaded and validated only once, and reloaded only when its modification
+    time (or size) changes. The parsed configurations are read-only and shared by all the users of the registry.
+    """
+    def __init__(self, paths=None):
+        """
+        Class constructor.
+
+        :param paths: Are the directories with the satellite configuration files, in order of priority.
+        :type: list[str]
+        """
+        self._paths = list()
+        self._configs = dict()  # Absolute file name -> (modification time, size, configuration)
+        self._lock = threading.Lock()
+
+        if paths is None:
+            paths = [_SATELLITE_REGISTRY_LOCAL_PATH, _SATELLITE_REGISTRY_SYSTEM_PATH]
+
+        self.set_paths(paths)
+
+    def set_paths(self, paths):
+        """
+        Sets the directories with the satellite configuration files.
+
+        :param paths: Are the directories, in order of priority.
+        :type: list[str]
+
+        :return: None
+        """
+        self._paths = list(paths)
+
+    def get_paths(self):
+        """
+        Gets the directories with the satellite configuration files.
+
+        :return: The directories, in order of priority.
+        :rtype: list[str]
+        """
+        return self._paths
+
+    def find(self, name):
+        """
+        Finds a satellite configuration file in the directories of the registry.
+
+        :param name: Is the name of the file (ex.: "golds-ufsc.json").
+        :type: str
+
+        :return: The path of the first file found.
+        :rtype: str
+        """
+        for path in self._paths:
+            filename = os.path.join(path, name)
+            if os.path.isfile(filename):
+                return filename
+
+        raise RuntimeError("The satellite configuration file \"" + name + "\" does not exist!")
+
+    def scan(self):
+        """
+        Loads all the satellite configuration files of the directories of the registry.
+
+        :return: The valid configuration files found (invalid files are skipped).
+        :rtype: list[str]
+        """
+        files = list()
+        names = set()
+        for path in self._paths:
+            for filename in sorted(glob.glob(os.path.join(path, "*.json"))):
+                if os.path.basename(filename) in names:
+                    continue    # The file of a directory with higher priority is used
+
+                try:
+                    self.get_config(filename)
+                except (RuntimeError, OSError, ValueError):
+                    continue
+
+                names.add(os.path.basename(filename))
+                files.append(filename)
+
+        return files
+
+    def get_config(self, filename):
+        """
+        Gets the configuration of a satellite.
+
+        :param filename: Is the satellite configuration file.
+        :type: str
+
+        :return: The read-only content of the configuration file.
+        :rtype: dict
+        """
+        filename = os.path.abspath(filename)
+        stat = os.stat(filename)
+
+        entry = self._configs.get(filename)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            with open(filename) as f:
+                config = json.load(f)
+
+            self._validate(config)
+
+            entry = (stat.st_mtime_ns, stat.st_size, _freeze(config))
+
+            with self._lock:
+                self._configs[filename] = entry
+
+        return entry[2]
+
+    def get_satellite(self, filename):
+        """
+        Gets a satellite object from a configuration file.
+
+        :param filename: Is the satellite configuration file.
+        :type: str
+
+        :return: A new satellite object (only the parsed configuration is shared).
+        :rtype: Satellite
+        """
+        sat = Satellite()
+        sat.load_from_dict(self.get_config(filename))
+
+        return sat
+
+    def clear(self):
+        """
+        Clears all the loaded configurations.
+
+        :return: None
+        """
+        with self._lock:
+            self._configs.clear()
+
+    def _validate(self, config):
+        if not isinstance(config, dict) or not isinstance(config.get('name'), str) or not isinstance(config.get('links'), list):
+            raise RuntimeError("The satellite configuration file is corrupted!")
+
+        for link in config['links']:
+            if not isinstance(link, dict) or any(key not in link for key in _SATELLITE_REGISTRY_LINK_KEYS):
+                raise RuntimeError("The satellite configuration file is corrupted!")
+
+            for pkt_type in link.get('types', list()):
+                if not isinstance(pkt_type, dict) or 'name' not in pkt_type or not isinstance(pkt_type.get('fields'), list):
+                    raise RuntimeError("The satellite configuration file is corrupted!")
+
+                for field in pkt_type['fields']:
+                    if not isinstance(field, dict) or any(key not in field for key in _SATELLITE_REGISTRY_FIELD_KEYS):
+                        raise RuntimeError("The satellite configuration file is corrupted!")
+
+_satellite_registry = SatelliteRegistry()
+
+def get_satellite_registry():
+    """
+    Gets the satellite registry shared by the whole process.
+
+    :return: The satellite registry.
+    :rtype: SatelliteRegistry
+    """
+    return _satellite_registry
+
+def find_sat_config(sat_config):
+    """
+    Finds a satellite configuration file given in the command line.
+
+    :param sat_config: Is the path of the file, or the name of a file of the satellite registry (with or without the
+    ".json" extension, ex.: "golds-ufsc").
+    :type: str
+
+    :return: The path of the file.
+    :rtype: str
+    """
+    if os.path.isfile(sat_config):
+        return sat_config
+
+    if not sat_config.endswith(".json"):
+        sat_config = sat_config + ".json"
+
+    return get_satellite_registry().find(sat_config)
@@ -51,7 +51,14 @@ from spacelab_decoder.bit_decoder import BitDecoder
 from spacelab_decoder.packet import PacketSLP, PacketCSP
 from spacelab_decoder.ax100 import AX100Mode5
 from spacelab_decoder.satellite import Satellite
-from spacelab_decoder.log import Log
+from spacelab_decoder.satellite_registry import get_satellite_registry
+from spacelab_decoder.log import BufferedLog
+from spacelab_decoder.event_log import EventLog, _EVENT_LOG_PACKET, _EVENT_LOG_ERROR, _EVENT_LOG_MESSAGE
+from spacelab_decoder.wav_reader import WavReader
+from spacelab_decoder.ring_buffer import RingBuffer
+from spacelab_decoder.udp_receiver import UdpReceiver
+from spacelab_decoder.stream_input import StreamInput
+from spacelab_decoder.frame_parser import get_frame_parser
 
 _UI_FILE_LOCAL                  = os.path.abspath(os.path.dirname(__file__)) + '/data/ui/spacelab_decoder.glade'
 _UI_FILE_LINUX_SYSTEM           = '/usr/share/spacelab_decoder/spacelab_decoder.glade'
@@ -75,6 +82,10 @@ _DEFAULT_SYNC_WORD_BIT_ERROR    = 4
 _DEFAULT_AX100_USE_LEN_ERR      = False
 _DEFAULT_INPUT_SOCKET_TYPE_TCP  = True
 _DEFAULT_INPUT_SOCKET_LINK_EN   = True
+_DEFAULT_STREAM_SAMPLE_RATE     = 48000
+_DEFAULT_STREAM_FORMAT          = 'int16'
+_DEFAULT_STREAM_BLOCK_SIZE      = 2048      # Samples (about 43 ms at 48 kHz), only affects the latency
+_DEFAULT_TCP_FRAMING            = 'length'
 
 _DIR_CONFIG_DEFAULTJSON         = 'spacelab_decoder.json'
 
@@ -82,6 +93,7 @@ _DIR_CONFIG_DEFAULTJSON         = 'spacelab_decoder.json'
 _DIR_CONFIG_LOGFILE_LINUX       = 'spacelab_decoder'
 _DEFAULT_LOGFILE_PATH           = os.path.join(os.path.expanduser('~'), _DIR_CONFIG_LOGFILE_LINUX)
 _DEFAULT_LOGFILE                = 'logfile.csv'
+_DEFAULT_EVENT_LOG_DIR          = 'events'      # Inside the logfile directory
 
 _SATELLITES                     = [["FloripaSat-1", "floripasat-1.json"],
                                    ["FloripaSat-2A", "floripasat-2a.json"],
@@ -94,6 +106,10 @@ _SATELLITES                     = [["FloripaSat-1", "floripasat-1.json"],
 _PROTOCOL_NGHAM                 = "NGHam"
 _PROTOCOL_AX100MODE5            = "AX100-Mode5"
 
+_UDP_RING_BUFFER_SIZE           = 2**20     # Samples (about 20 seconds at 48 kHz)
+_UDP_READ_TIMEOUT_SEC           = 1
+_TCP_RECV_SIZE                  = 65536     # Bytes
+
 class SpaceLabDecoder:
 
     def __init__(self):
@@ -123,11 +139,14 @@ class SpaceLabDecoder:
 
         self._zmq_ctx = zmq.Context()
         self._zmq_sub = None
+        self._zmq_ngham = None
+        self._zmq_ax100 = None
         self._zmq_new_conn_cb_id = None
 
         self._satellite = Satellite()
 
-        self._log = Log(_DEFAULT_LOGFILE, _DEFAULT_LOGFILE_PATH)
+        self._log = BufferedLog(_DEFAULT_LOGFILE, _DEFAULT_LOGFILE_PATH, background=True)  # Written by a background thread
+        self._event_log = EventLog(os.path.join(_DEFAULT_LOGFILE_PATH, _DEFAULT_EVENT_LOG_DIR))
 
         self._packet_csp_buf = PacketCSP()
 
@@ -163,6 +182,11 @@ class SpaceLabDecoder:
 
         self.switch_preferences_conn_link_layer = self.builder.get_object("switch_preferences_conn_link_layer")
 
+        self.entry_preferences_stream_sample_rate = self.builder.get_object("entry_preferences_stream_sample_rate")
+        self.combobox_preferences_stream_format = self.builder.get_object("combobox_preferences_stream_format")
+        self.entry_preferences_stream_block_size = self.builder.get_object("entry_preferences_stream_block_size")
+        self.combobox_preferences_tcp_framing = self.builder.get_object("combobox_preferences_tcp_framing")
+
         self.entry_preferences_udp_address = self.builder.get_object("entry_preferences_udp_address")
         self.entry_preferences_udp_port = self.builder.get_object("entry_preferences_udp_port")
         self.switch_raw_bits = self.builder.get_object("switch_raw_bits")
@@ -251,17 +275,26 @@ class SpaceLabDecoder:
         self.selection_events = self.treeview_events.get_selection()
         self.selection_events.connect("changed", self.on_events_selection_changed)
 
-    def write_log(self, msg):
-        event = [str(datetime.now()), msg]
+    def write_log(self, msg, event_type=_EVENT_LOG_MESSAGE, **fields):
+        tm_now = datetime.now()
+        event = [str(tm_now), msg]
 
         self.listmodel_events.append(event)
 
         self._log.write(msg, event[0])
 
+        # The same event as a structured record (the message, and the fields of the decoded packet or of the error)
+        link = self._satellite.get_active_link()
+        self._event_log.write(event_type, self._satellite.get_name(), "" if link is None else link.get_id(), tm_now.astimezone(), message=msg, **fields)
+
     def run(self):
         self.window.show_all()
 
-        Gtk.main()
+        try:
+            Gtk.main()
+        finally:
+            self._log.close()
+            self._event_log.close()
 
     def destroy(window, self):
         if self._client_socket:
@@ -306,7 +339,8 @@ class SpaceLabDecoder:
                     error_dialog.run()
                     error_dialog.destroy()
                 else:
-                    sample_rate, data = wavfile.read(self.filechooser_audio_file.get_filename())
+                    with WavReader(self.filechooser_audio_file.get_filename()) as reader:
+                        sample_rate = reader.get_sample_rate()
                     wav_filename = self.filechooser_audio_file.get_filename()
                     self.write_log("Audio file opened with a sample rate of " + str(sample_rate) + " Hz")
 
@@ -347,8 +381,22 @@ class SpaceLabDecoder:
                     link_name = self._satellite.get_active_link().get_name()
 
                     if self.switch_raw_bits.get_active():
-                        thread_decode = threading.Thread(target=self._decode_stream, args=(address, int(port), baudrate, sync_word, protocol, link_name,))
-                        thread_decode.start()
+                        try:
+                            stream_input = StreamInput(baudrate,
+                                                       int(self.entry_preferences_stream_sample_rate.get_text()),
+                                                       self.combobox_preferences_stream_format.get_active_id(),
+                                                       int(self.entry_preferences_stream_block_size.get_text()))
+                        except ValueError as e:
+                            error_dialog = Gtk.MessageDialog(None, 0, Gtk.MessageType.ERROR, Gtk.ButtonsType.OK, "Invalid stream input configuration!")
+                            error_dialog.format_secondary_text(str(e))
+                            error_dialog.run()
+                            error_dialog.destroy()
+                            self._stop_decoding()
+                        else:
+                            self.write_log("Stream input: " + str(stream_input))
+
+                            thread_decode = threading.Thread(target=self._decode_stream, args=(address, int(port), stream_input, sync_word, protocol, link_name,))
+                            thread_decode.start()
                     else:
                         if self.radiobutton_preferences_conn_tcp.get_active():
                             self._tcp_server_socket = self._create_socket_server(address, int(port))
@@ -364,6 +412,11 @@ class SpaceLabDecoder:
 
                             self._zmq_sub.connect("tcp://" + address + ":" + port)
 
+                            # The link layer decoders are reused by all the messages of the subscription
+                            self._zmq_ngham = pyngham.PyNGHam()
+                            self._zmq_ax100 = AX100Mode5()
+                            self._zmq_ax100.set_ignore_golay_error(self.checkbutton_preferences_protocols_ax100_len.get_active())
+
                             self._zmq_sub.setsockopt(zmq.SUBSCRIBE, bytes([10]))
 
                             # Add watch to GLib main loop
@@ -460,7 +513,7 @@ class SpaceLabDecoder:
 
     def on_combobox_satellite_changed(self, combobox):
         try:
-            self._satellite.load_from_file(self._get_json_filename_of_active_sat())
+            self._satellite = get_satellite_registry().get_satellite(self._get_json_filename_of_active_sat())
 
             self.liststore_link.clear()  # Clear the list of packet types
 
@@ -536,6 +589,10 @@ class SpaceLabDecoder:
                        "ax100_use_len_field_with_err":      self.checkbutton_preferences_protocols_ax100_len.get_active(),
                        "input_socket_type_tcp":             self.radiobutton_preferences_conn_tcp.get_active(),
                        "input_socket_link_layer_enabled":   self.switch_preferences_conn_link_layer.get_active(),
+                       "stream_sample_rate":                self.entry_preferences_stream_sample_rate.get_text(),
+                       "stream_sample_format":              self.combobox_preferences_stream_format.get_active_id(),
+                       "stream_block_size":                 self.entry_preferences_stream_block_size.get_text(),
+                       "input_tcp_framing":                 self.combobox_preferences_tcp_framing.get_active_id(),
                        "logfile_path":                      self.logfile_chooser_button.get_filename()}, f, ensure_ascii=False, indent=4)
 
     def _load_preferences(self):
@@ -561,6 +618,11 @@ class SpaceLabDecoder:
             else:
                 self.radiobutton_preferences_conn_zmq.set_active(True)
             self.switch_preferences_conn_link_layer.set_active(config["input_socket_link_layer_enabled"])
+            # Stream settings added in later versions (older preference files do not have them)
+            self.entry_preferences_stream_sample_rate.set_text(config.get("stream_sample_rate", str(_DEFAULT_STREAM_SAMPLE_RATE)))
+            self.combobox_preferences_stream_format.set_active_id(config.get("stream_sample_format", _DEFAULT_STREAM_FORMAT))
+            self.entry_preferences_stream_block_size.set_text(config.get("stream_block_size", str(_DEFAULT_STREAM_BLOCK_SIZE)))
+            self.combobox_preferences_tcp_framing.set_active_id(config.get("input_tcp_framing", _DEFAULT_TCP_FRAMING))
             self.logfile_chooser_button.set_filename(config["logfile_path"])
         except:
             self._load_default_preferences()
@@ -574,39 +636,50 @@ class SpaceLabDecoder:
         self.checkbutton_preferences_protocols_ax100_len.set_active(_DEFAULT_AX100_USE_LEN_ERR)
         self.radiobutton_preferences_conn_tcp.set_active(_DEFAULT_INPUT_SOCKET_TYPE_TCP)
         self.switch_preferences_conn_link_layer.set_active(_DEFAULT_INPUT_SOCKET_LINK_EN)
+        self.entry_preferences_stream_sample_rate.set_text(str(_DEFAULT_STREAM_SAMPLE_RATE))
+        self.combobox_preferences_stream_format.set_active_id(_DEFAULT_STREAM_FORMAT)
+        self.entry_preferences_stream_block_size.set_text(str(_DEFAULT_STREAM_BLOCK_SIZE))
+        self.combobox_preferences_tcp_framing.set_active_id(_DEFAULT_TCP_FRAMING)
         self.logfile_chooser_button.set_filename(_DEFAULT_LOGFILE_PATH)
 
     def _decode_audio(self, audio_file, baud, sync_word, protocol, link_name):
-        sample_rate, data = wavfile.read(audio_file)
+        reader = WavReader(audio_file)  # The first channel is read in blocks (stereo files are converted to mono)
 
-        samples = list()
+        mm = TimeSync(reader.get_sample_rate(), baud)
 
-        # Convert stereo to mono by reading only the first channel
-        if data.ndim > 1:
-            for i in range(len(data)):
-                samples.append(data[i][0])
-        else:
-            samples = data
+        sync_word = sync_word.copy()
+        sync_word.reverse()
 
-        mm = TimeSync(sample_rate, baud)
+        bit_decoder = BitDecoder(sync_word, int(self.entry_preferences_max_bit_err.get_text()), inverted=True)
 
         try:
             if protocol == _PROTOCOL_NGHAM:
-                self._find_ngham_pkts(mm.get_bitstream(samples), sync_word, link_name)
+                self._find_ngham_pkts(self._get_audio_frames(reader, mm, bit_decoder), link_name)
             elif protocol == _PROTOCOL_AX100MODE5:
-                self._find_ax100mode5_pkts(mm.get_bitstream(samples), sync_word, link_name)
+                self._find_ax100mode5_pkts(self._get_audio_frames(reader, mm, bit_decoder), link_name)
             else:
                 raise RuntimeError("The protocol \"" + protocol + "\" is not supported!")
         except RuntimeError as err:
-            self.write_log("Error decoding audio file: " + str(err))
+            self.write_log("Error decoding audio file: " + str(err), _EVENT_LOG_ERROR, error=str(err))
+        finally:
+            reader.close()
 
-    def _decode_stream(self, address, port, baud, sync_word, protocol, link_name):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) # UDP
-        sock.settimeout(1)
-        sock.bind((address, port))
+    def _get_audio_frames(self, reader, mm, bit_decoder):
+        for block in reader:
+            yield from bit_decoder.decode_candidates(mm.decode_stream(block, soft=True), final=False)
 
-        mm = TimeSync(48000, baud)
+        yield from bit_decoder.decode_candidates([], final=True)
 
+    def _decode_stream(self, address, port, stream_input, sync_word, protocol, link_name):
+        # The datagrams are received by a dedicated thread, and this thread only runs the DSP and the decoding
+        ring_buffer = RingBuffer(_UDP_RING_BUFFER_SIZE, stream_input.get_dtype())
+        receiver = UdpReceiver(address, port, ring_buffer)
+        receiver.start()
+
+        # The stream is resampled to the lowest sample rate that the clock recovery can work with
+        mm = TimeSync(stream_input.get_output_sample_rate(), stream_input.get_baudrate())
+
+        sync_word = sync_word.copy()
         sync_word.reverse()
 
         bit_decoder = BitDecoder(sync_word, int(self.entry_preferences_max_bit_err.get_text()))
@@ -617,113 +690,128 @@ class SpaceLabDecoder:
         if self.checkbutton_preferences_protocols_ax100_len.get_active():
             ax100.set_ignore_golay_error(True)
 
-        samples_buf = list()
         while self._run_udp_decode:
+            samples = ring_buffer.read(stream_input.get_block_size(), _UDP_READ_TIMEOUT_SEC)    # TimeSync keeps its state between blocks
+            if samples is None:
+                continue
+
             try:
-                samples_raw, addr = sock.recvfrom(1024)    # Buffer size is 1024 bytes
-                samples_buf += np.frombuffer(bytes(samples_raw), dtype=np.int16).tolist()    # Convert the input bytes to int16 samples
-
-                if len(samples_buf) >= 300*(48000/baud)*8*2:    # Approximately 300 bytes in samples
-                    bitstream = mm.decode_stream(samples_buf)
-                    samples_buf.clear()
-                    for b in bitstream:
-                        decoded_byte = bit_decoder.decode_bit(b)
-                        if type(decoded_byte) is int:
-                            if protocol == _PROTOCOL_NGHAM:
-                                pl, err, err_loc = ngham.decode_byte(decoded_byte)
-                                if len(pl) == 0:
-                                    if err == -1:
-                                        bit_decoder.reset()
-                                        self.write_log("Error decoding a " + link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + "!")
-                                else:
+                bitstream = mm.decode_stream(stream_input.process(samples))
+                for b in bitstream:
+                    decoded_byte = bit_decoder.decode_bit(b)
+                    if type(decoded_byte) is int:
+                        if protocol == _PROTOCOL_NGHAM:
+                            pl, err, err_loc = ngham.decode_byte(decoded_byte)
+                            if len(pl) == 0:
+                                if err == -1:
                                     bit_decoder.reset()
+                                    self.write_log("Error decoding a " + link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + "!", _EVENT_LOG_ERROR)
+                            else:
+                                bit_decoder.reset()
 
-                                    tm_now = datetime.now()
-                                    self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
-                                    self.write_log(link_name + " packet from " + self._satellite.get_name() + " decoded!")
+                                tm_now = datetime.now()
+                                self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
+                                self.write_log(link_name + " packet from " + self._satellite.get_name() + " decoded!", _EVENT_LOG_PACKET, raw=bytes(pl).hex(), rs_errors=err)
 
-                                    self._decode_packet(pl)
-                            elif protocol == _PROTOCOL_AX100MODE5:
-                                pl = ax100.decode_byte(decoded_byte)
-                                if type(pl) is list:
-                                    bit_decoder.reset()
+                                self._decode_packet(pl)
+                        elif protocol == _PROTOCOL_AX100MODE5:
+                            pl = ax100.decode_byte(decoded_byte)
+                            if type(pl) is list:
+                                bit_decoder.reset()
+
+                                golay_err, rs_err = ax100.get_errors()
 
-                                    tm_now = datetime.now()
-                                    self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
-                                    self.write_log(link_name + " packet from " + self._satellite.get_name() + " decoded!")
+                                tm_now = datetime.now()
+                                self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
+                                self.write_log(link_name + " packet from " + self._satellite.get_name() + " decoded!", _EVENT_LOG_PACKET, raw=bytes(pl).hex(), golay_errors=golay_err, rs_errors=rs_err)
 
-                                    self._decode_packet(pl)
+                                self._decode_packet(pl)
 
-                                    ax100.reset_decoder()
+                                ax100.reset_decoder()
             except RuntimeError as e:
                 bit_decoder.reset()
                 ax100.reset_decoder()
-                self.write_log("Error decoding a " + link_name + " packet from " + self._satellite.get_name() + ": " + str(e))
-            except socket.timeout:
-                pass
+                self.write_log("Error decoding a " + link_name + " packet from " + self._satellite.get_name() + ": " + str(e), _EVENT_LOG_ERROR, error=str(e))
 
-        sock.close()
+        receiver.stop()
 
-    def _find_ngham_pkts(self, bitstream, sync_word, link_name):
-        sync_word.reverse()
-
-        bit_decoder = BitDecoder(sync_word, int(self.entry_preferences_max_bit_err.get_text()))
+        self.write_log("UDP input: " + str(receiver.get_datagrams()) + " datagram(s) received, " + str(receiver.get_overruns()) + " overrun(s), " + str(receiver.get_dropped_samples()) + " sample(s) dropped")
 
+    def _find_ngham_pkts(self, candidates, link_name):
         ngham = pyngham.PyNGHam()
 
-        for b in bitstream:
-            decoded_byte = bit_decoder.decode_bit(b)
-            if type(decoded_byte) is int:
-                pl, err, err_loc = ngham.decode_byte(decoded_byte)
+        busy_until = 0  # The candidates inside a decoded packet are false sync words
+        for pos, frame, sync_err, inverted, erasures in candidates:
+            if pos < busy_until:
+                continue
+
+            for i in range(len(frame)):
+                pl, err, err_loc = ngham.decode_byte(frame[i])
                 if len(pl) == 0:
                     if err == -1:
-                        bit_decoder.reset()
-                        self.write_log("Error decoding a " + link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + "!")
+                        if not inverted:    # Inverted sync words are only logged when decoded
+                            self.write_log("Error decoding a " + link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + "!", _EVENT_LOG_ERROR)
+                        break
                 else:
-                    bit_decoder.reset()
+                    busy_until = pos + 8*(i + 1)
+
                     tm_now = datetime.now()
                     self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
-                    self.write_log(link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + " decoded!")
+                    self.write_log(link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + " decoded!", _EVENT_LOG_PACKET, raw=bytes(pl).hex(), rs_errors=err)
                     self._decode_packet(pl)
+                    break
+            else:
+                ngham = pyngham.PyNGHam()   # The frame ended in the middle of a packet, the next one starts from a clean decoder
 
-    def _find_ax100mode5_pkts(self, bitstream, sync_word, link_name):
-        sync_word.reverse()
-
-        bit_decoder = BitDecoder(sync_word, int(self.entry_preferences_max_bit_err.get_text()))
-
+    def _find_ax100mode5_pkts(self, candidates, link_name):
         ax100 = AX100Mode5()
 
         if self.checkbutton_preferences_protocols_ax100_len.get_active():
             ax100.set_ignore_golay_error(True)
 
-        for b in bitstream:
-            decoded_byte = bit_decoder.decode_bit(b)
-            if type(decoded_byte) is int:
-                pl = ax100.decode_byte(decoded_byte)
-                if type(pl) is list:
-                    self._decode_packet(pl)
+        busy_until = 0  # The candidates inside a decoded packet are false sync words
+        for pos, frame, sync_err, inverted, erasures in candidates:
+            if pos < busy_until:
+                continue
 
-                    # Write event log
-                    tm_now = datetime.now()
-                    self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
-                    self.write_log(link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + " decoded!")
+            # The length is read from the header, and the whole packet is decoded at once (with the low-confidence bytes as erasures)
+            try:
+                pl = ax100.decode_frame(frame, erasures)
+            except RuntimeError as e:
+                if not inverted:    # Inverted sync words are only logged when decoded
+                    self.write_log("Error decoding a " + link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + ": " + str(e), _EVENT_LOG_ERROR, error=str(e))
+                continue
+
+            if pl is not None:
+                busy_until = pos + 8*(3 + len(pl) + 32)     # Length field, payload and Reed-Solomon parity
+
+                golay_err, rs_err = ax100.get_errors()
+
+                self._decode_packet(pl)
 
-                    ax100.reset_decoder()
+                # Write event log
+                tm_now = datetime.now()
+                self.decoded_packets_index.append(self.textbuffer_pkt_data.create_mark(str(tm_now), self.textbuffer_pkt_data.get_end_iter(), True))
+                self.write_log(link_name + " packet from " + _SATELLITES[self.combobox_satellite.get_active()][0] + " decoded!", _EVENT_LOG_PACKET, raw=bytes(pl).hex(), golay_errors=golay_err, rs_errors=rs_err)
 
     def _decode_packet(self, pkt):
         try:
             pkt_data = str()
             pkt_json = str()
             sat_json = self._get_json_filename_of_active_sat()
+            record = None
             if self._satellite.get_active_link().get_network_protocol() == "CSP":
                 self._packet_csp_buf.set_config(sat_json)
                 self._packet_csp_buf.set_pkt(pkt)
-                pkt_data = str(self._packet_csp_buf)
-                pkt_json = self._packet_csp_buf.get_data()
+                record = self._packet_csp_buf.decode()
             elif self._satellite.get_active_link().get_network_protocol() == "SLP":
-                pkt_sl = PacketSLP(sat_json, pkt)
-                pkt_data = str(pkt_sl)
-                pkt_json = pkt_sl.get_data()
+                record = PacketSLP(sat_json, pkt).decode()
+
+            if record is not None:
+                pkt_data = str(record)
+                pkt_json = record.to_json()
+            else:
+                pkt_json = json.dumps(dict())   # Fragment of a data request
         except RuntimeError as e:
             error_dialog = Gtk.MessageDialog(None, 0, Gtk.MessageType.ERROR, Gtk.ButtonsType.OK, "Error decoding a packet!")
             error_dialog.format_secondary_text(str(e))
@@ -782,31 +870,34 @@ class SpaceLabDecoder:
             client_socket, address = self._tcp_server_socket.accept()
             self.write_log("TCP client connected!")
 
+            # Each connection has its own frame parser and link layer decoders
+            parser = get_frame_parser(self.combobox_preferences_tcp_framing.get_active_id())
+            ngham = pyngham.PyNGHam()
+            ax100 = AX100Mode5()
+
+            if self.checkbutton_preferences_protocols_ax100_len.get_active():
+                ax100.set_ignore_golay_error(True)
+
             # Create an IOChannel for the client socket to handle incoming data
             client_io_channel = GLib.IOChannel(client_socket.fileno())
             client_io_channel.set_encoding(None)  # Binary mode (important for raw data)
 
             # Monitor the client socket for incoming data
-            self._tcp_client_cb_id = GLib.io_add_watch(client_io_channel, GLib.IO_IN, self._handle_tcp_client_data, client_socket)
+            self._tcp_client_cb_id = GLib.io_add_watch(client_io_channel, GLib.IO_IN, self._handle_tcp_client_data, client_socket, parser, ngham, ax100)
 
         return True  # Keep the handler active
 
-    def _handle_tcp_client_data(self, source, condition, client_socket):
+    def _handle_tcp_client_data(self, source, condition, client_socket, parser, ngham, ax100):
         """Handle incoming data from the client"""
         if condition == GLib.IO_IN:
             try:
-                data = client_socket.recv(1024)  # Read incoming data (max 1024 bytes)
+                data = client_socket.recv(_TCP_RECV_SIZE)
                 if data:
-                    if protocol == _PROTOCOL_NGHAM:
-                        ngham = pyngham.PyNGHam()
-                        pl, err, err_loc = ngham.decode(data)
-                        self._decode_packet(pl)
-                    elif protocol == _PROTOCOL_AX100MODE5:
-                        # TODO
-                        #self._decode_packet(pl)
-                        pass
-                    else:
-                        self.write_log("Unknown protocol received from TCP client!")
+                    # The frames can be split or coalesced by TCP, so they are delimited by the framing
+                    for frame in parser.feed(data):
+                        pl = self._decode_link_frame(frame, ngham, ax100)
+                        if pl is not None:
+                            self._decode_packet(pl)
                 else:
                     # Connection closed by client
                     self.write_log("TCP connection closed by client!")
@@ -823,28 +914,42 @@ class SpaceLabDecoder:
 
         return True  # Keep the handler active
 
-    def _handle_zmq_message(self, source, condition):
-        """Callback for ZMQ messages"""
+    def _decode_link_frame(self, frame, ngham, ax100):
+        """Decode a frame received from a socket (returns None if it can not be decoded)"""
         protocol = self._satellite.get_active_link().get_link_protocol()
+        link_name = self._satellite.get_active_link().get_name()
 
+        if not self.switch_preferences_conn_link_layer.get_active():
+            return list(frame)  # The frame is the packet payload
+
+        try:
+            if protocol == _PROTOCOL_NGHAM:
+                pl, err, err_loc = ngham.decode(list(frame))
+                if err == -1 or len(pl) == 0:
+                    raise RuntimeError("Impossible to decode the NGHam frame!")
+            elif protocol == _PROTOCOL_AX100MODE5:
+                pl = ax100.decode(list(frame)[len(self._satellite.get_active_link().get_preamble()) + len(self._satellite.get_active_link().get_sync_word()):])
+            else:
+                self.write_log("The protocol \"" + protocol + "\" is not supported!", _EVENT_LOG_ERROR)
+                return None
+        except RuntimeError as e:
+            self.write_log("Error decoding a " + link_name + " packet from " + self._satellite.get_name() + ": " + str(e), _EVENT_LOG_ERROR, error=str(e))
+            return None
+
+        return pl
+
+    def _handle_zmq_message(self, source, condition):
+        """Callback for ZMQ messages"""
         while True:
             try:
                 data = self._zmq_sub.recv(flags=zmq.NOBLOCK)
 
-                pl = list(data)[1:].copy()
+                if not self.switch_preferences_conn_link_layer.get_active():
+                    data = data[1:]     # The payload messages start with a header byte
 
-                if protocol == _PROTOCOL_NGHAM:
-                    if self.switch_preferences_conn_link_layer.get_active():
-                        ngham = pyngham.PyNGHam()
-                        pl, err, err_loc = ngham.decode(list(data))
-                    self._decode_packet(pl)
-                elif protocol == _PROTOCOL_AX100MODE5:
-                    if self.switch_preferences_conn_link_layer.get_active():
-                        ax100 = AX100Mode5()
-                        pl = ax100.decode(list(data)[len(self._satellite.get_active_link().get_preamble()) + 4:])
+                pl = self._decode_link_frame(data, self._zmq_ngham, self._zmq_ax100)
+                if pl is not None:
                     self._decode_packet(pl)
-                else:
-                    self.write_log("Unknown protocol received from ZMQ socket!")
             except zmq.Again:
                 break;
             except Exception as e:
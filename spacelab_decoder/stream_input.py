@@ -0,0 +1,238 @@
+#
+#  stream_input.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import numpy as np
+
+from spacelab_decoder.resampler import Resampler
+
+_STREAM_INPUT_FORMATS               = {'int16': np.int16, 'float32': np.float32, 'complex64': np.complex64}
+
+_STREAM_INPUT_DEFAULT_SAMPLE_RATE   = 48000
+_STREAM_INPUT_DEFAULT_FORMAT        = 'int16'
+_STREAM_INPUT_DEFAULT_BLOCK_SIZE    = 2048      # Samples
+_STREAM_INPUT_MIN_SPS               = 8         # Lowest samples per symbol with a reliable clock recovery
+
+class StreamInput:
+    """
+    Stream input.
+
+    Holds the configuration of a samples stream (sample rate, sample format and block size) and converts the received
+    blocks to the samples given to the demodulator: complex (I/Q) samples are FM demodulated and changed by a polyphase
+    resampler to the lowest rate with enough samples per symbol (its low-pass filter removes the wideband noise of the
+    quadrature demodulator). Real (audio) samples are only resampled if they have too few samples per symbol, otherwise
+    they are given to the demodulator as they are.
+    """
+    def __init__(self, baudrate, sample_rate=_STREAM_INPUT_DEFAULT_SAMPLE_RATE, sample_format=_STREAM_INPUT_DEFAULT_FORMAT, block_size=_STREAM_INPUT_DEFAULT_BLOCK_SIZE):
+        """
+        Class constructor.
+
+        :param baudrate: Is the baudrate of the link in bps.
+        :type: int
+
+        :param sample_rate: Is the sample rate of the stream in Hertz.
+        :type: int
+
+        :param sample_format: Is the format of the samples ("int16", "float32" or "complex64").
+        :type: str
+
+        :param block_size: Is the number of samples of each processed block.
+        :type: int
+        """
+        self._baudrate = 0
+        self._sample_rate = 0
+        self._sample_format = _STREAM_INPUT_DEFAULT_FORMAT
+        self._block_size = 0
+        self._resampler = None
+        self._last = np.complex64(1)
+
+        self.set_baudrate(baudrate)
+        self.set_sample_rate(sample_rate)
+        self.set_sample_format(sample_format)
+        self.set_block_size(block_size)
+
+    def __str__(self):
+        """
+        Text representation of the stream input.
+
+        :return: A text description of the stream configuration.
+        :rtype: str
+        """
+        return str(self._sample_rate) + " Hz, " + self._sample_format + ", blocks of " + str(self._block_size) + " samples, demodulated at " + str(self.get_output_sample_rate()) + " Hz"
+
+    def set_sample_rate(self, sample_rate):
+        """
+        Sets the sample rate of the stream.
+
+        :param sample_rate: Is the sample rate in Hertz.
+        :type: int
+
+        :return: None
+        """
+        if int(sample_rate) <= 0:
+            raise ValueError("The sample rate must be greater than zero!")
+
+        self._sample_rate = int(sample_rate)
+        self._resampler = None  # Created again with the new sample rate
+
+    def get_sample_rate(self):
+        """
+        Gets the sample rate of the stream.
+
+        :return: The sample rate in Hertz.
+        :rtype: int
+        """
+        return self._sample_rate
+
+    def set_baudrate(self, baudrate):
+        """
+        Sets the baudrate of the link.
+
+        :param baudrate: Is the baudrate in bps.
+        :type: int
+
+        :return: None
+        """
+        if int(baudrate) <= 0:
+            raise ValueError("The baudrate must be greater than zero!")
+
+        self._baudrate = int(baudrate)
+        self._resampler = None  # Created again with the new output sample rate
+
+    def get_baudrate(self):
+        """
+        Gets the baudrate of the link.
+
+        :return: The baudrate in bps.
+        :rtype: int
+        """
+        return self._baudrate
+
+    def get_output_sample_rate(self):
+        """
+        Gets the sample rate of the samples given to the demodulator.
+
+        :return: The sample rate in Hertz.
+        :rtype: int
+        """
+        if self.is_resampled():
+            return self._baudrate*_STREAM_INPUT_MIN_SPS
+
+        return self._sample_rate
+
+    def is_resampled(self):
+        """
+        Checks if the stream is resampled before the demodulator.
+
+        :return: True if the stream has complex samples, or too few samples per symbol.
+        :rtype: bool
+        """
+        return self.get_dtype().kind == 'c' or self._sample_rate < self._baudrate*_STREAM_INPUT_MIN_SPS
+
+    def set_sample_format(self, sample_format):
+        """
+        Sets the format of the samples.
+
+        :param sample_format: Is the sample format ("int16", "float32" or "complex64").
+        :type: str
+
+        :return: None
+        """
+        if sample_format not in _STREAM_INPUT_FORMATS:
+            raise ValueError("The sample format must be one of: " + ", ".join(_STREAM_INPUT_FORMATS) + "!")
+
+        self._sample_format = sample_format
+
+    def get_sample_format(self):
+        """
+        Gets the format of the samples.
+
+        :return: The sample format.
+        :rtype: str
+        """
+        return self._sample_format
+
+    def get_dtype(self):
+        """
+        Gets the NumPy type of the samples.
+
+        :return: The type of the samples of the stream.
+        :rtype: np.dtype
+        """
+        return np.dtype(_STREAM_INPUT_FORMATS[self._sample_format])
+
+    def set_block_size(self, block_size):
+        """
+        Sets the number of samples of each processed block.
+
+        :param block_size: Is the block size in samples.
+        :type: int
+
+        :return: None
+        """
+        if int(block_size) < 1:
+            raise ValueError("The block size must be greater than zero!")
+
+        self._block_size = int(block_size)
+
+    def get_block_size(self):
+        """
+        Gets the number of samples of each processed block.
+
+        :return: The block size in samples.
+        :rtype: int
+        """
+        return self._block_size
+
+    def process(self, samples):
+        """
+        Converts a block of the stream to samples for the demodulator.
+
+        :param samples: Is the block of samples, in the format of the stream.
+        :type: np.ndarray
+
+        :return: The real samples at the output sample rate (the same block if it is not demodulated or resampled).
+        :rtype: np.ndarray
+        """
+        samples = np.asarray(samples)
+
+        if np.iscomplexobj(samples) and len(samples) > 0:
+            # Quadrature demodulation: phase difference between consecutive samples
+            prev = np.concatenate(([self._last], samples[:-1]))
+            self._last = samples[-1]
+            samples = np.angle(samples*np.conj(prev))
+
+        if not self.is_resampled():
+            return samples
+
+        if self._resampler is None:
+            self._resampler = Resampler(self._sample_rate, self.get_output_sample_rate())
+
+        return self._resampler.process(samples)
+
+    def reset(self):
+        """
+        Clears the state of the demodulator and of the resampler.
+
+        :return: None
+        """
+        self._last = np.complex64(1)
+        self._resampler = None
@@ -0,0 +1,197 @@
+#
+#  sync_correlator.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import numpy as np
+
+from spacelab_decoder.sync_word import SyncWord, _SYNC_WORD_LSB
+
+class SyncCorrelator:
+    """
+    Sync word correlator.
+
+    The last received bits are kept in an integer shift register (the newest bit is the least significant one), so
+    the number of bit errors against the sync word is a XOR followed by a popcount.
+    """
+    def __init__(self, sync_word, max_err=0):
+        """
+        Class constructor.
+
+        :param sync_word: Is the sync word as a list of bytes (in the same order used by the BitDecoder class).
+        :type: list[int]
+
+        :param max_err: Is the maximum allowed bit errors in the sync word.
+        :type: int
+        """
+        sw_bits = SyncWord(sync_word, _SYNC_WORD_LSB)   # The bit i is compared with the bit received i bits ago
+
+        self._len = len(sw_bits)
+        self._mask = (1 << self._len) - 1
+        self._pattern = 0
+        for i in range(self._len):
+            self._pattern |= int(sw_bits[i]) << i
+
+        # Sync word in the order the bits are received, as +1 (bit 1) and -1 (bit 0) for the correlation
+        self._template = np.array([1 if bit else -1 for bit in reversed(sw_bits)], dtype=np.int32)
+
+        self._max_bit_err = 0
+        self.set_max_bit_errors(max_err)
+
+        self.reset()
+
+    def __len__(self):
+        """
+        Length of the sync word.
+
+        :return: The number of bits of the sync word.
+        :rtype: int
+        """
+        return self._len
+
+    def push(self, bit):
+        """
+        Shifts a new bit into the register.
+
+        :param bit: Is the received bit.
+        :type: int
+
+        :return: None
+        """
+        self._reg = ((self._reg << 1) | (1 if bit else 0)) & self._mask
+        if self._num_bits < self._len:
+            self._num_bits += 1
+
+    def get_distance(self):
+        """
+        Gets the Hamming distance between the last received bits and the sync word.
+
+        :return: The number of different bits, or the length of the sync word plus one if not enough bits were received.
+        :rtype: int
+        """
+        if self._num_bits < self._len:
+            return self._len + 1
+
+        return (self._reg ^ self._pattern).bit_count()
+
+    def is_synced(self):
+        """
+        Checks if the last received bits match the sync word (within the maximum allowed bit errors).
+
+        :return: True/False if the sync word was detected or not.
+        :rtype: bool
+        """
+        return self.get_distance() <= self._max_bit_err
+
+    def find_sync(self, bits):
+        """
+        Finds all the occurrences of the sync word in a bitstream.
+
+        :param bits: Is the bitstream (one bit per element, in the order they were received).
+        :type: np.ndarray
+
+        :return: The index of the first bit after each sync word found in the bitstream.
+        :rtype: np.ndarray
+        """
+        distance = self._get_distances(bits)
+
+        return np.flatnonzero(distance <= self._max_bit_err) + self._len
+
+    def find_sync_candidates(self, bits, inverted=False):
+        """
+        Finds all the occurrences of the sync word in a bitstream, optionally also with inverted polarity.
+
+        Both polarities come from the same correlation: the distance to the inverted sync word is the length of the
+        sync word minus the distance to the sync word.
+
+        :param bits: Is the bitstream (one bit per element, in the order they were received).
+        :type: np.ndarray
+
+        :param inverted: If True, the occurrences of the inverted sync word (all bits flipped) are also found.
+        :type: bool
+
+        :return: The index of the first bit after each sync word found, the number of bit errors of each one and if
+        each one is inverted or not (sorted by index).
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        distance = self._get_distances(bits)
+
+        flipped = np.zeros(len(distance), dtype=bool)
+        if inverted:
+            # The maximum allowed bit errors do not exceed 50 % of the sync word, so a window can only match one of them
+            flipped = self._len - distance < distance
+            distance = np.where(flipped, self._len - distance, distance)
+
+        found = np.flatnonzero(distance <= self._max_bit_err)
+
+        return found + self._len, distance[found], flipped[found]
+
+    def _get_distances(self, bits):
+        """
+        Computes the Hamming distance between the sync word and each window of a bitstream.
+
+        :param bits: Is the bitstream (one bit per element, in the order they were received).
+        :type: np.ndarray
+
+        :return: The distance of the window ending at each bit (from the bit len - 1 on).
+        :rtype: np.ndarray
+        """
+        bits = np.asarray(bits)
+
+        if len(bits) < self._len:
+            return np.zeros(0, dtype=np.int64)
+
+        # Sliding correlation of the bits (0/1) with the +1/-1 template: matches = corr + zeros of the sync word
+        corr = np.correlate((bits != 0).astype(np.int32), self._template, mode='valid')
+        zeros = np.count_nonzero(self._template < 0)
+
+        return self._len - (corr + zeros)
+
+    def set_max_bit_errors(self, err):
+        """
+        Sets the maximum allowed bit errors to detect the sync word.
+
+        :param err: Is the maximum allowed bit errors in the sync word.
+        :type: int
+
+        :return: None
+        """
+        if err > self._len/2:
+            raise ValueError("The maximum allowed bit errors in the sync word must not exceed 50 % of the sync word!")
+        else:
+            self._max_bit_err = err
+
+    def get_max_bit_errors(self):
+        """
+        Gets the maximum allowed bit errors to detect the sync word.
+
+        :return: The maximum allowed bit errors.
+        :rtype: int
+        """
+        return self._max_bit_err
+
+    def reset(self):
+        """
+        Clears the shift register.
+
+        :return: None
+        """
+        self._reg = 0
+        self._num_bits = 0
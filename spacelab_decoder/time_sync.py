@@ -22,16 +22,29 @@
 #  
 #
 
+import math
+from array import array
+
 import numpy as np
 
+from spacelab_decoder.metrics import get_metrics, timed
+
 _TIME_SYNC_DEFAULT_SAMPLE_RATE_HZ = 48000
 _TIME_SYNC_DEFAULT_BAUDRATE_BPS = 1200
 _TIME_SYNC_INITIAL_MU = 0.5
 _TIME_SYNC_GAIN = 0.001
+_TIME_SYNC_MIN_UNCHECKED_SYMBOLS = 16   # Shorter blocks are not worth the cost of bounding the loop steps
+
+# Sample formats that can be read directly through a memoryview (one Python scalar per sample)
+_TIME_SYNC_NATIVE_DTYPES = (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.float32, np.float64)
 
 class TimeSync:
     """
     Time Synchronization.
+
+    This class implements a Mueller and Muller clock recovery loop. The loop runs over a memoryview of the input
+    samples using only Python scalars, and is split in blocks where the input index is known to be within bounds, so
+    the per-symbol work is reduced to a few arithmetic operations.
     """
 
     def __init__(self, samp_rate=_TIME_SYNC_DEFAULT_SAMPLE_RATE_HZ, baud=_TIME_SYNC_DEFAULT_BAUDRATE_BPS):
@@ -39,100 +52,189 @@ class TimeSync:
         Class constructor with the internal variables initialization.
         """
         self._sps       = samp_rate/baud
-        self._mu        = _TIME_SYNC_INITIAL_MU             # Initial estimate of phase of sample
-        self._out_rail  = np.zeros(2, dtype=np.complex128)  # Stores the last two output rail values
-        self._out       = np.zeros(2, dtype=np.complex128)  # Stores the last two output values
+        self._mu        = _TIME_SYNC_INITIAL_MU     # Initial estimate of phase of sample
+        self._out_rail  = [0, 0]                    # Stores the last two output rail values
+        self._out       = [0.0, 0.0]                # Stores the last two output values
         self._gain      = _TIME_SYNC_GAIN
+        self._tail      = np.zeros(0)               # Input samples not used yet by the loop
+        self._skip      = 0                         # Input samples to skip in the next block
 
-    def decode_stream(self, data):
+    def decode_stream(self, data, soft=False):
         """
         Decodes a stream of samples.
 
+        The samples not used by the loop at the end of the block are kept and used with the next block, so splitting
+        a signal in blocks gives the same bits of decoding it at once. The blocks can have any size (even a single
+        sample): the block size only sets the latency, and short blocks have a low fixed cost per call.
+
         :param data: Is a list with the signal samples to extract the bits.
         :type: list
 
-        :return: A list with the extracted bits.
-        :rtype: list
+        :param soft: If True, the symbols are returned before the binary slicer (a positive symbol is a bit 1, and its
+        magnitude is the confidence of the bit).
+        :type: bool
+
+        :return: A list with the extracted bits, or an array with the extracted symbols if soft is True.
+        :rtype: list or np.ndarray
         """
-        samples     = np.array(data, dtype=np.float128)
-        out         = np.zeros(len(samples) + int(2*self._sps), dtype=np.complex128)
-        out_rail    = np.zeros(len(samples) + int(2*self._sps), dtype=np.complex128)
+        size = data.size if isinstance(data, np.ndarray) else len(data)
 
-        # Initialize with the previous state
-        out[:2]         = self._out
-        out_rail[:2]    = self._out_rail
+        if self._skip >= size:
+            self._skip -= size          # The whole block is between two symbols
+            return np.zeros(0, dtype=np.float32) if soft else list()
 
-        i_in    = 0 # Input samples index
-        i_out   = 2 # Output index (let first two outputs be from previous state)
+        metrics = get_metrics()
+        start = metrics.start()     # Not a decorator: the blocks can be a single sample
 
-        while i_out < len(samples) and i_in + 1 < len(samples):
-            out[i_out] = samples[i_in + int(self._mu)]  # Grab what we think is the "best" sample
-            out_rail[i_out] = int(np.real(out[i_out]) > 0) + 1j * int(np.imag(out[i_out]) > 0)
+        samples = self._to_samples(data)
 
-            x = (out_rail[i_out] - out_rail[i_out - 2]) * np.conj(out[i_out - 1])
-            y = (out[i_out] - out[i_out - 2]) * np.conj(out_rail[i_out - 1])
+        if self._skip > 0:
+            samples = samples[self._skip:]
+            self._skip = 0
 
-            mm_val = np.real(y - x)
-            self._mu += self._sps + self._gain * mm_val
+        if len(self._tail) > 0:
+            samples = np.concatenate((self._tail, samples))
 
-            i_in += int(np.floor(self._mu))             # Round down to nearest int since we are using it as an index
-            self._mu = self._mu - np.floor(self._mu)    # Remove the integer part of mu
-            i_out += 1                                  # Increment output index
+        bits, self._mu, self._out, self._out_rail, i_in = self._recover_clock(samples, self._mu, self._out, self._out_rail, soft)
 
-        # Update the state for the next iteration
-        self._out       = out[i_out - 2:i_out]      # Store the last two output values
-        self._out_rail  = out_rail[i_out - 2:i_out] # Store the last two output rail values
+        if i_in < len(samples):
+            self._tail = samples[i_in:].copy()
+        else:
+            self._tail = samples[:0].copy()
+            self._skip = i_in - len(samples)
 
-        # Extract bits from the current chunk
-        out = out[2:i_out]  # Remove the first two, and anything after i_out (that was never filled out)
+        metrics.count("time_sync_samples", size)
+        metrics.count("time_sync_symbols", len(bits))
+        metrics.stop("time_sync", start)
 
-        return [1 if symbol.real > 0 else 0 for symbol in out]  # Binary slicer
+        return np.frombuffer(bits, dtype=np.float32) if soft else list(bits)
 
-    def get_bitstream(self, data):
+    @timed("time_sync")
+    def get_bitstream(self, data, soft=False):
         """
         Decodes a bitstream from a sequence of samples.
 
         :param data: Is a list with the signal samples to extract the bits.
         :type: list
 
-        :return: A list with the extracted bits.
-        :rtype: list
+        :param soft: If True, the symbols are returned before the binary slicer.
+        :type: bool
+
+        :return: A list with the extracted bits, or an array with the extracted symbols if soft is True.
+        :rtype: list or np.ndarray
         """
-        samples = np.array(data, dtype=np.float128)
+        samples = self._to_samples(data)
 
-        mu = self._mu   # Initial estimate of phase of sample
-        gain = self._gain
-        out = np.zeros(len(samples) + 10, dtype=np.complex128)
+        bits, mu, out, out_rail, i_in = self._recover_clock(samples, self._mu, [0.0, 0.0], [0, 0], soft)
 
-        out_rail = np.zeros(len(samples) + 10, dtype=np.complex128) # Stores values, each iteration we need the previous 2 values plus current value
+        metrics = get_metrics()
+        metrics.count("time_sync_samples", len(samples))
+        metrics.count("time_sync_symbols", len(bits))
 
-        i_in = 0    # Input samples index
-        i_out = 2   # Output index (let first two outputs be 0)
+        return np.frombuffer(bits, dtype=np.float32) if soft else list(bits)
 
-        while i_out < len(samples) and i_in + 1 < len(samples):
-            out[i_out] = samples[i_in + int(mu)]  # grab what we think is the "best" sample
-            out_rail[i_out] = int(np.real(out[i_out]) > 0) + 1j * int(np.imag(out[i_out]) > 0)
+    def reset(self):
+        """
+        Resets the decoder.
+
+        :return: None
+        """
+        self._mu        = _TIME_SYNC_INITIAL_MU
+        self._out       = [0.0, 0.0]
+        self._out_rail  = [0, 0]
+        self._tail      = np.zeros(0)
+        self._skip      = 0
 
-            x = (out_rail[i_out] - out_rail[i_out - 2]) * np.conj(out[i_out - 1])
-            y = (out[i_out] - out[i_out - 2]) * np.conj(out_rail[i_out - 1])
+    def _to_samples(self, data):
+        """
+        Gets the given samples as an array, without copying them when possible.
 
-            mm_val = np.real(y - x)
-            mu += self._sps + gain * mm_val
+        :param data: Is a list or an array with the signal samples.
+        :type: list or np.ndarray
 
-            i_in += int(np.floor(mu))   # Round down to nearest int since we are using it as an index
-            mu = mu - np.floor(mu)      # Remove the integer part of mu
-            i_out += 1                  # Increment output index
+        :return: A one-dimensional array with the samples.
+        :rtype: np.ndarray
+        """
+        samples = np.asarray(data).reshape(-1)
 
-        out = out[2:i_out]  # Remove the first two, and anything after i_out (that was never filled out)
+        if samples.dtype.type not in _TIME_SYNC_NATIVE_DTYPES:
+            samples = samples.astype(np.float64)
+        elif not samples.flags.aligned:
+            samples = samples.copy()    # A memoryview can not read unaligned samples (ex.: from a memory-mapped file)
 
-        return [1 if symbol.real > 0 else 0 for symbol in out]  # Binary slicer
+        return samples
 
-    def reset(self):
+    def _recover_clock(self, samples, mu, out, out_rail, soft=False):
         """
-        Resets the decoder.
+        Runs the Mueller and Muller clock recovery loop over a sequence of samples.
 
-        :return: None
+        :note: The samples are used in their original format (no float conversion), as the timing error before
+        the gain is applied is computed exactly for both integer and floating-point samples.
+
+        :param samples: Is the sequence of samples.
+        :type: np.ndarray
+
+        :param mu: Is the initial phase of the sample.
+        :type: float
+
+        :param out: Is a list with the last two output values (oldest first).
+        :type: list
+
+        :param out_rail: Is a list with the last two output rail values (oldest first).
+        :type: list
+
+        :param soft: If True, the symbols are extracted instead of the bits.
+        :type: bool
+
+        :return: The extracted bits (or symbols), the new phase, the last two output values, the last two output rail
+        values and the index of the next input sample.
+        :rtype: tuple[bytearray or array, float, list, list, int]
         """
-        self._mu        = _TIME_SYNC_INITIAL_MU
-        self._out       = np.zeros(2, dtype=np.complex128)
-        self._out_rail  = np.zeros(2, dtype=np.complex128)
+        if len(samples) > _TIME_SYNC_MIN_UNCHECKED_SYMBOLS*self._sps:
+            # Upper bound of the input index increment per output symbol (used to skip the bounds check)
+            amp = max(abs(float(samples.max())), abs(float(samples.min()))) + 1
+            max_step = int(self._sps + 1 + abs(self._gain)*(3*amp + 2*max(abs(out[0]), abs(out[1]))))
+        else:
+            max_step = len(samples) + 1     # Short blocks: the bounds are checked for every symbol
+
+        samples = memoryview(samples)
+
+        n = len(samples)
+        max_out = n - 2     # The first two outputs of the original algorithm are the previous state
+        sps = self._sps
+        gain = self._gain
+        floor = math.floor
+
+        o2, o1 = out
+        r2, r1 = out_rail
+
+        bits = array('f') if soft else bytearray()     # float32 symbols or bits
+        append = bits.append
+
+        i_in = 0
+        while len(bits) < max_out and i_in + 1 < n:
+            # Number of symbols that can be extracted before the bounds must be checked again
+            block = (n - 2 - i_in) // max_step
+            if block < 1:
+                block = 1
+            elif block > max_out - len(bits):
+                block = max_out - len(bits)
+
+            for _ in range(block):
+                o = samples[i_in]   # mu is always in [0, 1), so the "best" sample is always at i_in
+                if o > 0:
+                    mu += sps + gain * ((o - o2) * r1 - (1 - r2) * o1)
+                    r2 = r1
+                    r1 = 1
+                else:
+                    mu += sps + gain * ((o - o2) * r1 + r2 * o1)
+                    r2 = r1
+                    r1 = 0
+                fl = floor(mu)      # Round down to nearest int since we are using it as an index
+                i_in += fl
+                mu -= fl            # Remove the integer part of mu
+                o2 = o1
+                o1 = o
+                append(o if soft else r1)   # Binary slicer
+
+        return bits, mu, [o2, o1], [r2, r1], i_in
@@ -0,0 +1,170 @@
+#
+#  udp_receiver.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import socket
+import threading
+
+_UDP_RECEIVER_TIMEOUT_SEC       = 0.5   # Maximum time to notice a stop request
+_UDP_RECEIVER_SOCKET_BUFFER     = 2**22 # Bytes (bursts are absorbed by the kernel while the thread is not scheduled)
+
+class UdpReceiver:
+    """
+    UDP samples receiver.
+
+    A dedicated thread receives the datagrams directly into a ring buffer (with socket.recv_into()), so a slow
+    consumer does not delay the socket reads. When the ring buffer is full, the received datagrams are dropped and
+    counted as overruns.
+    """
+    def __init__(self, address, port, ring_buffer):
+        """
+        Class constructor.
+
+        :param address: Is the address to listen.
+        :type: str
+
+        :param port: Is the UDP port to listen (0 to use any free port).
+        :type: int
+
+        :param ring_buffer: Is the ring buffer where the samples are written.
+        :type: RingBuffer
+        """
+        self._ring_buffer = ring_buffer
+        self._scratch = bytearray(ring_buffer.get_max_write())  # Destination of the dropped datagrams
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.settimeout(_UDP_RECEIVER_TIMEOUT_SEC)
+        try:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _UDP_RECEIVER_SOCKET_BUFFER)
+        except OSError:
+            pass    # The default size of the system is used
+
+        self._sock.bind((address, port))
+
+        self._thread = None
+        self._running = False
+
+        self._datagrams = 0
+        self._received_bytes = 0
+        self._overruns = 0
+        self._dropped_bytes = 0
+
+    def start(self):
+        """
+        Starts the receiver thread.
+
+        :return: None
+        """
+        if self._running:
+            raise RuntimeError("The UDP receiver is already running!")
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="udp-receiver", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the receiver thread and closes the socket.
+
+        :return: None
+        """
+        self._running = False
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self._sock.close()
+
+    def is_running(self):
+        """
+        Checks if the receiver thread is running.
+
+        :return: True/False if the receiver is running or not.
+        :rtype: bool
+        """
+        return self._running
+
+    def get_address(self):
+        """
+        Gets the address of the socket.
+
+        :return: The address and the port being listened.
+        :rtype: tuple[str, int]
+        """
+        return self._sock.getsockname()
+
+    def get_datagrams(self):
+        """
+        Gets the number of received datagrams (including the dropped ones).
+
+        :return: The number of datagrams.
+        :rtype: int
+        """
+        return self._datagrams
+
+    def get_received_samples(self):
+        """
+        Gets the number of samples written to the ring buffer.
+
+        :return: The number of samples.
+        :rtype: int
+        """
+        return self._received_bytes//self._ring_buffer.get_dtype().itemsize
+
+    def get_overruns(self):
+        """
+        Gets the number of datagrams dropped because the ring buffer was full.
+
+        :return: The number of dropped datagrams.
+        :rtype: int
+        """
+        return self._overruns
+
+    def get_dropped_samples(self):
+        """
+        Gets the number of samples dropped because the ring buffer was full.
+
+        :return: The number of dropped samples.
+        :rtype: int
+        """
+        return self._dropped_bytes//self._ring_buffer.get_dtype().itemsize
+
+    def _run(self):
+        while self._running:
+            buf = self._ring_buffer.get_write_buffer()
+            try:
+                if buf is None:
+                    num_bytes = self._sock.recv_into(self._scratch)
+                    self._overruns += 1
+                    self._dropped_bytes += num_bytes
+                else:
+                    num_bytes = self._sock.recv_into(buf)
+                    self._ring_buffer.commit(num_bytes)
+                    self._received_bytes += num_bytes
+            except socket.timeout:
+                continue
+            except OSError:
+                break   # Socket closed
+
+            self._datagrams += 1
+
+        self._running = False
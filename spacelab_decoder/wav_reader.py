@@ -0,0 +1,180 @@
+#
+#  wav_reader.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+from scipy.io import wavfile
+
+_WAV_READER_DEFAULT_BLOCK_SIZE = 2**18     # Samples per block (about 5 seconds at 48 kHz)
+
+class WavReader:
+    """
+    WAV file reader.
+
+    The file is memory-mapped and the samples of the selected channel are read as a strided view of the file, in
+    blocks of fixed size. The memory usage does not depend on the length of the recording.
+
+    The mapping is released by close() (or at the end of a with block), and not only when the reader is garbage
+    collected. The file stays mapped while a block given by the reader is still referenced.
+    """
+    def __init__(self, filename, channel=0, block_size=_WAV_READER_DEFAULT_BLOCK_SIZE):
+        """
+        Class constructor.
+
+        :param filename: Is the WAV file to read.
+        :type: str
+
+        :param channel: Is the channel to read (the first one by default).
+        :type: int
+
+        :param block_size: Is the number of samples of each block.
+        :type: int
+        """
+        try:
+            self._sample_rate, self._data = wavfile.read(filename, mmap=True)
+        except ValueError:
+            # Some formats (ex.: 24-bit PCM) can not be memory-mapped
+            self._sample_rate, self._data = wavfile.read(filename)
+
+        self._channel = 0
+        self._block_size = 0
+
+        self.set_channel(channel)
+        self.set_block_size(block_size)
+
+    def __len__(self):
+        """
+        Number of samples per channel.
+
+        :return: The number of samples of each channel.
+        :rtype: int
+        """
+        return self._get_data().shape[0]
+
+    def __iter__(self):
+        """
+        Iterates over the samples of the selected channel in blocks.
+
+        :return: The blocks of samples (views of the file, without copies).
+        :rtype: iterator[np.ndarray]
+        """
+        samples = self.get_samples()
+        for i in range(0, len(samples), self._block_size):
+            yield samples[i:i + self._block_size]
+
+    def get_sample_rate(self):
+        """
+        Gets the sample rate of the file.
+
+        :return: The sample rate in Hertz.
+        :rtype: int
+        """
+        return self._sample_rate
+
+    def get_num_channels(self):
+        """
+        Gets the number of channels of the file.
+
+        :return: The number of channels.
+        :rtype: int
+        """
+        data = self._get_data()
+
+        return 1 if data.ndim == 1 else data.shape[1]
+
+    def set_channel(self, channel):
+        """
+        Sets the channel to read.
+
+        :param channel: Is the index of the channel.
+        :type: int
+
+        :return: None
+        """
+        if channel < 0 or channel >= self.get_num_channels():
+            raise ValueError("The channel must be between 0 and " + str(self.get_num_channels() - 1) + "!")
+
+        self._channel = channel
+
+    def get_channel(self):
+        """
+        Gets the channel being read.
+
+        :return: The index of the channel.
+        :rtype: int
+        """
+        return self._channel
+
+    def set_block_size(self, block_size):
+        """
+        Sets the number of samples of each block.
+
+        :param block_size: Is the block size in samples.
+        :type: int
+
+        :return: None
+        """
+        if block_size < 1:
+            raise ValueError("The block size must be greater than zero!")
+
+        self._block_size = int(block_size)
+
+    def get_block_size(self):
+        """
+        Gets the number of samples of each block.
+
+        :return: The block size in samples.
+        :rtype: int
+        """
+        return self._block_size
+
+    def get_samples(self):
+        """
+        Gets all the samples of the selected channel.
+
+        :return: A strided view of the samples of the channel (no copy is made).
+        :rtype: np.ndarray
+        """
+        data = self._get_data()
+
+        if data.ndim == 1:
+            return data
+
+        return data[:, self._channel]
+
+    def close(self):
+        """
+        Releases the samples of the file (the memory mapping is closed when no block references it).
+
+        :return: None
+        """
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_data(self):
+        if self._data is None:
+            raise RuntimeError("The WAV file is closed!")
+
+        return self._data
@@ -66,6 +66,53 @@ def test_decode_byte(ax100_mode5):
     # Assert that the decoded data matches the original data
     assert decoded_data == data
 
+def test_decode_reused(ax100_mode5):
+    preamb_sw_len = len(ax100_mode5.get_preamble()) + len(ax100_mode5.get_sync_word())
+
+    # The same instance (and its codecs) decodes many packets, with and without errors
+    for i in range(20):
+        data = [random.randint(0, 255) for j in range(random.randint(1, 223))]
+
+        pkt = ax100_mode5.encode(data)[preamb_sw_len:]
+        pkt[3 + random.randrange(len(data))] ^= 0xFF
+
+        assert ax100_mode5.decode(pkt) == data
+
+def test_decode_frame(ax100_mode5):
+    preamb_sw_len = len(ax100_mode5.get_preamble()) + len(ax100_mode5.get_sync_word())
+
+    for i in range(20):
+        data = [random.randint(0, 255) for j in range(random.randint(1, 223))]
+
+        pkt = ax100_mode5.encode(data)[preamb_sw_len:]
+        pkt[3 + random.randrange(len(data))] ^= 0xFF
+
+        # The bytes after the end of the packet (ex.: the next bits of the bitstream) are ignored
+        frame = bytes(pkt + [random.randint(0, 255) for j in range(20)])
+
+        assert ax100_mode5.decode_frame(frame) == data
+
+        # Same result of the byte stream decoder
+        ax100_mode5.reset_decoder()
+        for byte in frame:
+            pl = ax100_mode5.decode_byte(byte)
+            if pl is not None:
+                break
+        assert pl == data
+
+        # Incomplete packet
+        assert ax100_mode5.decode_frame(frame[:len(pkt) - 1]) is None
+
+def test_decode_frame_invalid_length(ax100_mode5):
+    with pytest.raises(RuntimeError):
+        ax100_mode5.decode_frame(bytes([0x0F, 0xFF, 0xFF]) + bytes(255))   # Uncorrectable Golay24 field
+
+    with pytest.raises(RuntimeError):
+        ax100_mode5.decode_frame(bytes(ax100_mode5._golay.encode(300)) + bytes(255))
+
+    with pytest.raises(RuntimeError):
+        ax100_mode5.decode_frame(bytes(ax100_mode5._golay.encode(10)) + bytes(255))
+
 def test_scrambling(ax100_mode5):
     # Test data
     data = list()
@@ -81,6 +128,19 @@ def test_scrambling(ax100_mode5):
     # Assert that the descrambled data matches the original data
     assert descrambled_data == data
 
+def test_scrambling_reference(ax100_mode5):
+    from ax100 import _AX100_CCSDS_POLY
+
+    # Element by element reference implementation
+    def scrambling(data, start_pos):
+        return [data[i] ^ _AX100_CCSDS_POLY[(i + start_pos) % len(_AX100_CCSDS_POLY)] for i in range(len(data))]
+
+    for length in [0, 1, 3, 254, 255, 256, 600]:
+        for start_pos in [0, 1, 100, 254, 255, 300]:
+            data = [random.randint(0, 255) for i in range(length)]
+
+            assert ax100_mode5._scrambling(data, start_pos) == scrambling(data, start_pos)
+
 def test_sync_word(ax100_mode5):
     # Test sync word
     new_sync_word = [0x12, 0x34, 0x56, 0x78]
@@ -99,3 +159,58 @@ def test_preamble(ax100_mode5):
 
 if __name__ == "__main__":
     pytest.main()
+
+def test_decode_frame_erasures(ax100_mode5):
+    preamb_sw_len = len(ax100_mode5.get_preamble()) + len(ax100_mode5.get_sync_word())
+
+    data = [random.randint(0, 255) for j in range(100)]
+
+    pkt = ax100_mode5.encode(data)[preamb_sw_len:]
+
+    # 20 wrong symbols (more than the error correction capacity)
+    wrong = random.sample(range(3, len(pkt)), 20)
+    for pos in wrong:
+        pkt[pos] ^= 0xFF
+
+    frame = bytes(pkt)
+
+    with pytest.raises(RuntimeError):
+        ax100_mode5.decode_frame(frame)
+
+    # The weakest bytes are erased (the bytes out of the Reed-Solomon block are ignored)
+    assert ax100_mode5.decode_frame(frame, [0, len(pkt) + 5] + wrong) == data
+
+    # Erasures of right symbols do not change the decoding of a correctable frame
+    frame = bytes(ax100_mode5.encode(data)[preamb_sw_len:])
+
+    assert ax100_mode5.decode_frame(frame, list(range(3, 40))) == data
+
+def test_get_errors(ax100_mode5):
+    preamb_sw_len = len(ax100_mode5.get_preamble()) + len(ax100_mode5.get_sync_word())
+
+    data = [random.randint(0, 255) for j in range(50)]
+
+    pkt = ax100_mode5.encode(data)[preamb_sw_len:]
+
+    assert ax100_mode5.decode_frame(bytes(pkt)) == data
+    assert ax100_mode5.get_errors() == (0, 0)
+
+    # One bit error in the Golay24 field and three wrong symbols in the Reed-Solomon block
+    pkt[0] ^= 0x01
+    for pos in (5, 20, 40):
+        pkt[pos] ^= 0xFF
+
+    assert ax100_mode5.decode_frame(bytes(pkt)) == data
+    assert ax100_mode5.get_errors() == (1, 3)
+
+    assert ax100_mode5.decode(pkt) == data
+    assert ax100_mode5.get_errors() == (1, 3)
+
+    ax100_mode5.decode_frame(bytes(ax100_mode5.encode(data)[preamb_sw_len:]))
+
+    decoded_data = None
+    for byte in pkt:
+        decoded_data = ax100_mode5.decode_byte(byte) or decoded_data
+
+    assert decoded_data == data
+    assert ax100_mode5.get_errors() == (1, 3)
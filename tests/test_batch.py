@@ -0,0 +1,134 @@
+#
+#  test_batch.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import sys
+import json
+import shutil
+import warnings
+import subprocess
+from datetime import datetime, timezone
+
+import pytest
+
+import numpy as np
+import pyngham
+
+from scipy.io import wavfile
+
+from batch import BatchDecoder, main
+
+_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
+_SAT_JSON_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "spacelab_decoder", "data", "satellites")
+
+@pytest.fixture(autouse=True)
+def ignore_wav_warnings():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", wavfile.WavFileWarning)
+        yield
+
+def test_decode_file():
+    dec = BatchDecoder(os.path.join(_SAT_JSON_DIR, "golds-ufsc.json"), "downlink_vhf")
+
+    assert dec.get_link().get_id() == "downlink_vhf"
+
+    records, num_samples = dec.decode_file(os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav"))
+
+    assert num_samples > 0
+    assert len(records) == 1
+    assert records[0]['satellite'] == "GOLDS-UFSC"
+    assert records[0]['link'] == "downlink_vhf"
+    assert records[0]['data']['pkt_src_adr'] == " PY0EFS"
+    assert 'error' not in records[0]
+
+    # The sync word of the link must not be changed by the decoding
+    assert dec.get_link().get_sync_word() == [93, 230, 42, 126]
+
+def test_packet_time(tmp_path):
+    filename = str(tmp_path / "pass.wav")
+    shutil.copy(os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav"), filename)
+
+    # The recording ended at the modification time of the file
+    t_end = datetime(2026, 10, 1, 12, 0, 0, tzinfo=timezone.utc)
+    os.utime(filename, (t_end.timestamp(), t_end.timestamp()))
+
+    records, num_samples = BatchDecoder(os.path.join(_SAT_JSON_DIR, "golds-ufsc.json"), "downlink_vhf").decode_file(filename)
+
+    t_pkt = datetime.fromisoformat(records[0]['time'])
+    duration = num_samples/48000
+
+    assert t_pkt.tzinfo is not None
+    assert 0 < (t_end - t_pkt).total_seconds() < duration
+
+def test_unknown_packet():
+    dec = BatchDecoder(os.path.join(_SAT_JSON_DIR, "floripasat-2a.json"), "downlink")
+
+    records, num_samples = dec.decode_file(os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav"))
+
+    assert len(records) == 1
+    assert records[0]['error'] == "Unknown packet ID!"
+    assert 'data' not in records[0]
+
+def test_unknown_link():
+    with pytest.raises(RuntimeError):
+        BatchDecoder(os.path.join(_SAT_JSON_DIR, "golds-ufsc.json"), "uplink")
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_main(tmp_path, capsys, jobs):
+    output = tmp_path / "packets.jsonl"
+
+    res = main(["-s", "golds-ufsc", "-l", "downlink_vhf", "-j", str(jobs), "-o", str(output), os.path.join(_SAMPLES_DIR, "*.wav")])
+
+    assert res == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+
+    assert [os.path.basename(rec['file']) for rec in records] == ["floripasat2a_beacon.wav", "golds-ufsc_beacon.wav"]
+    assert "2 packet(s) decoded from 2 file(s)" in capsys.readouterr().err
+
+def test_main_errors(tmp_path, capsys):
+    assert main(["-s", "unknown-satellite", "-l", "downlink", "file.wav"]) == 1
+    assert main(["-s", "golds-ufsc", "-l", "downlink_vhf", "-o", str(tmp_path / "out.jsonl"), str(tmp_path / "missing.wav")]) == 1
+
+    assert "missing.wav" in capsys.readouterr().err
+
+def test_batch_does_not_import_gtk():
+    code = "import sys; import spacelab_decoder.batch; sys.exit(int('gi' in sys.modules))"
+
+    assert subprocess.run([sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), os.pardir)).returncode == 0
+
+def test_find_packets_candidates():
+    dec = BatchDecoder(os.path.join(_SAT_JSON_DIR, "golds-ufsc.json"), "downlink_vhf")
+
+    rng = np.random.default_rng(7)
+    data = rng.integers(0, 256, 100).tolist()
+
+    pkt_bits = np.unpackbits(np.array(pyngham.PyNGHam().encode(data), dtype=np.uint8))
+    sync_bits = pkt_bits[32:64].copy()
+
+    # A false sync word inside the packet (corrected by the Reed-Solomon code) does not cut the frame
+    pkt_bits[8*40:8*44] = sync_bits
+
+    noise = rng.integers(0, 2, 500, dtype=np.uint8)
+    bits = np.concatenate((noise, pkt_bits, noise, 1 - pkt_bits, noise))
+
+    assert dec.find_packets(bits.tolist()) == [data, data]
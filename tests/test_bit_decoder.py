@@ -22,6 +22,8 @@
 
 import pytest
 
+import numpy as np
+
 from bit_decoder import BitDecoder, _BIT_DECODER_MAX_BYTES_TO_DECODE
 
 def test_bit_decoder_initialization():
@@ -117,3 +119,182 @@ def test_reset():
     # After reset, the decoder should not detect a packet
     for bit in data_bits:
         assert decoder.decode_bit(bit) is None
+
+def test_decode_bits():
+    """
+    Test decoding a whole bitstream at once.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data = [0x12, 0x34, 0x56, 0x78, 0x9A]
+    data_bits = [int(b) for byte in data for b in format(byte, '08b')]
+
+    bits = [0, 1, 1, 0, 0] + sync_bits + data_bits + [1, 0, 1]
+
+    frames = BitDecoder(sync_word, 0).decode_bits(bits)
+
+    assert frames == [bytes(data)]
+
+    # The result must match the bytes decoded bit by bit
+    decoder = BitDecoder(sync_word, 0)
+    decoded_bytes = [decoder.decode_bit(bit) for bit in bits]
+
+    assert [byte for byte in decoded_bytes if byte is not None] == list(frames[0])
+
+def test_decode_bits_frame_limits():
+    """
+    Test the end of the frames decoded from a whole bitstream.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data_bits = [1, 0, 1, 0, 1, 0, 1, 0]    # 0xAA
+
+    # A new sync word ends the current frame (as in the bit by bit decoding, the sync word bits are still included)
+    frames = BitDecoder(sync_word, 0).decode_bits(sync_bits + 3*data_bits + [0, 0] + sync_bits + data_bits)
+
+    assert len(frames) == 2
+    assert len(frames[0]) == (3*8 + 2 + 32) // 8
+    assert frames[0][:3] == bytes([0xAA]*3)
+    assert frames[1] == bytes([0xAA])
+
+    # The frame length is limited to the maximum number of bytes to decode
+    frames = BitDecoder(sync_word, 0).decode_bits(sync_bits + _BIT_DECODER_MAX_BYTES_TO_DECODE*data_bits)
+
+    assert frames == [bytes([0xAA]*(_BIT_DECODER_MAX_BYTES_TO_DECODE - 1))]
+
+    assert BitDecoder(sync_word, 0).decode_bits(data_bits) == []
+
+def test_decode_bits_blocks():
+    """
+    Test decoding a bitstream split in blocks.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data_bits = [1, 0, 1, 0, 1, 0, 1, 0]    # 0xAA
+
+    bits = [1, 1, 0] + sync_bits + 10*data_bits + [0]*7 + sync_bits + 400*data_bits + sync_bits + 2*data_bits
+
+    expected = BitDecoder(sync_word, 0).decode_bits(bits)
+
+    assert len(expected) == 3
+
+    for block_size in [1, 8, 31, 100, 1000]:
+        decoder = BitDecoder(sync_word, 0)
+
+        frames = list()
+        for i in range(0, len(bits), block_size):
+            frames += decoder.decode_bits(bits[i:i + block_size], final=False)
+
+        frames += decoder.decode_bits([], final=True)
+
+        assert frames == expected
+
+def test_decode_candidates():
+    """
+    Test decoding a bitstream into candidate frames.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data_bits = [1, 0, 1, 0, 1, 0, 1, 0]    # 0xAA
+
+    # A sync word inside the frame does not cut it (unlike decode_bits)
+    bits = [1, 1, 0] + sync_bits + 3*data_bits + sync_bits + 2*data_bits
+
+    candidates = BitDecoder(sync_word, 0).decode_candidates(bits)
+
+    assert [(pos, err, inv, eras) for pos, frame, err, inv, eras in candidates] == [(35, 0, False, ()), (91, 0, False, ())]
+    assert candidates[0][1] == bytes([0xAA]*3) + bytes([0x5D, 0xE6, 0x2A, 0x7E, 0xAA, 0xAA])
+    assert candidates[1][1] == bytes([0xAA]*2)
+
+    # The frame length is limited to the maximum number of bytes to decode
+    candidates = BitDecoder(sync_word, 0).decode_candidates(sync_bits + _BIT_DECODER_MAX_BYTES_TO_DECODE*data_bits)
+
+    assert candidates[0][1] == bytes([0xAA]*(_BIT_DECODER_MAX_BYTES_TO_DECODE - 1))
+
+def test_decode_candidates_inverted():
+    """
+    Test decoding candidate frames with inverted polarity.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data_bits = [int(b) for byte in [0x12, 0x34] for b in format(byte, '08b')]
+
+    bits = [1 - b for b in [0, 1] + sync_bits + data_bits]
+    bits[10] ^= 1   # One bit error in the sync word
+
+    assert BitDecoder(sync_word, 1).decode_candidates(bits) == []
+    assert BitDecoder(sync_word, 1, inverted=True).decode_candidates(bits) == [(34, bytes([0x12, 0x34]), 1, True, ())]
+
+def test_decode_candidates_blocks():
+    """
+    Test decoding candidate frames from a bitstream split in blocks.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data_bits = [1, 0, 1, 0, 1, 0, 1, 0]    # 0xAA
+
+    bits = [1, 1, 0] + sync_bits + 10*data_bits + [0]*7 + [1 - b for b in sync_bits] + 400*data_bits + sync_bits + 2*data_bits
+
+    expected = BitDecoder(sync_word, 2, inverted=True).decode_candidates(bits)
+
+    assert len(expected) == 3
+
+    for block_size in [1, 8, 31, 100, 1000, 5000]:
+        decoder = BitDecoder(sync_word, 2, inverted=True)
+
+        candidates = list()
+        for i in range(0, len(bits), block_size):
+            candidates += decoder.decode_candidates(bits[i:i + block_size], final=False)
+
+        candidates += decoder.decode_candidates([], final=True)
+
+        assert candidates == expected
+
+def test_decode_candidates_soft():
+    """
+    Test decoding candidate frames from soft symbols.
+    """
+    sync_word = [0x5D, 0xE6, 0x2A, 0x7E]
+    sync_word.reverse()
+
+    sync_bits = [int(b) for b in format(0x5DE62A7E, '032b')]
+    data_bits = [int(b) for byte in range(10) for b in format(byte, '08b')]
+
+    bits = np.array([1, 0, 1] + sync_bits + data_bits)
+    symbols = (2.0*bits - 1).astype(np.float32)
+
+    # Weak bits (one of them wrong) in the bytes 7 and 2 of the frame
+    symbols[35 + 8*7 + 3] *= 0.1
+    symbols[35 + 8*2 + 5] *= -0.3
+
+    candidates = BitDecoder(sync_word, 0).decode_candidates(symbols)
+
+    assert len(candidates) == 1
+    assert candidates[0][:4] == (35, bytes([0, 1, 2 ^ 0x04, 3, 4, 5, 6, 7, 8, 9]), 0, False)
+    assert candidates[0][4] == (7, 2)   # The weakest first
+
+    # The erasures are the same for inverted frames and with the symbols split in blocks
+    candidates = BitDecoder(sync_word, 0, inverted=True).decode_candidates(-symbols)
+
+    assert candidates[0][3]
+    assert candidates[0][4] == (7, 2)
+
+    decoder = BitDecoder(sync_word, 0)
+
+    blocks = list()
+    for i in range(0, len(symbols), 16):
+        blocks += decoder.decode_candidates(symbols[i:i + 16], final=False)
+
+    assert blocks + decoder.decode_candidates([], final=True) == BitDecoder(sync_word, 0).decode_candidates(symbols)
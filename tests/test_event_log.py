@@ -0,0 +1,164 @@
+#
+#  test_event_log.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import json
+import importlib.util
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import event_log
+from event_log import EventLog, query_events, read_index, main
+
+_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
+
+def _write_week(log):
+    # Two packets per hour during a week, alternating between two satellites
+    t0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    for i in range(7*24*2):
+        log.write("packet", "CATARINA-A2" if i % 2 else "GOLDS-UFSC", "downlink", t0 + timedelta(minutes=30*i), rs_errors=i % 3)
+
+def test_rotation_and_index(tmp_path):
+    with EventLog(str(tmp_path), max_size=4096) as log:
+        _write_week(log)
+
+    index = read_index(str(tmp_path))
+
+    # The segments are rotated by size and by day
+    assert len(index) > 7
+    assert sum(entry['records'] for entry in index) == 7*24*2
+    assert all(entry['start'][:10] == entry['end'][:10] for entry in index)
+    assert all(entry['satellites'] == ["CATARINA-A2", "GOLDS-UFSC"] for entry in index)
+    assert sorted(os.listdir(str(tmp_path))) == sorted([entry['segment'] for entry in index] + ["index.jsonl"])
+
+def test_query(tmp_path, monkeypatch):
+    with EventLog(str(tmp_path), max_size=4096) as log:
+        _write_week(log)
+        log.write("error", "CATARINA-A2", "downlink", "2026-10-03T10:00:00+00:00", error="Unknown packet ID!")
+
+    recs = list(query_events(str(tmp_path), satellite="catarina-a2"))
+
+    assert len(recs) == 7*24 + 1
+    assert all(rec['satellite'] == "CATARINA-A2" for rec in recs)
+
+    # Only the segments of the requested time range are read
+    read = list()
+    read_segment = event_log.read_segment
+    monkeypatch.setattr(event_log, "read_segment", lambda filename: read.append(filename) or read_segment(filename))
+
+    recs = list(query_events(str(tmp_path), "2026-10-03T00:00:00", "2026-10-04T00:00:00", "CATARINA-A2", event="packet"))
+
+    assert len(recs) == 24
+    assert all(rec['time'].startswith("2026-10-03") for rec in recs)
+    assert 0 < len(read) < len(read_index(str(tmp_path)))
+
+    recs = list(query_events(str(tmp_path), event="error"))
+
+    assert [rec['error'] for rec in recs] == ["Unknown packet ID!"]
+
+def test_open_segment(tmp_path):
+    log = EventLog(str(tmp_path), max_delay=60)
+
+    rec = log.write("packet", "GOLDS-UFSC", "downlink_vhf", rs_errors=0)
+
+    assert read_index(str(tmp_path)) == list()
+
+    # The current segment is read by the queries (up to the last flush)
+    assert list(log.query()) == [rec]
+
+    log.write("packet", "GOLDS-UFSC", "downlink_vhf", rs_errors=1)
+
+    assert len(list(query_events(str(tmp_path)))) == 1
+
+    log.flush()
+
+    assert len(list(query_events(str(tmp_path)))) == 2
+
+    segment = log.get_segment()
+    log.close()
+
+    assert [entry['segment'] for entry in read_index(str(tmp_path))] == [segment]
+
+    with pytest.raises(RuntimeError):
+        log.write("packet", "GOLDS-UFSC", "downlink_vhf")
+
+def test_write_record(tmp_path):
+    with EventLog(str(tmp_path)) as log:
+        log.write_record({'satellite': "GOLDS-UFSC", 'link': "downlink_vhf", 'raw': "0102", 'rs_errors': 2, 'data': {'id': 1}})
+        log.write_record({'satellite': "GOLDS-UFSC", 'link': "downlink_vhf", 'time': "2026-10-01T00:00:00+00:00", 'raw': "03", 'error': "Unknown packet ID!"})
+
+    recs = {rec['event']: rec for rec in query_events(str(tmp_path))}
+
+    assert sorted(recs) == ["error", "packet"]
+    assert recs['packet']['rs_errors'] == 2
+    assert recs['packet']['data'] == {'id': 1}
+    assert recs['error']['time'] == "2026-10-01T00:00:00+00:00"
+
+def test_invalid_parameters(tmp_path):
+    with pytest.raises(ValueError):
+        EventLog(str(tmp_path), compression="lzma")
+
+    with pytest.raises(ValueError):
+        EventLog(str(tmp_path), max_size=0)
+
+@pytest.mark.skipif(importlib.util.find_spec("zstandard") is not None, reason="zstandard is installed")
+def test_zstd_not_installed(tmp_path):
+    with pytest.raises(RuntimeError):
+        EventLog(str(tmp_path), compression="zstd")
+
+@pytest.mark.skipif(importlib.util.find_spec("zstandard") is None, reason="zstandard is not installed")
+def test_zstd(tmp_path):
+    with EventLog(str(tmp_path), compression="zstd", max_size=4096) as log:
+        _write_week(log)
+
+    assert log.get_segment() is None
+    assert len(list(query_events(str(tmp_path), satellite="golds-ufsc"))) == 7*24
+
+def test_main(tmp_path, capsys):
+    with EventLog(str(tmp_path), max_size=4096) as log:
+        _write_week(log)
+        log.write("packet", "CATARINA-A2", "downlink", datetime.now(timezone.utc) - timedelta(hours=1))
+
+    assert main([str(tmp_path), "-s", "Catarina-A2", "--since", "2d", "-e", "packet"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+
+    assert len(lines) == 1
+    assert json.loads(lines[0])['satellite'] == "CATARINA-A2"
+
+    assert main([str(tmp_path), "--since", "2026-10-07T00:00:00", "--until", "2026-10-08T00:00:00", "-c"]) == 0
+    assert capsys.readouterr().out == "48\n"
+
+    assert main([str(tmp_path / "missing")]) == 1
+
+def test_batch_main(tmp_path):
+    from batch import main as batch_main
+
+    assert batch_main(["-s", "golds-ufsc", "-l", "downlink_vhf", "-o", str(tmp_path / "packets.jsonl"), "--event-log", str(tmp_path / "events"), os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav")]) == 0
+
+    recs = list(query_events(str(tmp_path / "events"), satellite="golds-ufsc", event="packet"))
+
+    assert len(recs) == 1
+    assert recs[0]['link'] == "downlink_vhf"
+    assert recs[0]['rs_errors'] >= 0
+    assert recs[0]['file'].endswith("golds-ufsc_beacon.wav")
@@ -0,0 +1,95 @@
+#
+#  test_frame_parser.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import random
+
+import pytest
+
+from frame_parser import LengthFrameParser, KissFrameParser, get_frame_parser
+
+def _get_frames():
+    rnd = random.Random(0)
+
+    frames = [bytes(rnd.randrange(256) for j in range(rnd.randrange(1, 300))) for i in range(50)]
+    frames.append(bytes([0xC0, 0xDB, 0xDC, 0xDD, 0xDB, 0xC0]))  # Only KISS special bytes
+
+    return frames
+
+def _split(data, sizes):
+    chunks = list()
+    pos = 0
+    i = 0
+    while pos < len(data):
+        chunks.append(data[pos:pos + sizes[i % len(sizes)]])
+        pos += sizes[i % len(sizes)]
+        i += 1
+
+    return chunks
+
+@pytest.mark.parametrize("parser_class", [LengthFrameParser, KissFrameParser])
+@pytest.mark.parametrize("sizes", [[1], [3, 1000, 7], [100000]])
+def test_split_and_coalesced(parser_class, sizes):
+    frames = _get_frames()
+    stream = b"".join(parser_class.encode(f) for f in frames)
+
+    parser = parser_class()
+
+    decoded = list()
+    for chunk in _split(stream, sizes):
+        decoded += parser.feed(chunk)
+
+    assert decoded == frames
+    assert len(parser) == 0
+
+def test_length_partial():
+    parser = LengthFrameParser()
+
+    assert parser.feed(bytes([0])) == []
+    assert parser.feed(bytes([3, 1, 2])) == []
+    assert len(parser) == 4
+    assert parser.feed(bytes([3, 0, 0, 0, 1, 9])) == [bytes([1, 2, 3]), bytes([9])]    # Empty frames are ignored
+
+    with pytest.raises(ValueError):
+        LengthFrameParser.encode(bytes(65536))
+
+def test_kiss():
+    parser = KissFrameParser(max_len=10)
+
+    # Repeated FENDs, a non-data command and a data frame of port 1
+    stream = bytes([0xC0, 0xC0, 0x01, 0x32, 0xC0]) + KissFrameParser.encode(bytes([1, 2]), 1)
+
+    assert parser.feed(stream) == [bytes([1, 2])]
+
+    # Too long frames are discarded, the parser is synchronized again at the next FEND
+    assert parser.feed(bytes([0xC0, 0x00]) + bytes(50)) == []
+    assert parser.feed(bytes(50) + bytes([0xC0]) + KissFrameParser.encode(bytes([7]))) == [bytes([7])]
+
+    parser.feed(bytes([0xC0, 0x00, 1]))
+    parser.reset()
+    assert len(parser) == 0
+
+def test_get_frame_parser():
+    assert isinstance(get_frame_parser('length'), LengthFrameParser)
+    assert isinstance(get_frame_parser('kiss'), KissFrameParser)
+
+    with pytest.raises(ValueError):
+        get_frame_parser('slip')
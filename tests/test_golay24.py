@@ -20,6 +20,10 @@
 #  
 #
 
+import random
+
+import numpy as np
+
 import pytest
 
 from golay24 import Golay24
@@ -86,6 +90,26 @@ def test_decode_uncorrectable_error(golay):
     assert decoded_data == -1  # Should return -1 for uncorrectable errors
     assert errors_corrected is None  # Should return None for uncorrectable errors
 
+def test_encode_decode_all_values(golay):
+    # Test the encoding and decoding tables with all the 12-bit values
+    for data in range(4096):
+        decoded_data, errors_corrected = golay.decode(golay.encode(data))
+        assert decoded_data == data
+        assert errors_corrected == 0
+
+def test_decode_array(golay):
+    # Test decoding an array of words against the single word decoder
+    words = [random.randint(0, 0xFFFFFF) for i in range(1000)]
+    words += [int.from_bytes(bytes(golay.encode(random.randint(0, 4095))), 'big') ^ (1 << random.randint(0, 23)) for i in range(100)]
+
+    decoded_data, errors_corrected = golay.decode_array(np.array(words))
+
+    assert len(decoded_data) == len(words)
+    for i in range(len(words)):
+        data, err = golay.decode([(words[i] >> 16) & 0xFF, (words[i] >> 8) & 0xFF, words[i] & 0xFF])
+        assert decoded_data[i] == data
+        assert errors_corrected[i] == (-1 if err is None else err)
+
 def test_B(golay):
     # Test cases for the _B method
     # Case 1: i = 0 (first row of the identity matrix)
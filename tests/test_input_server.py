@@ -0,0 +1,324 @@
+#
+#  test_input_server.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import socket
+import asyncio
+import warnings
+import threading
+
+import numpy as np
+
+import pytest
+
+import pyngham
+
+from scipy.io import wavfile
+
+import input_server
+from input_server import SourceDecoder, InputServer, main
+from frame_parser import KissFrameParser
+
+_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
+_SAT_JSON = os.path.join(os.path.dirname(__file__), os.pardir, "spacelab_decoder", "data", "satellites", "golds-ufsc.json")
+
+def _get_samples():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", wavfile.WavFileWarning)
+        sample_rate, data = wavfile.read(os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav"))
+
+    assert sample_rate == 48000
+
+    # Some noise before the packet, so the clock recovery is settled when the packet starts
+    noise = np.random.default_rng(0).normal(0, 0.01, 4810)
+
+    return np.concatenate((noise, data)).astype(np.float32)
+
+def test_source_feed():
+    data = _get_samples().tobytes()
+
+    dec = SourceDecoder("test", _SAT_JSON, "downlink_vhf", sample_format='float32', block_size=1000)
+
+    records = list()
+    for i in range(0, len(data), 1001):    # Chunks not aligned to the samples
+        records += dec.feed(data[i:i + 1001])
+
+    records += dec.flush()
+
+    assert len(records) == 1
+    assert records[0]['source'] == "test"
+    assert records[0]['data']['pkt_src_adr'] == " PY0EFS"
+    assert dec.get_packets() == 1
+    assert dec.get_received_samples() == len(data)//4
+
+def test_source_decode_frame():
+    dec = SourceDecoder("zmq", _SAT_JSON, "downlink_vhf", sample_format='float32')
+
+    pl = list(bytes.fromhex((dec.decode_samples(_get_samples()) + dec.flush())[0]['raw']))
+    frame = pyngham.PyNGHam().encode(pl)
+
+    records = dec.decode_frame(bytes(frame))
+
+    assert len(records) == 1
+    assert records[0]['source'] == "zmq"
+    assert records[0]['raw'] == bytes(pl).hex()
+    assert records[0]['data']['pkt_src_adr'] == " PY0EFS"
+
+    assert dec.decode_frame(bytes(pl), False)[0]['raw'] == bytes(pl).hex()
+
+    assert dec.decode_frame(bytes(64)) == []
+    assert dec.get_errors() == 1
+
+def test_invalid_config():
+    with pytest.raises(RuntimeError):
+        InputServer(_SAT_JSON, "invalid_link")
+
+    with pytest.raises(ValueError):
+        InputServer(_SAT_JSON, "downlink_vhf", sample_format='int8')
+
+def test_server():
+    data = _get_samples().tobytes()
+    records = list()
+
+    async def run():
+        server = InputServer(_SAT_JSON, "downlink_vhf", records.append, sample_format='float32')
+        server.add_tcp("127.0.0.1", 0)
+        server.add_udp("127.0.0.1", 0)
+        await server.start()
+
+        (tcp, adr, tcp_port), (udp, adr, udp_port) = server.get_addresses()
+
+        # Two simultaneous TCP clients, with interleaved writes
+        clients = [await asyncio.open_connection("127.0.0.1", tcp_port) for i in range(2)]
+        for i in range(0, len(data), 4096):
+            for reader, writer in clients:
+                writer.write(data[i:i + 4096])
+                await writer.drain()
+        for reader, writer in clients:
+            writer.close()
+            await writer.wait_closed()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(0, len(data), 4096):
+            sock.sendto(data[i:i + 4096], ("127.0.0.1", udp_port))
+            await asyncio.sleep(0)
+        sock.close()
+
+        for i in range(100):
+            if len(records) == 3:
+                break
+            await asyncio.sleep(0.05)
+
+        await server.close()
+
+        return server
+
+    server = asyncio.run(run())
+
+    assert len(server.get_sources()) == 3
+    assert sorted(rec['source'].split(':')[0] for rec in records) == ["tcp", "tcp", "udp"]
+    assert all(rec['data']['pkt_src_adr'] == " PY0EFS" for rec in records)
+    assert len(set(rec['source'] for rec in records)) == 3
+
+def test_server_decodes_off_loop(monkeypatch):
+    data = _get_samples().tobytes()
+    records = list()
+    threads = set()
+
+    feed = SourceDecoder.feed
+    monkeypatch.setattr(SourceDecoder, "feed", lambda self, data: threads.add(threading.get_ident()) or feed(self, data))
+
+    async def run():
+        server = InputServer(_SAT_JSON, "downlink_vhf", lambda rec: records.append(threading.get_ident()), sample_format='float32')
+        server.add_udp("127.0.0.1", 0)
+        await server.start()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(0, len(data), 4096):
+            sock.sendto(data[i:i + 4096], ("127.0.0.1", server.get_addresses()[0][2]))
+            await asyncio.sleep(0)
+        sock.close()
+
+        # Only the last (incomplete) block is decoded by close()
+        for i in range(100):
+            if server.get_sources()[0].get_received_samples() > len(data)//4 - 2048:
+                break
+            await asyncio.sleep(0.05)
+
+        await server.close()
+
+    asyncio.run(run())
+
+    # The samples are decoded by the worker thread, and the records are given in the thread of the event loop
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+    assert records == [threading.get_ident()]
+
+def test_server_udp_overrun(monkeypatch):
+    data = _get_samples().tobytes()
+    release = threading.Event()
+
+    # The decoding is blocked while the datagrams are received, so only the first ones fit in the queue
+    monkeypatch.setattr(input_server, "_INPUT_SERVER_UDP_MAX_BACKLOG", 4096)
+    feed = SourceDecoder.feed
+    monkeypatch.setattr(SourceDecoder, "feed", lambda self, data: release.wait(10) and feed(self, data))
+
+    async def run():
+        server = InputServer(_SAT_JSON, "downlink_vhf", sample_format='float32')
+        server.add_udp("127.0.0.1", 0)
+        await server.start()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(0, len(data), 4096):
+            sock.sendto(data[i:i + 4096], ("127.0.0.1", server.get_addresses()[0][2]))
+            await asyncio.sleep(0.001)
+        sock.close()
+
+        await asyncio.sleep(0.2)
+        release.set()
+
+        await server.close()
+
+        return server.get_sources()[0]
+
+    source = asyncio.run(run())
+
+    assert source.get_overruns() > 0
+    assert source.get_dropped_samples() > 0
+    assert source.get_received_samples() <= 4096 + 1024
+    assert source.get_received_samples() + source.get_dropped_samples() == len(data)//4
+
+def test_server_stop_with_tcp_client():
+    data = _get_samples().tobytes()
+    records = list()
+
+    async def run():
+        server = InputServer(_SAT_JSON, "downlink_vhf", records.append, sample_format='float32')
+        server.add_tcp("127.0.0.1", 0)
+        task = asyncio.ensure_future(server.serve())
+
+        for i in range(100):
+            if len(server.get_addresses()) == 1:
+                break
+            await asyncio.sleep(0.01)
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.get_addresses()[0][2])
+        writer.write(data)
+        await writer.drain()
+
+        for i in range(100):
+            if len(server.get_sources()) == 1 and server.get_sources()[0].get_received_samples() > len(data)//4 - 2048:
+                break
+            await asyncio.sleep(0.05)
+
+        # The client is still connected when the server is stopped
+        server.stop()
+        await asyncio.wait_for(task, 10)
+
+        assert await reader.read() == b""
+        writer.close()
+
+    asyncio.run(run())
+
+    # The samples received before stopping are decoded
+    assert len(records) == 1
+
+def test_server_zmq_errors(monkeypatch):
+    zmq = pytest.importorskip("zmq")
+
+    dec = SourceDecoder("test", _SAT_JSON, "downlink_vhf", sample_format='float32')
+    pl = bytes.fromhex((dec.decode_samples(_get_samples()) + dec.flush())[0]['raw'])
+
+    records = list()
+    logs = list()
+
+    # The first frame raises an exception, and the next ones must still be decoded
+    decode_frame = SourceDecoder.decode_frame
+    def fail_once(self, frame, link_layer=True):
+        if not any("Error decoding" in msg for msg in logs):
+            raise ValueError("test")
+        return decode_frame(self, frame, link_layer)
+
+    monkeypatch.setattr(SourceDecoder, "decode_frame", fail_once)
+
+    pub = zmq.Context.instance().socket(zmq.PUB)
+    port = pub.bind_to_random_port("tcp://127.0.0.1")
+
+    async def run():
+        server = InputServer(_SAT_JSON, "downlink_vhf", records.append, logs.append)
+        server.add_zmq("tcp://127.0.0.1:" + str(port), False)
+        await server.start()
+
+        for i in range(100):
+            if len(records) > 0:
+                break
+            pub.send(bytes([10]) + pl)  # Until the subscription is connected
+            await asyncio.sleep(0.05)
+
+        await server.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        pub.close(linger=0)
+
+    assert len(records) > 0
+    assert records[0]['raw'] == pl.hex()
+    assert "Error decoding a frame from zmq:tcp://127.0.0.1:" + str(port) + ": test" in logs
+
+def test_server_tcp_frames():
+    dec = SourceDecoder("test", _SAT_JSON, "downlink_vhf", sample_format='float32')
+    pl = list(bytes.fromhex((dec.decode_samples(_get_samples()) + dec.flush())[0]['raw']))
+
+    stream = KissFrameParser.encode(bytes(pyngham.PyNGHam().encode(pl)))*3
+    records = list()
+
+    async def run():
+        server = InputServer(_SAT_JSON, "downlink_vhf", records.append)
+        server.add_tcp("127.0.0.1", 0, 'kiss')
+        await server.start()
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.get_addresses()[0][2])
+        for i in range(0, len(stream), 7):  # The frames are split between TCP segments
+            writer.write(stream[i:i + 7])
+            await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+        for i in range(100):
+            if len(records) == 3:
+                break
+            await asyncio.sleep(0.05)
+
+        await server.close()
+
+    asyncio.run(run())
+
+    assert len(records) == 3
+    assert all(rec['raw'] == bytes(pl).hex() for rec in records)
+
+    with pytest.raises(ValueError):
+        InputServer(_SAT_JSON, "downlink_vhf").add_tcp("127.0.0.1", 0, 'slip')
+
+def test_main_without_inputs():
+    with pytest.raises(SystemExit):
+        main(["-s", _SAT_JSON, "-l", "downlink_vhf"])
@@ -22,8 +22,9 @@
 
 import os
 import csv
+import time
 from datetime import datetime
-from log import Log
+from log import Log, BufferedLog
 
 import pytest
 
@@ -139,3 +140,161 @@ def test_write_special_characters(temp_log, tmp_path):
     assert len(rows) == 1
     # The tab in the message shouldn't affect the parsing since we're using tab as delimiter
     assert rows[0][1] == test_msg
+
+def _read_rows(filename):
+    with open(filename, 'r') as f:
+        return list(csv.reader(f, delimiter='\t'))
+
+def test_buffered_max_rows(tmp_path):
+    """Test that the buffered rows are written when the buffer is full."""
+    log = BufferedLog("test_log.csv", str(tmp_path), max_rows=3, max_delay=60)
+    log_file = tmp_path / "test_log.csv"
+
+    log.write("First message")
+    log.write("Second message")
+
+    assert not log_file.exists()
+    assert log.get_buffered_rows() == 2
+
+    log.write("Third message")
+
+    assert log.get_buffered_rows() == 0
+    assert [row[1] for row in _read_rows(log_file)] == ["First message", "Second message", "Third message"]
+
+    log.close()
+
+def test_buffered_max_delay(tmp_path):
+    """Test that the buffered rows are written when the oldest one is too old."""
+    log = BufferedLog("test_log.csv", str(tmp_path), max_rows=100, max_delay=0.05)
+
+    log.write("First message")
+    time.sleep(0.1)
+    log.write("Second message")
+
+    assert log.get_buffered_rows() == 0
+    assert len(_read_rows(tmp_path / "test_log.csv")) == 2
+
+    log.close()
+
+def test_buffered_same_format(tmp_path):
+    """Test that the buffered log writes the same file of the unbuffered log."""
+    messages = [("Test message with \t tabs \n and newlines", "2023-01-01 12:00:00.000000"), ("", "2023-01-01 12:00:01.000000")]
+
+    log = Log("log.csv", str(tmp_path))
+    for msg, ts in messages:
+        log.write(msg, ts)
+
+    with BufferedLog("buffered_log.csv", str(tmp_path / "new_directory")) as buffered_log:
+        for msg, ts in messages:
+            buffered_log.write(msg, ts)
+
+    assert (tmp_path / "new_directory" / "buffered_log.csv").read_text() == (tmp_path / "log.csv").read_text()
+
+def test_buffered_keeps_file_open(tmp_path):
+    """Test that the log file is opened only once."""
+    log = BufferedLog("test_log.csv", str(tmp_path), max_rows=1)
+
+    log.write("First message")
+    log_file = log._file
+    log.write("Second message")
+
+    assert log._file is log_file
+    assert len(_read_rows(tmp_path / "test_log.csv")) == 2
+
+    log.close()
+
+    assert log_file.closed
+
+    # After closing, the events are written directly
+    log.write("Third message")
+
+    assert log._file is None
+    assert [row[1] for row in _read_rows(tmp_path / "test_log.csv")] == ["First message", "Second message", "Third message"]
+
+def test_buffered_set_filename(tmp_path):
+    """Test that the buffered rows are written to the previous file when the file changes."""
+    log = BufferedLog("first_log.csv", str(tmp_path))
+
+    log.write("First message")
+    log.set_filename("second_log.csv")
+    log.write("Second message")
+    log.close()
+
+    assert [row[1] for row in _read_rows(tmp_path / "first_log.csv")] == ["First message"]
+    assert [row[1] for row in _read_rows(tmp_path / "second_log.csv")] == ["Second message"]
+
+def test_buffered_background(tmp_path):
+    """Test writing the buffered rows from the background thread."""
+    log = BufferedLog("test_log.csv", str(tmp_path), max_rows=100, max_delay=0.02, background=True)
+    log_file = tmp_path / "test_log.csv"
+
+    log.write("First message")
+
+    deadline = time.monotonic() + 5
+    while not log_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [row[1] for row in _read_rows(log_file)] == ["First message"]
+
+    for i in range(250):
+        log.write("Message " + str(i))
+
+    log.close()
+
+    assert len(_read_rows(log_file)) == 251
+
+def test_buffered_write_error(tmp_path):
+    """Test that the rows are kept when they can not be written."""
+    path = tmp_path / "log"
+    path.write_text("")     # A file instead of the directory
+
+    log = BufferedLog("test_log.csv", str(path), max_rows=1)
+
+    with pytest.raises(OSError):
+        log.write("First message")
+
+    assert log.get_buffered_rows() == 1
+
+    path.unlink()
+    log.write("Second message")
+
+    assert log.get_buffered_rows() == 0
+    assert [row[1] for row in _read_rows(path / "test_log.csv")] == ["First message", "Second message"]
+
+    log.close()
+
+def test_buffered_background_error(tmp_path):
+    """Test that an error of the background thread is raised by the next write."""
+    path = tmp_path / "log"
+    path.write_text("")
+
+    log = BufferedLog("test_log.csv", str(path), max_rows=100, max_delay=0.02, background=True)
+
+    log.write("First message")
+
+    deadline = time.monotonic() + 5
+    while log._error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(OSError):
+        log.write("Second message")
+
+    # The events are written when the file can be opened again
+    path.unlink()
+
+    deadline = time.monotonic() + 5
+    while log._error is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    log.write("Third message")
+    log.close()
+
+    assert [row[1] for row in _read_rows(path / "test_log.csv")] == ["First message", "Second message", "Third message"]
+
+def test_buffered_invalid_parameters(tmp_path):
+    """Test the validation of the buffer parameters."""
+    with pytest.raises(ValueError):
+        BufferedLog("test_log.csv", str(tmp_path), max_rows=0)
+
+    with pytest.raises(ValueError):
+        BufferedLog("test_log.csv", str(tmp_path), max_delay=0)
@@ -0,0 +1,242 @@
+#
+#  test_metrics.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import json
+import warnings
+import urllib.error
+import urllib.request
+
+import pytest
+from scipy.io import wavfile
+
+# The decoders use the metrics of the package module (not the top-level one)
+from spacelab_decoder.metrics import Metrics, get_metrics, timed, JsonFileSink, MetricsReporter, PrometheusServer
+from ax100 import AX100Mode5
+from batch import BatchDecoder, main
+from time_sync import TimeSync
+from wav_reader import WavReader
+
+_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
+_SAT_JSON_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "spacelab_decoder", "data", "satellites")
+
+@pytest.fixture
+def metrics():
+    # The metrics of the process are shared by all the tests
+    metrics = get_metrics()
+    metrics.reset()
+    metrics.set_enabled(True)
+
+    yield metrics
+
+    metrics.set_enabled(False)
+    metrics.reset()
+
+def test_disabled():
+    metrics = Metrics()
+
+    assert not metrics.is_enabled()
+
+    metrics.count("sync_hits")
+    metrics.observe("time_sync", 10)
+    metrics.stop("time_sync", metrics.start())
+
+    assert metrics.snapshot() == {'enabled': False, 'counters': dict(), 'stages': dict()}
+
+def test_counters_and_histograms():
+    metrics = Metrics()
+    metrics.set_enabled(True)
+
+    metrics.count("sync_hits")
+    metrics.count("sync_hits", 2)
+    metrics.observe("time_sync", 3)
+    metrics.observe("time_sync", 3000)
+    metrics.observe("time_sync", 1e7)
+
+    snap = metrics.snapshot()
+
+    assert snap['counters'] == {'sync_hits': 3}
+
+    hist = snap['stages']['time_sync']
+
+    assert hist['count'] == 3
+    assert hist['sum_us'] == 3 + 3000 + 1e7
+    assert hist['buckets'][hist['bounds_us'].index(5)] == 1
+    assert hist['buckets'][hist['bounds_us'].index(5000)] == 1
+    assert hist['buckets'][-1] == 1
+
+    other = Metrics()
+    other.merge(snap)
+    other.merge(snap)
+
+    assert other.snapshot()['counters'] == {'sync_hits': 6}
+    assert other.snapshot()['stages']['time_sync']['count'] == 6
+
+    metrics.reset()
+
+    assert metrics.snapshot()['counters'] == dict()
+
+def test_timed(metrics):
+    @timed("stage")
+    def stage(fail):
+        if fail:
+            raise RuntimeError("Failed!")
+        return 1
+
+    assert stage(False) == 1
+
+    with pytest.raises(RuntimeError):
+        stage(True)
+
+    snap = metrics.snapshot()
+
+    assert snap['counters'] == {'stage_calls': 2, 'stage_errors': 1}
+    assert snap['stages']['stage']['count'] == 2
+
+def test_to_prometheus():
+    metrics = Metrics()
+    metrics.set_enabled(True)
+
+    metrics.count("rs_corrected_symbols", 4)
+    metrics.observe("reed_solomon", 20)
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE spacelab_decoder_rs_corrected_symbols_total counter\nspacelab_decoder_rs_corrected_symbols_total 4\n" in text
+    assert "# TYPE spacelab_decoder_reed_solomon_seconds histogram\n" in text
+    assert "spacelab_decoder_reed_solomon_seconds_bucket{le=\"1e-05\"} 0\n" in text
+    assert "spacelab_decoder_reed_solomon_seconds_bucket{le=\"5e-05\"} 1\n" in text
+    assert "spacelab_decoder_reed_solomon_seconds_bucket{le=\"+Inf\"} 1\n" in text
+    assert "spacelab_decoder_reed_solomon_seconds_count 1\n" in text
+
+def test_decoding_metrics(metrics):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", wavfile.WavFileWarning)
+        records, num_samples = BatchDecoder(os.path.join(_SAT_JSON_DIR, "golds-ufsc.json"), "downlink_vhf").decode_file(os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav"))
+
+    counters = metrics.snapshot()['counters']
+
+    assert counters['time_sync_samples'] == num_samples
+    assert counters['sync_candidates'] >= counters['sync_hits'] >= 1
+    assert counters['sync_hits'] == counters['frames_decoded'] + counters.get('sync_false', 0)
+    assert counters['frames_decoded'] == len(records) == 1
+    assert counters['packet_calls'] == 1
+    assert 'packet_errors' not in counters
+
+    for stage in ("time_sync", "bit_decoder", "ngham", "packet"):
+        assert metrics.snapshot()['stages'][stage]['count'] > 0
+
+def test_sync_hits(metrics):
+    dec = BatchDecoder(os.path.join(_SAT_JSON_DIR, "golds-ufsc.json"), "downlink_vhf")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", wavfile.WavFileWarning)
+        with WavReader(os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav")) as reader:
+            symbols = TimeSync(reader.get_sample_rate(), 1200).decode_stream(reader.get_samples(), soft=True)
+
+    candidates = dec._get_bit_decoder().decode_candidates(symbols)
+    pos, frame, err, inverted, erasures = candidates[0]
+
+    # A match inside the decoded frame is found by the bit decoder, but not tried by the link layer decoder
+    candidates.append((pos + 16, frame[2:], err, inverted, erasures))
+
+    assert len(dec._decode_candidates(candidates)) == 1
+
+    counters = metrics.snapshot()['counters']
+
+    assert counters['sync_candidates'] == 1     # Only the ones found by the bit decoder
+    assert counters['sync_hits'] == 1
+    assert counters['frames_decoded'] == 1
+
+def test_reed_solomon_metrics(metrics):
+    ax100 = AX100Mode5()
+
+    frame = ax100.encode(list(range(50)))[len(ax100.get_preamble()) + len(ax100.get_sync_word()):]
+    frame[10] ^= 0xFF
+    frame[20] ^= 0x01
+
+    assert ax100.decode_frame(bytes(frame)) == list(range(50))
+
+    for i in range(3, 40):
+        frame[i] ^= 0xFF
+
+    with pytest.raises(RuntimeError):
+        ax100.decode_frame(bytes(frame))
+
+    counters = metrics.snapshot()['counters']
+
+    assert counters['rs_corrected_symbols'] == 2
+    assert counters['rs_uncorrectable'] == 1
+    assert counters['ax100_calls'] == 2
+    assert counters['ax100_errors'] == 1
+
+def test_prometheus_server(metrics):
+    metrics.count("sync_hits", 7)
+
+    server = PrometheusServer(port=0)
+    server.start()
+    try:
+        address, port = server.get_address()
+
+        assert address == "127.0.0.1"
+
+        with urllib.request.urlopen("http://127.0.0.1:%d/metrics" % port) as resp:
+            assert resp.headers['Content-Type'].startswith("text/plain")
+            assert "spacelab_decoder_sync_hits_total 7\n" in resp.read().decode()
+
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen("http://127.0.0.1:%d/other" % port)
+    finally:
+        server.stop()
+
+def test_reporter(tmp_path, metrics):
+    filename = str(tmp_path / "metrics.json")
+
+    snapshots = list()
+    reporter = MetricsReporter(snapshots.append, 0.01)
+    reporter.start()
+
+    metrics.count("sync_hits")
+
+    reporter.stop()
+
+    assert snapshots[-1]['counters'] == {'sync_hits': 1}
+
+    JsonFileSink(filename)(metrics.snapshot())
+
+    with open(filename) as f:
+        assert json.load(f)['counters'] == {'sync_hits': 1}
+
+    with pytest.raises(ValueError):
+        MetricsReporter(snapshots.append, 0)
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_main(tmp_path, capsys, metrics, jobs):
+    filename = str(tmp_path / "metrics.json")
+
+    assert main(["-s", "golds-ufsc", "-l", "downlink_vhf", "-j", str(jobs), "-o", str(tmp_path / "packets.jsonl"), "--metrics", filename, os.path.join(_SAMPLES_DIR, "golds-ufsc_beacon.wav")]) == 0
+
+    with open(filename) as f:
+        snap = json.load(f)
+
+    assert snap['counters']['frames_decoded'] == 1
+    assert snap['stages']['time_sync']['count'] > 0
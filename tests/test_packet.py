@@ -20,7 +20,9 @@
 #  
 #
 
+import os
 import json
+import pickle
 
 import pytest
 
@@ -599,3 +601,80 @@ def test_packet_csp_unknown_dst_port(sat_config_file):
         pkt_csp.set_pkt(pkt_raw)
 
         x = str(pkt_csp)
+
+def test_packet_decode_plan_cache(sat_config_file):
+    # The decode plan is compiled once per configuration file
+    pkt_raw = [0x40, 0x20, 0x20, 0x50, 0x50, 0x35, 0x55, 0x46]
+
+    pkt_a = PacketSLP(sat_config_file, pkt_raw)
+    pkt_b = PacketSLP(sat_config_file, pkt_raw)
+
+    assert pkt_a._get_plan() is pkt_b._get_plan()
+
+    # A modified configuration file is compiled again
+    config = json.loads(json.dumps(SAMPLE_SAT_CONFIG))
+    config['links'][0]['types'][0]['fields'][0]['unit'] = "ID"
+    with open(sat_config_file, 'w') as f:
+        json.dump(config, f)
+    os.utime(sat_config_file, ns=(0, os.stat(sat_config_file).st_mtime_ns + 10**9))
+
+    pkt_c = PacketSLP(sat_config_file, pkt_raw)
+
+    assert pkt_c._get_plan() is not pkt_a._get_plan()
+    assert "\t\tID: 64 ID\n" in str(pkt_c)
+    assert str(pkt_a) == str(pkt_b)
+
+def test_packet_invalid_conversion(sat_config_file):
+    # An invalid conversion only fails when the field is decoded
+    config = json.loads(json.dumps(SAMPLE_SAT_CONFIG))
+    config['links'][0]['types'][1]['fields'][3]['conversion'] = ""
+    with open(sat_config_file, 'w') as f:
+        json.dump(config, f)
+
+    assert json.loads(PacketSLP(sat_config_file, [0x40, 0x20, 0x20, 0x50, 0x50, 0x35, 0x55, 0x46]).get_data())['pkt_id'] == "64"
+
+    with pytest.raises(SyntaxError):
+        str(PacketSLP(sat_config_file, [66] + [0x41]*60))
+
+def test_packet_slp_decode(slp_packet):
+    # All the representations of a packet are rendered from a single decoding
+    record = slp_packet.decode()
+
+    assert record.get_satellite() == "SpaceLab-Transmitter"
+    assert record.get_link() == "Uplink (NGHam)"
+    assert record.get_data_source() == "Ping request"
+    assert record.get_link_protocol() == "NGHam"
+    assert record.get_network_protocol() == "SLP"
+    assert record.get_fields() == (("pkt_id", "ID", "64", ""), ("pkt_src_adr", "Source callsign", "  PP5UF", ""))
+    assert str(record) == str(slp_packet)
+    assert record.to_json() == slp_packet.get_data()
+    assert record.to_dict() == {"satellite": "SpaceLab-Transmitter", "link": "Uplink (NGHam)", "data_source": "Ping request",
+                                "link_protocol": "NGHam", "network_protocol": "SLP", "data": {"pkt_id": "64", "pkt_src_adr": "  PP5UF"}}
+    assert str(pickle.loads(pickle.dumps(record))) == str(record)
+
+def test_packet_csp_decode_data_request():
+    # The fragments of a data request are decoded as a single packet
+    pkt_csp = PacketCSP()
+    pkt_csp.set_config(os.path.join(os.path.dirname(__file__), os.pardir, "spacelab_decoder", "data", "satellites", "spacelab-transmitter.json"))
+
+    header = [0x80, 0x09, 0x80, 0x00, 0, 3, 0, 5, 0, 1, 44]    # Destination port = 38, counter = 5, length = 300
+    fragments = [header + list(range(20))]
+    for i in range(3):
+        frag = header.copy()
+        frag[4] = i
+        fragments.append(frag + [i]*10)
+
+    for frag in fragments[:-1]:
+        pkt_csp.set_pkt(frag)
+
+        assert pkt_csp.decode() is None
+        assert str(pkt_csp) == ""
+
+    pkt_csp.set_pkt(fragments[-1])
+    record = pkt_csp.decode()
+
+    assert record is not None
+    assert pkt_csp.packet == header + list(range(20)) + [0]*10 + [1]*10 + [2]*10
+    assert str(pkt_csp) == str(record)  # Rendered from the same decoding (the reassembly is not repeated)
+    assert json.loads(pkt_csp.get_data()) == record.get_data()
+    assert record.get_data()['csp_dst_port'] == "38"
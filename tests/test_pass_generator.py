@@ -0,0 +1,173 @@
+#
+#  test_pass_generator.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import socket
+
+import numpy as np
+
+import pytest
+
+from pass_generator import PassGenerator, main
+from batch import BatchDecoder
+from input_server import SourceDecoder
+from wav_reader import WavReader
+
+_SAT_JSON_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "spacelab_decoder", "data", "satellites")
+
+def _sat_json(name):
+    return os.path.join(_SAT_JSON_DIR, name)
+
+@pytest.mark.parametrize('sat_config, link_id, sample_format', [("golds-ufsc.json", "downlink_vhf", 'float32'),
+                                                                ("catarina-a2.json", "downlink", 'int16')])
+def test_generate_wav(tmp_path, sat_config, link_id, sample_format):
+    gen = PassGenerator(_sat_json(sat_config), link_id, 48000, sample_format, seed=1)
+    gen.set_snr(40)
+
+    payloads = gen.random_payloads(5, 40)
+    samples = gen.generate(payloads)
+
+    assert samples.dtype == gen.get_dtype()
+
+    filename = str(tmp_path / "pass.wav")
+    gen.write_wav(filename, samples)
+
+    records, num_samples = BatchDecoder(_sat_json(sat_config), link_id).decode_file(filename)
+
+    assert num_samples == len(samples)
+    assert [rec['raw'] for rec in records] == [bytes(pl).hex() for pl in payloads]
+
+def test_generate_complex():
+    gen = PassGenerator(_sat_json("catarina-a2.json"), "downlink", 96000, 'complex64', seed=1)
+    gen.set_snr(25)
+    gen.set_frequency_offset(500, -20)
+
+    payloads = gen.random_payloads(3, 100)
+    samples = gen.generate(payloads)
+
+    assert samples.dtype == np.complex64
+
+    dec = SourceDecoder("gen", _sat_json("catarina-a2.json"), "downlink", sample_rate=96000, sample_format='complex64')
+
+    records = dec.decode_samples(samples) + dec.flush()
+
+    assert [rec['raw'] for rec in records] == [bytes(pl).hex() for pl in payloads]
+
+def test_seed():
+    gen1 = PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", seed=10)
+    gen2 = PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", seed=10)
+
+    for gen in (gen1, gen2):
+        gen.set_snr(10)
+        gen.set_burst_errors(5, 0.01)
+
+    assert np.array_equal(gen1.generate(gen1.random_payloads(2, 10)), gen2.generate(gen2.random_payloads(2, 10)))
+
+def test_impairments():
+    gen = PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", 48000, 'float32', seed=3)
+
+    bits = np.tile([0, 1], 600)     # One second at 1200 bps
+    clean = gen.modulate(bits)
+
+    assert len(clean) == 48000
+
+    # The frequency offset is a DC offset of the discriminator output (in units of the deviation, 300 Hz)
+    gen.set_frequency_offset(30)
+
+    assert np.mean(gen.modulate(bits)) - np.mean(clean) == pytest.approx(0.1, abs=1e-3)
+
+    gen.set_frequency_offset(0, 60)
+
+    assert np.mean(gen.modulate(bits)[-4800:]) - np.mean(clean[-4800:]) == pytest.approx(0.19, abs=0.01)
+
+    gen.set_frequency_offset(0)
+
+    # A faster transmitter clock sends the same bits in fewer samples
+    gen.set_clock_offset(1000)
+
+    assert len(gen.modulate(bits)) == int(48000/1.001)
+
+    gen.set_clock_offset(0)
+
+    # The signal is lost during the bursts
+    gen.set_burst_errors(10, 0.01)
+
+    assert np.count_nonzero(gen.modulate(bits) != clean) > 0
+    assert np.count_nonzero(gen.modulate(bits) != clean) < 48000
+
+def test_stream_udp():
+    gen = PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", 48000, 'int16', seed=4)
+
+    samples = gen.generate(gen.random_payloads(1, 20), 0.01)
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2**22)
+    sock.settimeout(1)
+
+    try:
+        datagrams = gen.stream_udp("127.0.0.1", sock.getsockname()[1], samples, 1000, 1000)
+
+        assert datagrams == -(-len(samples)//1000)
+
+        received = b"".join(sock.recv(65536) for i in range(datagrams))
+    finally:
+        sock.close()
+
+    assert received == samples.tobytes()
+
+def test_invalid_config():
+    with pytest.raises(RuntimeError):
+        PassGenerator(_sat_json("golds-ufsc.json"), "downlink_xyz")
+
+    with pytest.raises(ValueError):
+        PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", 48000, 'int8')
+
+    with pytest.raises(ValueError):
+        PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", 2000)
+
+    # The sample rate is checked against the configured baudrate (golds-ufsc downlink_vhf: 1200 bps)
+    gen = PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", 48000)
+    gen.set_baudrate(9600)
+
+    with pytest.raises(ValueError):
+        gen.set_sample_rate(12000)
+
+    gen = PassGenerator(_sat_json("golds-ufsc.json"), "downlink_vhf", 48000, 'complex64')
+
+    with pytest.raises(ValueError):
+        gen.write_wav("pass.wav", gen.modulate([0, 1]))
+
+    with pytest.raises(ValueError):
+        gen.stream_udp("127.0.0.1", 1, gen.modulate([0, 1]), 0)
+
+def test_main(tmp_path, capsys):
+    filename = str(tmp_path / "pass.wav")
+
+    assert main(["-s", "golds-ufsc", "-l", "downlink_vhf", "-n", "3", "--snr", "30", "--seed", "5", "-o", filename]) == 0
+
+    with WavReader(filename) as reader:
+        assert reader.get_sample_rate() == 48000
+
+    assert "3 packet(s)" in capsys.readouterr().err
+
+    assert main(["-s", "golds-ufsc", "-l", "downlink_xyz", "-o", filename]) == 1
@@ -22,6 +22,8 @@
 
 import random
 
+import numpy as np
+
 import pytest
 
 from reed_solomon import ReedSolomon
@@ -147,3 +149,83 @@ def test_mod255(reed_solomon):
     for i in range(1000):
         num = random.randint(0, 2**16)
         assert reed_solomon._mod255(num) == num % 255
+
+def test_tables_read_only():
+    """
+    Test that the lookup tables shared by all the instances can not be changed.
+    """
+    import reed_solomon as rs_module
+
+    with pytest.raises(TypeError):
+        rs_module._RS_CCSDS_ALPHA_TO[0] = 0
+
+    with pytest.raises(TypeError):
+        rs_module._RS_ENCODE_FEEDBACK[0] = 1
+
+    with pytest.raises(ValueError):
+        rs_module._RS_GF_MUL[1, 1] = 0
+
+def test_decode_with_erasures(reed_solomon):
+    """
+    Test the decode method of the ReedSolomon class with erasures (more than the error correction capacity).
+    """
+    data = [random.randint(0, 255) for i in range(random.randint(32, 223))]
+    pad = 255 - 32 - len(data)
+
+    codeword = data + reed_solomon.encode(data, pad)
+
+    # Erase 24 symbols (the erasure positions are given in the full 255 symbols block)
+    erased = random.sample(range(len(codeword)), 24)
+    for pos in erased:
+        codeword[pos] ^= random.randint(1, 255)
+
+    decoded_data, error_positions, error_count = reed_solomon.decode(codeword, pad, [pos + pad for pos in erased], len(erased))
+
+    assert decoded_data == data
+    assert error_count == len(erased)
+    assert sorted(error_positions) == sorted(erased)
+
+def test_decode_many(reed_solomon):
+    """
+    Test the decode_many method of the ReedSolomon class with a batch of codewords of different lengths.
+    """
+    batch = list()
+    pads = list()
+    expected = list()
+    for num_errors in [0, 0, 5, 16, 40]:
+        data = [random.randint(0, 255) for i in range(random.randint(10, 223))]
+        pad = 255 - 32 - len(data)
+
+        codeword = data + reed_solomon.encode(data, pad)
+        for pos in random.sample(range(len(codeword)), num_errors):
+            codeword[pos] ^= random.randint(1, 255)
+
+        batch.append(codeword + [0]*pad)    # Unused symbols at the end of each row
+        pads.append(pad)
+        expected.append(data)
+
+    decoded, counts = reed_solomon.decode_many(np.array(batch), pads)
+
+    assert counts.tolist()[:4] == [0, 0, 5, 16]
+    assert counts[4] == -1
+    for i in range(4):
+        assert decoded[i, :len(expected[i])].tolist() == expected[i]
+
+def test_decode_many_matches_decode(reed_solomon):
+    """
+    Test the decode_many method of the ReedSolomon class against the decode method.
+    """
+    batch = list()
+    for i in range(20):
+        data = [random.randint(0, 255) for j in range(223)]
+        codeword = data + reed_solomon.encode(data, 0)
+        for pos in random.sample(range(len(codeword)), random.randint(0, 16)):
+            codeword[pos] = random.randint(0, 255)
+        batch.append(codeword)
+
+    decoded, counts = reed_solomon.decode_many(batch, 0)
+
+    for i in range(len(batch)):
+        data, err_pos, err = reed_solomon.decode(batch[i].copy(), 0)
+        assert decoded[i, :223].tolist() == data
+        assert counts[i] == err
@@ -0,0 +1,89 @@
+#
+#  test_resampler.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import numpy as np
+from scipy import signal
+
+import pytest
+
+from resampler import Resampler
+
+def test_ratio():
+    rs = Resampler(48000, 9600)
+
+    assert rs.get_input_rate() == 48000
+    assert rs.get_output_rate() == 9600
+    assert rs.get_ratio() == (1, 5)
+
+    assert Resampler(44100, 9600).get_ratio() == (32, 147)
+
+def test_invalid_args():
+    with pytest.raises(ValueError):
+        Resampler(0, 9600)
+
+    with pytest.raises(ValueError):
+        Resampler(48000, -1)
+
+    with pytest.raises(ValueError):
+        Resampler(48000, 9600, 0)
+
+def test_filter_length():
+    # The filter length is scaled by the largest factor (not only by the interpolation)
+    assert Resampler(48000, 9600)._phases.shape == (1, 40)
+    assert Resampler(9600, 19200)._phases.shape == (2, 8)
+    assert Resampler(44100, 9600)._phases.shape == (32, 37)
+    assert Resampler(48000, 9600, 4)._phases.shape == (1, 4)
+
+def test_same_rate():
+    rs = Resampler(9600, 9600)
+    x = np.random.default_rng(0).normal(size=1000)
+
+    assert np.array_equal(rs.process(x), x)
+
+@pytest.mark.parametrize("in_rate,out_rate", [(48000, 9600), (9600, 19200), (44100, 9600), (19200, 9600)])
+def test_upfirdn(in_rate, out_rate):
+    rs = Resampler(in_rate, out_rate)
+    interp, decim = rs.get_ratio()
+    x = np.random.default_rng(1).normal(size=5000)
+
+    taps_per_phase = -(-8*max(interp, decim)//interp)
+    taps = signal.firwin(interp*taps_per_phase, 1/max(interp, decim), window=('kaiser', 5.0))*interp
+    ref = signal.upfirdn(taps, x, interp, decim)
+
+    out = rs.process(x)
+
+    assert len(out) == -(-len(x)*interp//decim)
+    assert np.allclose(out, ref[:len(out)])
+
+@pytest.mark.parametrize("block_size", [1, 7, 256, 1000])
+def test_blocks(block_size):
+    x = np.random.default_rng(2).normal(size=3000)
+
+    ref = Resampler(44100, 9600).process(x)
+
+    rs = Resampler(44100, 9600)
+    out = np.concatenate([rs.process(x[i:i + block_size]) for i in range(0, len(x), block_size)])
+
+    assert np.allclose(out, ref)
+
+    rs.reset()
+    assert np.allclose(rs.process(x), ref)
@@ -0,0 +1,116 @@
+#
+#  test_ring_buffer.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import threading
+
+import numpy as np
+
+import pytest
+
+from ring_buffer import RingBuffer
+
+def test_write_read():
+    rb = RingBuffer(100, np.int16, 32)
+
+    assert rb.get_size() == 100
+    assert rb.get_dtype() == np.int16
+    assert rb.get_max_write() == 32
+    assert len(rb) == 0
+    assert rb.get_free() == 200
+
+    assert rb.write(np.arange(70))
+    assert len(rb) == 70
+    assert rb.read(50).tolist() == list(range(50))
+
+    # The next write wraps around the end of the buffer
+    assert rb.write(np.arange(70, 150))
+    assert len(rb) == 100
+    assert rb.get_free() == 0
+    assert not rb.write([0])    # Overrun: nothing is written
+
+    assert rb.read(100).tolist() == list(range(50, 150))
+    assert rb.read(1, timeout=0.01) is None
+
+def test_write_buffer():
+    rb = RingBuffer(64, np.int16, 16)
+
+    for i in range(20):
+        buf = rb.get_write_buffer()
+        buf[:10] = np.arange(i*5, i*5 + 5, dtype=np.int16).tobytes()
+        rb.commit(10)
+
+        assert rb.read(5).tolist() == list(range(i*5, i*5 + 5))
+
+    # Partial samples are kept until the remaining bytes are written
+    rb.get_write_buffer()[:3] = np.array([1000, 2000], dtype=np.int16).tobytes()[:3]
+    rb.commit(3)
+
+    assert len(rb) == 1
+    assert rb.read(1).tolist() == [1000]
+
+    rb.get_write_buffer()[:1] = np.array([2000], dtype=np.int16).tobytes()[1:]
+    rb.commit(1)
+
+    assert rb.read(1).tolist() == [2000]
+
+    # Not enough free space for a full write
+    rb.write(np.zeros(60))
+
+    assert rb.get_write_buffer() is None
+
+    rb.clear()
+
+    assert len(rb) == 0
+    assert rb.get_write_buffer() is not None
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+    with pytest.raises(ValueError):
+        RingBuffer(10, np.int16, 21)
+
+    rb = RingBuffer(10, np.float32, 8)
+
+    with pytest.raises(ValueError):
+        rb.commit(9)
+
+    with pytest.raises(ValueError):
+        rb.read(11)
+
+def test_producer_consumer_threads():
+    rb = RingBuffer(1000, np.int32, 400)
+    samples = np.arange(100000, dtype=np.int32)
+
+    def producer():
+        for i in range(0, len(samples), 100):
+            while not rb.write(samples[i:i + 100]):
+                pass
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+
+    blocks = [rb.read(250, timeout=10) for i in range(len(samples)//250)]
+
+    thread.join()
+
+    assert np.array_equal(np.concatenate(blocks), samples)
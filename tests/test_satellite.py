@@ -150,3 +150,14 @@ def test_set_links():
     assert len(links) == 2
     assert links[0].get_name() == "TestLink1"
     assert links[1].get_name() == "TestLink2"
+
+def test_load_from_dict():
+    """Test loading satellite data from a parsed configuration."""
+    satellite = Satellite()
+    satellite.load_from_dict(SAMPLE_JSON)
+
+    assert satellite.get_name() == "TestSatellite"
+    assert [lk.get_id() for lk in satellite.get_links()] == ["link1", "link2"]
+
+    with pytest.raises(RuntimeError):
+        satellite.load_from_dict({"name": "TestSatellite"})
@@ -0,0 +1,176 @@
+#
+#  test_satellite_registry.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import copy
+import json
+import pickle
+
+import pytest
+
+from satellite_registry import SatelliteRegistry, get_satellite_registry, find_sat_config
+
+_SAMPLE_CONFIG = {
+    "name": "TestSatellite",
+    "links": [
+        {
+            "id": "link1",
+            "name": "Link1",
+            "direction": "down",
+            "frequency": 435000000,
+            "modulation": "GFSK",
+            "baudrate": 1200,
+            "preamble": [0xAA],
+            "sync_word": [0x5D, 0xE6, 0x2A, 0x7E],
+            "protocol_link": "NGHam",
+            "protocol_network": "SLP",
+            "types": [
+                {
+                    "name": "Beacon",
+                    "fields": [
+                        {"id": "pkt_id", "name": "Packet ID", "conversion": "pkt[0]", "unit": "", "value": 1}
+                    ]
+                }
+            ]
+        }
+    ]
+}
+
+@pytest.fixture
+def sat_dir(tmp_path):
+    with open(tmp_path / "test-sat.json", 'w') as f:
+        json.dump(_SAMPLE_CONFIG, f)
+
+    return tmp_path
+
+def test_get_config(sat_dir):
+    reg = SatelliteRegistry([str(sat_dir)])
+
+    config = reg.get_config(str(sat_dir / "test-sat.json"))
+
+    assert config == _SAMPLE_CONFIG
+    assert reg.get_config(str(sat_dir / "test-sat.json")) is config   # Loaded only once
+
+def test_get_config_reload(sat_dir):
+    reg = SatelliteRegistry([str(sat_dir)])
+    filename = str(sat_dir / "test-sat.json")
+
+    config = reg.get_config(filename)
+
+    new_config = copy.deepcopy(_SAMPLE_CONFIG)
+    new_config['name'] = "NewSatellite"
+    with open(filename, 'w') as f:
+        json.dump(new_config, f)
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+
+    assert reg.get_config(filename) is not config
+    assert reg.get_config(filename)['name'] == "NewSatellite"
+
+    reg.clear()
+
+    assert reg.get_config(filename)['name'] == "NewSatellite"
+
+def test_get_config_read_only(sat_dir):
+    config = SatelliteRegistry([str(sat_dir)]).get_config(str(sat_dir / "test-sat.json"))
+
+    with pytest.raises(RuntimeError):
+        config['name'] = "NewSatellite"
+
+    with pytest.raises(RuntimeError):
+        config['links'].append(dict())
+
+    with pytest.raises(RuntimeError):
+        config['links'][0]['sync_word'][0] = 0
+
+    with pytest.raises(RuntimeError):
+        del config['links'][0]['types']
+
+    # Copies are regular (mutable) objects
+    config_copy = copy.deepcopy(config)
+    config_copy['name'] = "NewSatellite"
+
+    assert pickle.loads(pickle.dumps(config)) == _SAMPLE_CONFIG
+
+@pytest.mark.parametrize('config', [
+    {"links": []},
+    {"name": "TestSatellite"},
+    {"name": "TestSatellite", "links": [{"id": "link1", "name": "Link1"}]},
+    {"name": "TestSatellite", "links": [dict(_SAMPLE_CONFIG['links'][0], types=[{"name": "Beacon", "fields": [{"id": "pkt_id"}]}])]},
+    [],
+])
+def test_get_config_corrupted(tmp_path, config):
+    with open(tmp_path / "corrupted.json", 'w') as f:
+        json.dump(config, f)
+
+    with pytest.raises(RuntimeError):
+        SatelliteRegistry([str(tmp_path)]).get_config(str(tmp_path / "corrupted.json"))
+
+def test_get_satellite(sat_dir):
+    reg = SatelliteRegistry([str(sat_dir)])
+
+    sat1 = reg.get_satellite(str(sat_dir / "test-sat.json"))
+    sat2 = reg.get_satellite(str(sat_dir / "test-sat.json"))
+
+    assert sat1 is not sat2
+    assert sat1.get_name() == "TestSatellite"
+    assert sat1.get_links()[0].get_sync_word() == [0x5D, 0xE6, 0x2A, 0x7E]
+
+    sat1.set_active_link(0)
+
+    assert sat2.get_active_link() is None
+
+def test_find_and_scan(sat_dir):
+    with open(sat_dir / "corrupted.json", 'w') as f:
+        f.write("{")
+
+    reg = SatelliteRegistry([str(sat_dir), "/nonexistent/path/"])
+
+    assert reg.find("test-sat.json") == os.path.join(str(sat_dir), "test-sat.json")
+
+    with pytest.raises(RuntimeError):
+        reg.find("unknown.json")
+
+    assert reg.scan() == [os.path.join(str(sat_dir), "test-sat.json")]
+
+def test_distributed_configurations():
+    reg = get_satellite_registry()
+
+    assert reg is get_satellite_registry()
+
+    names = [os.path.basename(f) for f in reg.scan()]
+
+    assert "golds-ufsc.json" in names
+    assert "floripasat-2a.json" in names
+
+def test_find_sat_config(sat_dir):
+    filename = str(sat_dir / "test-sat.json")
+
+    assert find_sat_config(filename) == filename
+
+    golds = find_sat_config("golds-ufsc")
+
+    assert os.path.basename(golds) == "golds-ufsc.json"
+    assert find_sat_config("golds-ufsc.json") == golds
+
+    with pytest.raises(RuntimeError):
+        find_sat_config("unknown")
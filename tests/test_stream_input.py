@@ -0,0 +1,99 @@
+#
+#  test_stream_input.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import numpy as np
+
+import pytest
+
+from stream_input import StreamInput
+
+def test_defaults():
+    si = StreamInput(1200)
+
+    assert si.get_baudrate() == 1200
+    assert si.get_sample_rate() == 48000
+    assert si.get_sample_format() == 'int16'
+    assert si.get_dtype() == np.int16
+    assert si.get_block_size() == 2048
+    assert si.get_output_sample_rate() == 48000
+    assert not si.is_resampled()
+
+def test_config():
+    si = StreamInput(9600, 19200, 'complex64', 512)
+
+    assert si.get_dtype() == np.complex64
+    assert si.get_output_sample_rate() == 76800
+    assert si.is_resampled()
+
+    si.set_sample_format('float32')
+    assert si.get_dtype() == np.float32
+
+    si.set_sample_rate(96000)
+    assert si.get_sample_rate() == 96000
+
+    si.set_block_size(64)
+    assert si.get_block_size() == 64
+
+def test_invalid_args():
+    with pytest.raises(ValueError):
+        StreamInput(0)
+
+    with pytest.raises(ValueError):
+        StreamInput(1200, 0)
+
+    with pytest.raises(ValueError):
+        StreamInput(1200, 48000, 'int8')
+
+    with pytest.raises(ValueError):
+        StreamInput(1200, 48000, 'int16', 0)
+
+def test_no_resampling():
+    # With enough samples per symbol, the demodulator gets the samples of the stream as they are
+    x = (np.random.default_rng(0).normal(size=4800)*1000).astype(np.int16)
+
+    si = StreamInput(1200, 48000, 'int16')
+
+    assert si.process(x) is x
+
+def test_process_blocks():
+    x = (np.random.default_rng(0).normal(size=4800)*1000).astype(np.int16)
+
+    si = StreamInput(4800, 19200, 'int16')
+    ref = si.process(x)
+
+    assert abs(len(ref) - 2*len(x)) <= 1
+
+    si.reset()
+    out = np.concatenate([si.process(x[i:i + 100]) for i in range(0, len(x), 100)])
+
+    assert np.allclose(out, ref)
+
+def test_complex_demodulation():
+    # FM tone: constant frequency deviation of 1200 Hz at 9600 samples/s
+    n = np.arange(2000)
+    x = np.exp(2j*np.pi*1200/9600*n).astype(np.complex64)
+
+    si = StreamInput(1200, 9600, 'complex64')
+    out = np.concatenate([si.process(x[i:i + 300]) for i in range(0, len(x), 300)])
+
+    assert len(out) == len(x)
+    assert np.allclose(out[1:], 2*np.pi*1200/9600, atol=1e-4)    # The first sample is relative to the initial phase
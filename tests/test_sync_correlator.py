@@ -0,0 +1,130 @@
+#
+#  test_sync_correlator.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import numpy as np
+
+import pytest
+
+from sync_correlator import SyncCorrelator
+from sync_word import SyncWord, _SYNC_WORD_LSB
+from bit_buffer import BitBuffer, _BIT_BUFFER_LSB
+
+_SYNC_WORD = [0x7E, 0x2A, 0xE6, 0x5D]
+
+@pytest.fixture
+def random_bits():
+    rng = np.random.default_rng(42)
+    bits = rng.integers(0, 2, 5000).tolist()
+
+    # Inserts the sync word (in the received order) a few times, some of them with bit errors
+    sw = SyncWord(_SYNC_WORD, _SYNC_WORD_LSB)
+    sw_bits = [int(sw[i]) for i in reversed(range(len(sw)))]
+    for pos, err in [(100, 0), (1000, 1), (2500, 3), (4000, 0)]:
+        seq = list(sw_bits)
+        for i in range(err):
+            seq[5*i] ^= 1
+        bits[pos:pos + len(seq)] = seq
+
+    return bits
+
+def test_push_matches_bit_buffer(random_bits):
+    sw = SyncWord(_SYNC_WORD, _SYNC_WORD_LSB)
+    buf = BitBuffer(len(sw), _BIT_BUFFER_LSB)
+    sc = SyncCorrelator(_SYNC_WORD, 3)
+
+    assert len(sc) == 32
+
+    for bit in random_bits:
+        buf.push(bool(bit))
+        sc.push(bit)
+        if len(buf) == len(sw):
+            distance = len(sw) - (sw == buf)
+            assert sc.get_distance() == distance
+            assert sc.is_synced() == (distance <= 3)
+        else:
+            assert not sc.is_synced()
+
+@pytest.mark.parametrize('max_err', [0, 1, 3, 8])
+def test_find_sync_matches_push(random_bits, max_err):
+    sc = SyncCorrelator(_SYNC_WORD, max_err)
+
+    pos = []
+    for i, bit in enumerate(random_bits):
+        sc.push(bit)
+        if sc.is_synced():
+            pos.append(i + 1)
+
+    assert sc.find_sync(np.array(random_bits)).tolist() == pos
+
+def test_find_sync_positions(random_bits):
+    assert SyncCorrelator(_SYNC_WORD).find_sync(random_bits).tolist() == [132, 4032]
+    assert SyncCorrelator(_SYNC_WORD, 3).find_sync(random_bits).tolist() == [132, 1032, 2532, 4032]
+    assert len(SyncCorrelator(_SYNC_WORD).find_sync([1, 0, 1])) == 0
+
+def test_max_bit_errors():
+    sc = SyncCorrelator(_SYNC_WORD)
+
+    assert sc.get_max_bit_errors() == 0
+
+    sc.set_max_bit_errors(16)
+
+    assert sc.get_max_bit_errors() == 16
+
+    with pytest.raises(ValueError):
+        sc.set_max_bit_errors(17)
+
+    with pytest.raises(ValueError):
+        SyncCorrelator(_SYNC_WORD, 20)
+
+def test_reset():
+    sc = SyncCorrelator(_SYNC_WORD)
+
+    sw = SyncWord(_SYNC_WORD, _SYNC_WORD_LSB)
+    for i in reversed(range(len(sw))):
+        sc.push(int(sw[i]))
+
+    assert sc.is_synced()
+
+    sc.reset()
+
+    assert not sc.is_synced()
+    assert sc.get_distance() == len(sc) + 1
+
+def test_find_sync_candidates(random_bits):
+    sc = SyncCorrelator(_SYNC_WORD, 3)
+
+    pos, err, inverted = sc.find_sync_candidates(random_bits)
+
+    assert pos.tolist() == sc.find_sync(random_bits).tolist()
+    assert err.tolist() == [0, 1, 3, 0]
+    assert not inverted.any()
+
+    # Inverted polarity
+    bits = 1 - np.array(random_bits)
+
+    assert len(sc.find_sync_candidates(bits)[0]) == 0
+
+    pos, err, inverted = sc.find_sync_candidates(bits, inverted=True)
+
+    assert pos.tolist() == [132, 1032, 2532, 4032]
+    assert err.tolist() == [0, 1, 3, 0]
+    assert inverted.all()
@@ -0,0 +1,154 @@
+#
+#  test_time_sync.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import os
+import warnings
+
+import numpy as np
+from scipy.io import wavfile
+
+import pytest
+
+from time_sync import TimeSync
+
+_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
+
+def reference_bitstream(samples, sps, mu=0.5, gain=0.001):
+    """Per-sample Mueller and Muller loop used as reference (complex arithmetic, as in the first implementation)."""
+    samples = np.array(samples, dtype=np.float64)
+    out = np.zeros(len(samples) + 10, dtype=np.complex128)
+    out_rail = np.zeros(len(samples) + 10, dtype=np.complex128)
+
+    i_in = 0
+    i_out = 2
+    while i_out < len(samples) and i_in + 1 < len(samples):
+        out[i_out] = samples[i_in + int(mu)]
+        out_rail[i_out] = int(np.real(out[i_out]) > 0) + 1j * int(np.imag(out[i_out]) > 0)
+
+        x = (out_rail[i_out] - out_rail[i_out - 2]) * np.conj(out[i_out - 1])
+        y = (out[i_out] - out[i_out - 2]) * np.conj(out_rail[i_out - 1])
+
+        mu += sps + gain * np.real(y - x)
+
+        i_in += int(np.floor(mu))
+        mu = mu - np.floor(mu)
+        i_out += 1
+
+    return [1 if symbol.real > 0 else 0 for symbol in out[2:i_out]]
+
+def load_sample(name):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", wavfile.WavFileWarning)
+        return wavfile.read(os.path.join(_SAMPLES_DIR, name))
+
+@pytest.mark.parametrize('filename', ["floripasat2a_beacon.wav", "golds-ufsc_beacon.wav"])
+def test_get_bitstream_matches_reference(filename):
+    sample_rate, data = load_sample(filename)
+
+    bits = TimeSync(sample_rate, 1200).get_bitstream(data)
+
+    assert bits == reference_bitstream(data, sample_rate/1200)
+
+def test_get_bitstream_from_list():
+    sample_rate, data = load_sample("floripasat2a_beacon.wav")
+
+    assert TimeSync(sample_rate, 1200).get_bitstream(list(data)) == TimeSync(sample_rate, 1200).get_bitstream(data)
+
+def test_get_bitstream_random_samples():
+    rng = np.random.default_rng(1234)
+    data = rng.normal(0, 1, 20000)
+
+    assert TimeSync(48000, 4800).get_bitstream(data) == reference_bitstream(data, 10)
+
+def test_get_bitstream_short_input():
+    ts = TimeSync(48000, 1200)
+
+    assert ts.get_bitstream([]) == []
+    assert ts.get_bitstream([1]) == []
+    assert ts.get_bitstream([1, -1, 1]) == reference_bitstream([1, -1, 1], 40)
+
+def test_decode_stream_keeps_state():
+    sample_rate, data = load_sample("floripasat2a_beacon.wav")
+
+    ts = TimeSync(sample_rate, 1200)
+    ts.decode_stream(data[:10000])
+
+    assert ts._mu != 0.5
+
+    ts.reset()
+
+    assert ts._mu == 0.5
+    assert ts.decode_stream(data) == TimeSync(sample_rate, 1200).get_bitstream(data)
+
+@pytest.mark.parametrize('block_size', [1, 3, 41, 1000, 65536])
+def test_decode_stream_blocks(block_size):
+    sample_rate, data = load_sample("golds-ufsc_beacon.wav")
+
+    ts = TimeSync(sample_rate, 1200)
+
+    bits = list()
+    for i in range(0, len(data), block_size):
+        bits += ts.decode_stream(data[i:i + block_size])
+
+    assert bits == TimeSync(sample_rate, 1200).get_bitstream(data)
+
+def test_decode_stream_list_blocks():
+    sample_rate, data = load_sample("golds-ufsc_beacon.wav")
+
+    ts = TimeSync(sample_rate, 1200)
+
+    # Short blocks given as lists (the blocks between two symbols are skipped without converting them)
+    bits = list()
+    for i in range(0, len(data), 7):
+        bits += ts.decode_stream(data[i:i + 7].tolist())
+
+    assert bits == TimeSync(sample_rate, 1200).get_bitstream(data)
+
+def test_get_bitstream_unaligned_samples():
+    sample_rate, data = load_sample("golds-ufsc_beacon.wav")
+
+    # Samples not aligned in memory, as in a memory-mapped WAV file with an odd header length
+    buf = bytearray(data.nbytes + 2)
+    unaligned = np.frombuffer(buf, dtype=data.dtype, count=len(data), offset=2)
+    unaligned[:] = data
+
+    assert not unaligned.flags.aligned
+    assert TimeSync(sample_rate, 1200).get_bitstream(unaligned) == TimeSync(sample_rate, 1200).get_bitstream(data)
+
+@pytest.mark.parametrize('block_size', [1, 41, 65536])
+def test_decode_stream_soft(block_size):
+    sample_rate, data = load_sample("golds-ufsc_beacon.wav")
+
+    bits = TimeSync(sample_rate, 1200).get_bitstream(data)
+    symbols = TimeSync(sample_rate, 1200).get_bitstream(data, soft=True)
+
+    assert symbols.dtype == np.float32
+    assert (symbols > 0).astype(int).tolist() == bits
+
+    # The symbols are the samples chosen by the loop
+    assert np.isin(symbols, data.astype(np.float32)).all()
+
+    ts = TimeSync(sample_rate, 1200)
+    blocks = [ts.decode_stream(data[i:i + block_size], soft=True) for i in range(0, len(data), block_size)]
+
+    assert all(block.dtype == np.float32 for block in blocks)
+    assert np.array_equal(np.concatenate(blocks), symbols)
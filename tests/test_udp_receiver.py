@@ -0,0 +1,82 @@
+#
+#  test_udp_receiver.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import time
+import socket
+
+import numpy as np
+
+import pytest
+
+from ring_buffer import RingBuffer
+from udp_receiver import UdpReceiver
+
+def _wait_datagrams(receiver, num, timeout=5):
+    deadline = time.monotonic() + timeout
+    while receiver.get_datagrams() < num and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+@pytest.fixture
+def sender():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    yield sock
+    sock.close()
+
+def test_receive(sender):
+    rb = RingBuffer(4096, np.int16, 2048)
+    receiver = UdpReceiver("127.0.0.1", 0, rb)
+    receiver.start()
+
+    assert receiver.is_running()
+
+    samples = np.arange(3000, dtype=np.int16)
+    for i in range(0, len(samples), 512):
+        sender.sendto(samples[i:i + 512].tobytes(), receiver.get_address())
+
+    assert rb.read(3000, timeout=5).tolist() == samples.tolist()
+
+    _wait_datagrams(receiver, 6)
+    receiver.stop()
+
+    assert not receiver.is_running()
+    assert receiver.get_datagrams() == 6
+    assert receiver.get_received_samples() == 3000
+    assert receiver.get_overruns() == 0
+    assert receiver.get_dropped_samples() == 0
+
+def test_overrun(sender):
+    rb = RingBuffer(1024, np.int16, 2048)
+    receiver = UdpReceiver("127.0.0.1", 0, rb)
+    receiver.start()
+
+    # Nothing is read, so only the first datagram fits in the ring buffer
+    for i in range(4):
+        sender.sendto(np.full(256, i, dtype=np.int16).tobytes(), receiver.get_address())
+
+    _wait_datagrams(receiver, 4)
+    receiver.stop()
+
+    assert receiver.get_datagrams() == 4
+    assert receiver.get_received_samples() == 256
+    assert receiver.get_overruns() == 3
+    assert receiver.get_dropped_samples() == 768
+    assert rb.read(256).tolist() == [0]*256
@@ -0,0 +1,92 @@
+#
+#  test_wav_reader.py
+#
+#  Copyright The SpaceLab-Decoder Contributors.
+#
+#  This file is part of SpaceLab-Decoder.
+#
+#  SpaceLab-Decoder is free software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  SpaceLab-Decoder is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with SpaceLab-Decoder; if not, see <http://www.gnu.org/licenses/>.
+#
+#
+
+import numpy as np
+from scipy.io import wavfile
+
+import pytest
+
+from wav_reader import WavReader
+
+@pytest.fixture
+def stereo_file(tmp_path):
+    filename = str(tmp_path / "stereo.wav")
+
+    data = np.zeros((1000, 2), dtype=np.int16)
+    data[:, 0] = np.arange(1000)
+    data[:, 1] = -np.arange(1000)
+
+    wavfile.write(filename, 9600, data)
+
+    return filename
+
+def test_stereo_file(stereo_file):
+    reader = WavReader(stereo_file, block_size=300)
+
+    assert reader.get_sample_rate() == 9600
+    assert reader.get_num_channels() == 2
+    assert reader.get_channel() == 0
+    assert reader.get_block_size() == 300
+    assert len(reader) == 1000
+
+    blocks = list(reader)
+
+    assert [len(block) for block in blocks] == [300, 300, 300, 100]
+    assert np.concatenate(blocks).tolist() == list(range(1000))
+
+    # The channel is a view of the file, not a copy
+    assert not reader.get_samples().flags['C_CONTIGUOUS']
+    assert np.shares_memory(blocks[0], reader.get_samples())
+
+    reader.set_channel(1)
+
+    assert np.concatenate(list(reader)).tolist() == [-i for i in range(1000)]
+
+def test_mono_file(tmp_path):
+    filename = str(tmp_path / "mono.wav")
+    wavfile.write(filename, 48000, np.linspace(-1, 1, 500, dtype=np.float32))
+
+    reader = WavReader(filename)
+
+    assert reader.get_num_channels() == 1
+    assert len(list(reader)) == 1
+    assert np.array_equal(list(reader)[0], np.linspace(-1, 1, 500, dtype=np.float32))
+
+def test_invalid_parameters(stereo_file):
+    with pytest.raises(ValueError):
+        WavReader(stereo_file, channel=2)
+
+    with pytest.raises(ValueError):
+        WavReader(stereo_file, block_size=0)
+
+def test_close(stereo_file):
+    with WavReader(stereo_file) as reader:
+        assert len(reader) == 1000
+
+    with pytest.raises(RuntimeError):
+        len(reader)
+
+    with pytest.raises(RuntimeError):
+        reader.get_samples()
+
+    # The sample rate is still known after closing the file
+    assert reader.get_sample_rate() == 9600